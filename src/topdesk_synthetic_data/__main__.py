@@ -1,11 +1,30 @@
 #!/usr/bin/env python
 
 import argparse
+import contextlib
+import datetime
 import logging
+import os.path
+import shutil
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
 
-import pandas
-
-from topdesk_synthetic_data.topdesk import Asset, Incident, Person
+from topdesk_synthetic_data import (
+    bench,
+    cache,
+    distributions,
+    load,
+    numbering,
+    shards,
+    simulation,
+    stream,
+    topdesk,
+    writers,
+)
+from topdesk_synthetic_data.index import RecordIndex
+from topdesk_synthetic_data.profiling import FieldProfiler
+from topdesk_synthetic_data.schema import Schema
 
 DESCRIPTION = """
 TOPdesk synthetic data generator
@@ -13,6 +32,94 @@ TOPdesk synthetic data generator
 
 logger = logging.getLogger(__name__)
 
+# Entities in the order they are generated, with the name of their output files
+ENTITIES = [("incident", "incidents"), ("person", "persons"), ("asset", "assets")]
+
+# In linked mode, records are indexed on these fields (and grouped by the second item)
+# so that the entities generated after them can refer to them
+INDEXES = {
+    "person": (
+        ["id", "dynamicName", "email", "phoneNumber", "department"],
+        "department",
+    ),
+    "asset": (["id", "name", "type"], None),
+}
+
+# The indexes each entity refers to in linked mode, by generate_columns() argument
+LINKS = {
+    "incident": {"persons": "person", "assets": "asset"},
+    "person": {},
+    "asset": {"persons": "person"},
+}
+
+# Multipliers for record counts such as 20k
+SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def entity_counts(text: str) -> Dict[str, Union[int, float, None]]:
+    """
+    Parse the --entities option: entity names separated by commas, each optionally
+    followed by "=" and a number of records (e.g. 20000 or 20k) or a fraction of
+    --num_records (e.g. 0.5)
+
+    Returns:
+        Number of records, fraction or None (for --num_records) by entity name
+    """
+    counts = {}
+    for item in text.split(","):
+        entity, _, value = item.strip().partition("=")
+        if entity not in dict(ENTITIES):
+            raise argparse.ArgumentTypeError(
+                f"Unknown entity {entity!r}, choose from {', '.join(dict(ENTITIES))}"
+            )
+        value = value.strip().lower()
+        multiplier = SUFFIXES.get(value[-1:], 1)
+        if multiplier > 1:
+            value = value[:-1]
+        try:
+            if not value:
+                counts[entity] = None
+            elif value.isdigit():
+                counts[entity] = int(value) * multiplier
+            elif multiplier == 1:
+                counts[entity] = float(value)
+            else:
+                counts[entity] = round(float(value) * multiplier)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"Invalid number of {entity} records: {item}"
+            ) from None
+    return counts
+
+
+def formats(text: str) -> List[str]:
+    """
+    Parse the --format option: output file formats separated by commas
+    """
+    names = [name.strip().lower() for name in text.split(",")]
+    for name in names:
+        if name not in writers.WRITERS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown format {name!r}, choose from {', '.join(writers.WRITERS)}"
+            )
+    return list(dict.fromkeys(names))
+
+
+def record_counts(
+    counts: Dict[str, Union[int, float, None]], num_records: int
+) -> Dict[str, int]:
+    """
+    Number of records of each entity from the parsed --entities option
+    """
+    resolved = {}
+    for entity, count in counts.items():
+        if count is None:
+            count = num_records
+        elif isinstance(count, float):
+            count = round(count * num_records)
+        resolved[entity] = count
+    return resolved
+
 
 def get_args() -> argparse.Namespace:
     """
@@ -21,8 +128,377 @@ def get_args() -> argparse.Namespace:
     """
     parser = argparse.ArgumentParser(description=DESCRIPTION)
     parser.add_argument("--log_level", default="INFO")
+    parser.set_defaults(func=generate)
     parser.add_argument("--num_records", "-n", type=int, default=100)
-    return parser.parse_args()
+    parser.add_argument(
+        "--entities",
+        type=entity_counts,
+        default=dict.fromkeys(name for name, _ in ENTITIES),
+        dest="entity_counts",
+        metavar="ENTITY[=N],...",
+        help="Record types to generate, each with its own number of records or "
+        "fraction of --num_records, e.g. incident,person=20k,asset=0.0016. "
+        "Defaults to --num_records of every type",
+    )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes generating shards of records in parallel. With more "
+        "than one, the record types are generated at the same time",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10000,
+        help="Number of records generated and written at a time, which bounds memory "
+        "use. Best as a multiple of 1000, the number of records generated from each seed",
+    )
+    parser.add_argument(
+        "--format",
+        "-f",
+        type=formats,
+        default=["csv", "xlsx"],
+        metavar="FORMAT,...",
+        help="Output file formats separated by commas, e.g. csv,parquet. Choose from "
+        + ", ".join(writers.WRITERS),
+    )
+    parser.add_argument(
+        "--compression",
+        choices=writers.COMPRESSIONS,
+        help="Compression codec for Parquet, Arrow and Feather output",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed, to make the output reproducible. The same seed, entity and "
+        "row number give the same record whatever the chunk size and workers",
+    )
+    parser.add_argument(
+        "--now",
+        type=datetime.datetime.fromisoformat,
+        metavar="DATETIME",
+        help="Reference time for relative dates such as call dates, e.g. 2025-01-06. "
+        "Defaults to the current time, or the start of today if --seed is given, so "
+        "give it to reproduce a seeded run on another day",
+    )
+    parser.add_argument(
+        "--faker-pool",
+        type=int,
+        default=0,
+        metavar="SIZE",
+        help="Draw names, addresses, phone numbers etc. from SIZE pre-generated values "
+        "per Faker provider, which is much faster but less diverse. "
+        "0 calls Faker for every value",
+    )
+    parser.add_argument(
+        "--faker-refresh",
+        type=float,
+        default=0.0,
+        metavar="FRACTION",
+        help="Fraction of pooled values replaced by fresh Faker values, to keep the "
+        "pool diverse",
+    )
+    parser.add_argument(
+        "--number-format",
+        choices=numbering.FORMATS,
+        default="standard",
+        help="Incident numbers are unique, so the standard format, e.g. "
+        "SHEF 1234 5678, allows up to 81 million incidents. The wide format, e.g. "
+        "SHEF 123456 789012, allows more",
+    )
+    parser.add_argument(
+        "--distributions",
+        metavar="PATH",
+        help="JSON file of weights for categorical fields such as incident priority, "
+        "which may depend on the category, status or age of an incident. Fields are "
+        "drawn uniformly by default",
+    )
+    parser.add_argument(
+        "--schema",
+        metavar="PATH",
+        help="TOML or JSON file declaring custom fields to add to the records, or to "
+        "replace built-in fields with, drawn from vocabularies, templates, number "
+        "ranges or Faker providers",
+    )
+    parser.add_argument(
+        "--linked",
+        action="store_true",
+        help="Generate persons first and draw incident callers, asset assignees and "
+        "incident objects from the generated records, referring to them by id",
+    )
+    parser.add_argument(
+        "--profile-fields",
+        action="store_true",
+        help="Time each field helper and Faker provider and print a breakdown at the end",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Copy the output files from the cache if the same seeded run has been "
+        "made before, and store them otherwise. Also keeps the compiled --schema",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=f"Cache directory. Defaults to ${cache.DIRECTORY_VARIABLE}, or "
+        "topdesk-synthetic-data in the XDG cache directory",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=cache.MAX_SIZE,
+        metavar="MB",
+        help="Size limit of the cache, beyond which the least recently used files are "
+        "deleted",
+    )
+
+    subparsers = parser.add_subparsers(
+        dest="command", help="Generate the data files if no command is given"
+    )
+    bench.add_parser(subparsers)
+    cache.add_parser(subparsers)
+    load.add_parser(subparsers)
+    simulation.add_parser(subparsers)
+    stream.add_parser(subparsers)
+
+    args = parser.parse_args()
+    try:
+        writers.check_compression(args.format, args.compression)
+    except ValueError as exc:
+        parser.error(f"--compression: {exc}")
+    if args.distributions:
+        try:
+            args.distributions = distributions.Distributions.load(args.distributions)
+            args.distributions.validate(
+                {
+                    entity: cls.CATEGORICAL_FIELDS
+                    for entity, cls in topdesk.ENTITIES.items()
+                },
+                {entity: cls.CONDITIONS for entity, cls in topdesk.ENTITIES.items()},
+            )
+        except (OSError, ValueError) as exc:
+            parser.error(f"--distributions: {exc}")
+    if args.schema:
+        try:
+            store = (
+                cache.DatasetCache(args.cache_dir, args.cache_size)
+                if args.cache
+                else None
+            )
+            args.schema = Schema.load(args.schema, store)
+        except (OSError, ValueError) as exc:
+            parser.error(f"--schema: {exc}")
+    args.now = shards.reference_time(args.seed, args.now)
+    args.counts = record_counts(args.entity_counts, args.num_records)
+    return args
+
+
+def cache_key(args: argparse.Namespace, entity: str) -> str:
+    """
+    Cache key of the output files of an entity
+
+    Linked records depend on the records they refer to, so in linked mode the key
+    includes the keys of those entities too.
+    """
+    return cache.key(
+        entity=entity,
+        seed=args.seed,
+        now=args.now,
+        num_records=args.counts[entity],
+        compression=args.compression,
+        faker_pool=args.faker_pool,
+        faker_refresh=args.faker_refresh,
+        number_format=args.number_format,
+        weights=args.distributions.spec if args.distributions else None,
+        schema=args.schema.digest if args.schema else None,
+        linked=args.linked,
+        links=(
+            {target: cache_key(args, target) for target in LINKS[entity].values()}
+            if args.linked
+            else None
+        ),
+    )
+
+
+def generate_entity(
+    args: argparse.Namespace,
+    entity: str,
+    plural: str,
+    executor: Optional[Executor] = None,
+    store: Optional[cache.DatasetCache] = None,
+    links: Optional[Dict[str, str]] = None,
+    index_path: Optional[str] = None,
+) -> None:
+    """
+    Generate the records of one entity and write them to each output format
+
+    Each output file is written in its own thread while the following chunks are
+    generated.
+
+    Args:
+        executor: Process pool to generate shards in
+        store: Cache to copy the files from, or store them in
+        links: Paths of the record indexes the entity refers to, see shards.generate()
+        index_path: Where to save an index of the records, for other entities to refer
+            to them
+    """
+    paths = {fmt: f"topdesk_{plural}_dummy.{fmt}" for fmt in args.format}
+    if index_path:
+        paths["index"] = index_path
+
+    if store:
+        key = cache_key(args, entity)
+        cached = store.get(key, list(paths))
+        if cached:
+            for name, path in paths.items():
+                shutil.copyfile(cached[name], path)
+            logger.info("Copied %s records from the cache %s", entity, key)
+            return
+
+    index_chunks = [] if index_path else None
+    with contextlib.ExitStack() as stack:
+        outputs = [
+            stack.enter_context(
+                writers.BackgroundWriter(
+                    writers.WRITERS[fmt](paths[fmt], args.compression)
+                )
+            )
+            for fmt in args.format
+        ]
+        num_records = 0
+        for chunk in shards.generate(
+            entity,
+            args.counts[entity],
+            chunk_size=args.chunk_size,
+            seed=args.seed,
+            now=args.now,
+            executor=executor,
+            pool_size=args.faker_pool,
+            pool_refresh=args.faker_refresh,
+            number_format=args.number_format,
+            weights=args.distributions,
+            schema=args.schema,
+            links=links,
+        ):
+            for output in outputs:
+                output.write(chunk)
+            if index_chunks is not None:
+                index_chunks.append(chunk[INDEXES[entity][0]])
+            num_records += len(chunk.index)
+            logger.debug("Generated %d %s records", num_records, entity)
+    logger.info("Generated %d %s records", num_records, entity)
+    if index_chunks is not None:
+        fields, group_by = INDEXES[entity]
+        RecordIndex.from_chunks(index_chunks, fields, group_by).save(index_path)
+    for output in outputs:
+        logger.info(
+            "Wrote %s (%d rows in %.1f seconds)",
+            output.path,
+            output.rows,
+            output.seconds,
+        )
+    if store:
+        store.put(key, paths)
+
+
+def generate(args: argparse.Namespace) -> None:
+    logger.info("Generating TOPdesk dummy data...")
+
+    profiler = FieldProfiler() if args.profile_fields else None
+    if profiler and args.workers > 1:
+        logger.warning("Field profiling runs in a single process, ignoring --workers")
+        args.workers = 1
+
+    if args.counts.get("incident", 0) > numbering.capacity(args.number_format):
+        raise SystemExit(
+            f"Too many records for unique incident numbers in the {args.number_format} "
+            "format, use --number-format wide"
+        )
+
+    if args.linked:
+        for entity in args.counts:
+            missing = set(LINKS[entity].values()) - set(args.counts)
+            if missing:
+                raise SystemExit(
+                    f"Linked {entity} records refer to {' and '.join(sorted(missing))} "
+                    "records, so add them to --entities"
+                )
+
+    store = None
+    if args.cache:
+        if args.seed is None:
+            logger.warning("Only seeded runs can be cached, ignoring --cache")
+        elif profiler:
+            logger.warning(
+                "Field profiling needs records to be generated, ignoring --cache"
+            )
+        else:
+            store = cache.DatasetCache(args.cache_dir, args.cache_size)
+
+    with contextlib.ExitStack() as run:
+        executor = (
+            run.enter_context(ProcessPoolExecutor(args.workers))
+            if args.workers > 1
+            else None
+        )
+        if profiler:
+            run.enter_context(profiler)
+        entities = [
+            (entity, plural) for entity, plural in ENTITIES if entity in args.counts
+        ]
+        indexes = {}
+        if args.linked:
+            entities = sorted(entities, key=lambda item: item[0] not in INDEXES)
+            directory = run.enter_context(tempfile.TemporaryDirectory())
+            indexes = {
+                entity: os.path.join(directory, f"{plural}.pickle")
+                for entity, plural in entities
+                if entity in INDEXES
+            }
+
+        def run_entity(entity: str, plural: str, dependencies=()) -> None:
+            for dependency in dependencies:
+                dependency.result()
+            links = None
+            if args.linked:
+                links = {
+                    name: indexes[target] for name, target in LINKS[entity].items()
+                }
+            generate_entity(
+                args,
+                entity,
+                plural,
+                executor=executor,
+                store=store,
+                links=links,
+                index_path=indexes.get(entity),
+            )
+
+        if executor is None:
+            # The generators share module-level Faker instances, so entities generated
+            # in this process take turns
+            for entity, plural in entities:
+                run_entity(entity, plural)
+        else:
+            # Generate the entities at the same time, their shards sharing the process
+            # pool. In linked mode, each entity waits for the ones it refers to.
+            with ThreadPoolExecutor(len(entities)) as threads:
+                futures = {}
+                for entity, plural in entities:
+                    dependencies = []
+                    if args.linked:
+                        dependencies = [
+                            futures[target] for target in LINKS[entity].values()
+                        ]
+                    futures[entity] = threads.submit(
+                        run_entity, entity, plural, dependencies
+                    )
+                for future in futures.values():
+                    future.result()
+
+    if profiler:
+        print(profiler.format_report())
 
 
 def main():
@@ -30,36 +506,7 @@ def main():
     logging.basicConfig(
         format="%(name)s:%(asctime)s:%(levelname)s:%(message)s", level=args.log_level
     )
-
-    logger.info("Generating TOPdesk dummy data...")
-
-    # Generate incident data
-    incidents = pandas.DataFrame.from_records(
-        Incident.generate(num_records=args.num_records)
-    )
-    logger.info("Generated %d incident records", len(incidents.index))
-    incidents.to_csv("topdesk_incidents_dummy.csv", index=False)
-    logger.info("Wrote topdesk_incidents_dummy.csv")
-    incidents.to_excel("topdesk_incidents_dummy.xlsx", index=False)
-    logger.info("Wrote topdesk_incidents_dummy.xlsx")
-
-    # Generate person data
-    people = pandas.DataFrame.from_records(
-        Person.generate(num_records=args.num_records)
-    )
-    logger.info("Generated %d person records", len(people.index))
-    people.to_csv("topdesk_persons_dummy.csv", index=False)
-    logger.info("Wrote topdesk_persons_dummy.csv")
-    people.to_excel("topdesk_persons_dummy.xlsx", index=False)
-    logger.info("Wrote topdesk_persons_dummy.xlsx")
-
-    # Generate asset data
-    assets = pandas.DataFrame.from_records(Asset.generate(num_records=args.num_records))
-    logger.info("Generated %d asset records", len(assets.index))
-    assets.to_csv("topdesk_assets_dummy.csv", index=False)
-    logger.info("Wrote topdesk_assets_dummy.csv")
-    assets.to_excel("topdesk_assets_dummy.xlsx", index=False)
-    logger.info("Wrote topdesk_assets_dummy.xlsx")
+    args.func(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,238 @@
+"""
+Benchmark the record generators and output writers
+
+Each case (entity and size) runs in a fresh process so that its peak memory use is
+measured on its own. The time to import the command-line tool is measured too, in a
+fresh interpreter with ``python -X importtime``, and can be checked against a budget so
+that startup doesn't regress.
+"""
+
+import argparse
+import datetime
+import importlib.metadata
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from . import writers
+from .profiling import FieldProfiler
+from .topdesk import ENTITIES
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Module whose import time is measured: everything the command-line tool imports
+MAIN_MODULE = "topdesk_synthetic_data.__main__"
+
+# Modules that should only be imported when records are generated or written
+HEAVY_MODULES = {"faker", "numpy", "openpyxl", "pandas", "pyarrow"}
+
+
+def add_parser(subparsers) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(
+        "bench",
+        help="Measure generator and writer performance",
+        description="Report rows/sec, per-field generation cost, peak memory and bytes "
+        "written for each entity and output format at several sizes",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000],
+        help="Numbers of records to generate",
+    )
+    parser.add_argument(
+        "--entities", nargs="+", choices=ENTITIES, default=list(ENTITIES)
+    )
+    parser.add_argument(
+        "--formats", nargs="+", choices=writers.WRITERS, default=["csv", "xlsx"]
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        help="Write the results to this JSON file, or - for stdout, in which case the "
+        "report goes to stderr",
+    )
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        metavar="MS",
+        help="Fail if importing the command-line tool takes longer than this many "
+        "milliseconds",
+    )
+    parser.add_argument(
+        "--import-only",
+        action="store_true",
+        help="Only measure the import time, e.g. to check --import-budget in CI",
+    )
+    parser.set_defaults(func=run)
+    return parser
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Peak resident memory of this process in bytes, where the platform reports it
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def import_time(module: str = MAIN_MODULE, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time importing a module in a fresh interpreter, taking the best of several runs
+
+    Returns:
+        Import time in milliseconds, the slowest imports by their own time, and the
+        heavy modules that were imported
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        imports = {}
+        for line in result.stderr.splitlines():
+            # e.g. "import time:       312 |      18974 |       topdesk_synthetic_data"
+            fields = line.partition(":")[2].split("|")
+            if len(fields) != 3 or not fields[0].strip().isdigit():
+                continue
+            name = fields[2].strip()
+            imports[name] = (int(fields[0]), int(fields[1]))
+        if best is None or imports[module][1] < best[module][1]:
+            best = imports
+
+    slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+    return {
+        "module": module,
+        "milliseconds": best[module][1] / 1000,
+        "slowest": [
+            {"module": name, "milliseconds": own / 1000}
+            for name, (own, _) in slowest[:10]
+        ],
+        "heavy_modules": sorted(HEAVY_MODULES.intersection(best)),
+    }
+
+
+def format_import(result: Dict[str, Any]) -> str:
+    lines = [f"import {result['module']}: {result['milliseconds']:,.1f} ms"]
+    if result["heavy_modules"]:
+        lines.append(f"  imports {', '.join(result['heavy_modules'])}")
+    for item in result["slowest"][:5]:
+        lines.append(f"  {item['module']:<45}{item['milliseconds']:>8.1f} ms")
+    return "\n".join(lines)
+
+
+def measure(entity: str, size: int, formats: List[str]) -> Dict[str, Any]:
+    """
+    Time one entity at one size: row-by-row and columnar generation, the cost of each
+    field, and writing each output format
+    """
+    cls = ENTITIES[entity]
+    case = {"entity": entity, "size": size, "rows_per_second": {}, "formats": {}}
+
+    started = time.perf_counter()
+    for _ in cls.generate(size):
+        pass
+    case["rows_per_second"]["generate"] = size / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    frame = cls.generate_columns(size)
+    case["rows_per_second"]["generate_columns"] = size / (time.perf_counter() - started)
+
+    with FieldProfiler() as profiler:
+        cls.generate_columns(size)
+    case["fields"] = profiler.report()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in formats:
+            path = os.path.join(directory, f"{entity}.{fmt}")
+            with writers.WRITERS[fmt](path) as writer:
+                writer.write(frame)
+            case["formats"][fmt] = {
+                "seconds": writer.seconds,
+                "rows_per_second": size / writer.seconds,
+                "bytes": os.path.getsize(path),
+            }
+
+    case["peak_rss_bytes"] = peak_rss()
+    return case
+
+
+def format_case(case: Dict[str, Any]) -> str:
+    lines = [
+        f"{case['entity']} x {case['size']}",
+        *(
+            f"  {method:<18}{rate:>12,.0f} rows/s"
+            for method, rate in case["rows_per_second"].items()
+        ),
+        *(
+            f"  {fmt:<18}{result['rows_per_second']:>12,.0f} rows/s"
+            f"{result['bytes']:>14,} bytes"
+            for fmt, result in case["formats"].items()
+        ),
+    ]
+    if case["peak_rss_bytes"] is not None:
+        lines.append(f"  {'peak RSS':<18}{case['peak_rss_bytes'] / 2**20:>12,.1f} MiB")
+    for field in case["fields"][:5]:
+        lines.append(
+            f"  {field['field']:<45}{field['seconds']:>8.3f} s"
+            f"{field['calls']:>10} calls"
+        )
+    return "\n".join(lines)
+
+
+def run(args: argparse.Namespace) -> None:
+    results = {
+        "version": importlib.metadata.version("topdesk-synthetic-data"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "import": import_time(),
+        "cases": [],
+    }
+    # Keep standard output for the JSON results if they are written there
+    report = sys.stderr if args.output == "-" else sys.stdout
+    print(format_import(results["import"]), file=report)
+
+    context = multiprocessing.get_context("spawn")
+    for entity in [] if args.import_only else args.entities:
+        for size in args.sizes:
+            logger.info("Benchmarking %d %s records...", size, entity)
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                case = executor.submit(measure, entity, size, args.formats).result()
+            results["cases"].append(case)
+            print(format_case(case), file=report)
+
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        logger.info("Wrote %s", args.output)
+
+    milliseconds = results["import"]["milliseconds"]
+    if args.import_budget is not None and milliseconds > args.import_budget:
+        raise SystemExit(
+            f"Importing took {milliseconds:.0f} ms, over the budget of "
+            f"{args.import_budget:.0f} ms"
+        )
@@ -0,0 +1,207 @@
+"""
+Cache generated output files on disk
+
+Each entry holds the files generated for one entity, keyed by a hash of everything the
+output depends on: the package version, entity, seed, number of records and the
+generation options. Only seeded runs can be cached, because unseeded output differs
+every time. Entries are evicted least recently used first when the cache grows past
+its size limit.
+"""
+
+import argparse
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Environment variable overriding the cache directory
+DIRECTORY_VARIABLE = "TOPDESK_SYNTHETIC_DATA_CACHE"
+
+# Default size limit in megabytes
+MAX_SIZE = 5000
+
+
+def default_directory() -> str:
+    """
+    Cache directory, following the XDG base directory specification
+    """
+    if os.environ.get(DIRECTORY_VARIABLE):
+        return os.environ[DIRECTORY_VARIABLE]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "topdesk-synthetic-data")
+
+
+def version() -> str:
+    try:
+        return importlib.metadata.version("topdesk-synthetic-data")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def key(**params) -> str:
+    """
+    Hash of the package version and the parameters that determine an entity's output
+    """
+    params["version"] = version()
+    text = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class DatasetCache:
+    """
+    A size-bounded directory of cached output files
+
+    Each entry is a subdirectory named by its key, holding files by name, e.g. the
+    output format. The modification time of an entry records when it was last used.
+
+    Args:
+        directory: Cache directory, created if it doesn't exist
+        max_size: Size limit in megabytes
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_size: int = MAX_SIZE):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_size * 1_000_000
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str, names: List[str]) -> Optional[Dict[str, str]]:
+        """
+        Paths of the cached files for an entry, if it has all the given names
+
+        Returns:
+            Path of each file by name, or None on a miss
+        """
+        entry = self._entry(key)
+        paths = {name: os.path.join(entry, name) for name in names}
+        if not all(os.path.isfile(path) for path in paths.values()):
+            return None
+        os.utime(entry)
+        return paths
+
+    def put(self, key: str, paths: Dict[str, str]) -> None:
+        """
+        Copy files into an entry, adding to any files it already has, then evict old
+        entries if the cache is over its size limit
+        """
+        entry = self._entry(key)
+        os.makedirs(entry, exist_ok=True)
+        for name, path in paths.items():
+            # Copy to a temporary name first so that readers never see a partial file
+            descriptor, temporary = tempfile.mkstemp(dir=entry, prefix=".")
+            os.close(descriptor)
+            shutil.copyfile(path, temporary)
+            os.replace(temporary, os.path.join(entry, name))
+        os.utime(entry)
+        self.evict(keep=key)
+
+    def entries(self) -> List[dict]:
+        """
+        Entries in the cache, least recently used first
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for item in os.scandir(self.directory):
+            if not item.is_dir():
+                continue
+            files = [file for file in os.scandir(item.path) if file.is_file()]
+            entries.append(
+                {
+                    "key": item.name,
+                    "path": item.path,
+                    "files": len(files),
+                    "bytes": sum(file.stat().st_size for file in files),
+                    "used": item.stat().st_mtime,
+                }
+            )
+        return sorted(entries, key=lambda entry: entry["used"])
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Delete least recently used entries until the cache is within its size limit
+
+        Args:
+            keep: Key of an entry not to delete, e.g. the one just written
+
+        Returns:
+            Number of entries deleted
+        """
+        entries = self.entries()
+        total = sum(entry["bytes"] for entry in entries)
+        deleted = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry["key"] == keep:
+                continue
+            shutil.rmtree(entry["path"], ignore_errors=True)
+            total -= entry["bytes"]
+            deleted += 1
+            logger.debug("Evicted %s from the cache", entry["key"])
+        return deleted
+
+    def clear(self) -> int:
+        """
+        Delete every entry
+
+        Returns:
+            Number of entries deleted
+        """
+        entries = self.entries()
+        for entry in entries:
+            shutil.rmtree(entry["path"], ignore_errors=True)
+        return len(entries)
+
+    def stats(self) -> dict:
+        entries = self.entries()
+        return {
+            "directory": self.directory,
+            "entries": len(entries),
+            "bytes": sum(entry["bytes"] for entry in entries),
+            "max_bytes": self.max_bytes,
+            "oldest": entries[0]["used"] if entries else None,
+            "newest": entries[-1]["used"] if entries else None,
+        }
+
+
+def add_parser(subparsers) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(
+        "cache",
+        help="Show or clear the cache of generated files",
+        description="Show the size of the cache of generated files, or delete them. "
+        "The cache directory and size limit are given before the command.",
+    )
+    parser.add_argument("action", choices=["stats", "clear"])
+    parser.set_defaults(func=run)
+    return parser
+
+
+def run(args: argparse.Namespace) -> None:
+    store = DatasetCache(args.cache_dir, args.cache_size)
+    if args.action == "clear":
+        deleted = store.clear()
+        print(f"Deleted {deleted} entries from {store.directory}")
+        return
+
+    stats = store.stats()
+    print(f"Directory: {stats['directory']}")
+    print(f"Entries:   {stats['entries']}")
+    print(
+        f"Size:      {stats['bytes'] / 1e6:.1f} MB "
+        f"of {stats['max_bytes'] / 1e6:.0f} MB"
+    )
+    for name in ("oldest", "newest"):
+        if stats[name] is not None:
+            used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stats[name]))
+            print(f"{name.capitalize() + ':':<11}{used}")
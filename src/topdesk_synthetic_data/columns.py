@@ -0,0 +1,193 @@
+"""
+Helpers to draw whole columns of synthetic data at once using NumPy
+
+String columns are object arrays so that they can be concatenated element-wise and
+handed to pandas without conversion.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Mapping, Optional, Sequence
+
+from .lazy import lazy_import
+
+numpy = lazy_import("numpy")
+pandas = lazy_import("pandas")
+
+# Relative date strings, using the same grammar as Faker, e.g. "-30d" or "+3y"
+_RELATIVE_DATE = re.compile(
+    r"^((?P<years>[+-]\d+?)y)?((?P<months>[+-]\d+?)M)?((?P<weeks>[+-]\d+?)w)?"
+    r"((?P<days>[+-]\d+?)d)?((?P<hours>[+-]\d+?)h)?((?P<minutes>[+-]\d+?)m)?"
+    r"((?P<seconds>[+-]\d+?)s)?$"
+)
+
+
+def default_rng(rng: Optional[numpy.random.Generator] = None) -> numpy.random.Generator:
+    return numpy.random.default_rng() if rng is None else rng
+
+
+def relative_datetime(value: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Resolve "now", "today" or a Faker-style relative date string such as "-6M"
+
+    Args:
+        value: Relative date string
+        now: Reference time, defaults to the current time
+    """
+    now = datetime.now() if now is None else now
+    if value == "now":
+        return now
+    if value == "today":
+        return datetime.combine(now.date(), datetime.min.time())
+    match = _RELATIVE_DATE.match(value)
+    if not match or not any(match.groupdict().values()):
+        raise ValueError(f"Can't parse date string `{value}`")
+    params = {name: int(part) for name, part in match.groupdict().items() if part}
+    days = params.pop("days", 0)
+    days += 365.24 * params.pop("years", 0) + 30.42 * params.pop("months", 0)
+    return now + timedelta(days=days, **params)
+
+
+def choice(rng: numpy.random.Generator, options: Sequence, size: int) -> numpy.ndarray:
+    """
+    Draw uniformly from a list of options
+    """
+    return numpy.array(options, dtype=object)[rng.integers(0, len(options), size)]
+
+
+def categorical_dtypes(
+    fields: Mapping[str, Optional[Sequence[str]]],
+) -> Dict[str, pandas.CategoricalDtype]:
+    """
+    Categorical types with a fixed set of categories for each field, so that every
+    chunk of a dataset shares the same dictionary when written to typed formats
+
+    Fields whose categories are None are left as they are.
+    """
+    return {
+        name: pandas.CategoricalDtype(values)
+        for name, values in fields.items()
+        if values is not None
+    }
+
+
+def optional(
+    rng: numpy.random.Generator, values: numpy.ndarray, threshold: float, empty=""
+) -> numpy.ndarray:
+    """
+    Keep each value where a uniform draw exceeds the threshold, otherwise leave it empty
+    """
+    return numpy.where(rng.random(len(values)) > threshold, values, empty)
+
+
+def coin(rng: numpy.random.Generator, size: int) -> numpy.ndarray:
+    """
+    Fair True/False draws
+    """
+    return rng.random(size) < 0.5
+
+
+def to_text(values: numpy.ndarray) -> numpy.ndarray:
+    """
+    Convert numbers to an object array of strings for concatenation
+    """
+    return values.astype(str).astype(object)
+
+
+def sequence(start: int, size: int, width: int) -> numpy.ndarray:
+    """
+    One-based row numbers after the start offset, zero-padded to a minimum width
+    """
+    return numpy.array(
+        [str(i).zfill(width) for i in range(start + 1, start + size + 1)], dtype=object
+    )
+
+
+def uuid4(rng: numpy.random.Generator, size: int) -> numpy.ndarray:
+    """
+    Random version 4 UUID strings
+    """
+    raw = rng.integers(0, 256, size=(size, 16), dtype=numpy.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    digits = numpy.frombuffer(raw.tobytes().hex().encode(), dtype="S1").reshape(
+        size, 32
+    )
+    dash = numpy.full((size, 1), b"-", dtype="S1")
+    text = numpy.hstack(
+        [
+            digits[:, :8],
+            dash,
+            digits[:, 8:12],
+            dash,
+            digits[:, 12:16],
+            dash,
+            digits[:, 16:20],
+            dash,
+            digits[:, 20:],
+        ]
+    )
+    return numpy.ascontiguousarray(text).view("S36").ravel().astype(str).astype(object)
+
+
+def lexify(rng: numpy.random.Generator, pattern: str, size: int) -> numpy.ndarray:
+    """
+    Fill a pattern with random upper-case letters for "?" and digits for "#"
+    """
+    columns = []
+    for character in pattern:
+        if character == "?":
+            columns.append(
+                rng.integers(ord("A"), ord("Z") + 1, size, dtype=numpy.uint8)
+            )
+        elif character == "#":
+            columns.append(
+                rng.integers(ord("0"), ord("9") + 1, size, dtype=numpy.uint8)
+            )
+        else:
+            columns.append(numpy.full(size, ord(character), dtype=numpy.uint8))
+    text = numpy.ascontiguousarray(numpy.stack(columns, axis=1))
+    return text.view(f"S{len(pattern)}").ravel().astype(str).astype(object)
+
+
+def datetimes(
+    rng: numpy.random.Generator,
+    start_date: str,
+    end_date: str,
+    size: int,
+    now: Optional[datetime] = None,
+) -> numpy.ndarray:
+    """
+    Uniform timestamps (to the second) between two relative dates
+    """
+    start = numpy.datetime64(relative_datetime(start_date, now), "s")
+    end = numpy.datetime64(relative_datetime(end_date, now), "s")
+    span = int((end - start).astype(numpy.int64))
+    return start + rng.integers(0, span + 1, size).astype("timedelta64[s]")
+
+
+def dates(
+    rng: numpy.random.Generator,
+    start_date: str,
+    end_date: str,
+    size: int,
+    now: Optional[datetime] = None,
+) -> numpy.ndarray:
+    """
+    Uniform calendar dates between two relative dates
+    """
+    start = numpy.datetime64(relative_datetime(start_date, now), "D")
+    end = numpy.datetime64(relative_datetime(end_date, now), "D")
+    span = int((end - start).astype(numpy.int64))
+    return start + rng.integers(0, span + 1, size).astype("timedelta64[D]")
+
+
+def offsets(
+    rng: numpy.random.Generator, low: int, high: int, unit: str, size: int
+) -> numpy.ndarray:
+    """
+    Random time deltas between low and high (inclusive) in the given unit, e.g. "h"
+    """
+    return rng.integers(low, high + 1, size).astype(f"timedelta64[{unit}]")
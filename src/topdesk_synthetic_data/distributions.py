@@ -0,0 +1,356 @@
+"""
+Weighted and conditional distributions of categorical fields
+
+By default every categorical field is drawn uniformly from its categories. A
+distribution spec, usually loaded from a JSON file, gives weights for some fields of
+each entity, either fixed or conditional on a field drawn before them (e.g. priority
+given category) or on the age of an incident in days. Weighted draws use alias tables,
+built once per table, so each draw takes constant time and whole columns are drawn at
+once with NumPy.
+
+A spec looks like this::
+
+    {
+        "incident": {
+            "category": {"weights": {"Software & Applications": 5, "Hardware Resources": 1}},
+            "priority": {
+                "given": "category",
+                "weights": {
+                    "HPC Access & Authentication": {"P1": 3, "P2": 5, "P3": 2},
+                    "*": {"P2": 1, "P3": 4, "P4": 4}
+                }
+            },
+            "status": {
+                "given": "age",
+                "bins": [2, 14],
+                "weights": [{"Logged": 5, "In Progress": 3}, {"In Progress": 1}, {"Resolved": 1}]
+            }
+        }
+    }
+
+Categories left out of a weights table have zero weight. Conditions left out of a
+conditional table use its "*" table, or a uniform draw if it has none. Age bins are
+the upper bounds in days of each age group but the last.
+
+Incident fields may depend on the incident's category, subcategory, status or age;
+other entities' fields have fixed weights. Incident subcategories are drawn uniformly
+from the list for their category. Optional fields such as an incident's operator stay
+empty as often as before, and their weights apply to the rest.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from . import columns
+from .lazy import lazy_import
+
+numpy = lazy_import("numpy")
+
+
+class AliasTable:
+    """
+    Walker's alias method for drawing from a discrete distribution in constant time,
+    built with Vose's algorithm
+
+    Args:
+        weights: Non-negative weight of each outcome
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        weights = numpy.asarray(weights, dtype=float)
+        if weights.ndim != 1 or not len(weights) or (weights < 0).any():
+            raise ValueError("Weights must be a non-empty list of non-negative numbers")
+        total = weights.sum()
+        if not total > 0:
+            raise ValueError("Weights must not all be zero")
+        size = len(weights)
+        scaled = weights * size / total
+        self.probability = numpy.ones(size)
+        self.alias = numpy.arange(size)
+        small = [i for i in range(size) if scaled[i] < 1]
+        large = [i for i in range(size) if scaled[i] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left over has a probability of one, up to rounding errors
+
+    @classmethod
+    def from_arrays(
+        cls, probability: Sequence[float], alias: Sequence[int]
+    ) -> "AliasTable":
+        """
+        A table built before, from its probability and alias of each outcome
+        """
+        if len(probability) != len(alias):
+            raise ValueError("Give a probability and an alias for each outcome")
+        table = cls.__new__(cls)
+        table.probability = numpy.asarray(probability, dtype=float)
+        table.alias = numpy.asarray(alias, dtype=numpy.intp)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def sample(self, rng: numpy.random.Generator, size: int) -> numpy.ndarray:
+        """
+        Indices of outcomes for size draws
+        """
+        index = rng.integers(0, len(self), size)
+        return numpy.where(
+            rng.random(size) < self.probability[index], index, self.alias[index]
+        )
+
+    def choose(self, rng: random.Random) -> int:
+        """
+        Index of the outcome of one draw
+        """
+        index = rng.randrange(len(self))
+        return index if rng.random() < self.probability[index] else self.alias[index]
+
+
+class FieldDistribution:
+    """
+    The distribution of one categorical field, from its part of a spec
+
+    Args:
+        values: Categories of the field
+        spec: {"weights": {category: weight}}, optionally with "given" naming the field
+            the weights depend on and "bins" for age groups
+    """
+
+    def __init__(self, values: Sequence[str], spec: Mapping[str, Any]):
+        self.values = numpy.array(values, dtype=object)
+        self.given = spec.get("given")
+        self.bins = None
+        weights = spec["weights"]
+        if self.given is None:
+            self.tables = {None: self._table(weights)}
+        elif self.given == "age":
+            self.bins = numpy.asarray(spec["bins"], dtype=float)
+            if self.bins.ndim != 1 or (numpy.diff(self.bins) <= 0).any():
+                raise ValueError("Age bins must be a strictly increasing list of days")
+            if len(weights) != len(self.bins) + 1:
+                raise ValueError("Give one weights table per age group")
+            self.tables = dict(enumerate(map(self._table, weights)))
+        else:
+            self.tables = {
+                condition: self._table(table) for condition, table in weights.items()
+            }
+
+    def _table(self, weights: Mapping[str, float]) -> AliasTable:
+        unknown = set(weights) - set(self.values)
+        if unknown:
+            raise ValueError(f"Unknown categories {sorted(unknown)}")
+        return AliasTable([weights.get(value, 0) for value in self.values])
+
+    def _condition(self, context: Mapping[str, Any]):
+        if self.given is None:
+            return None
+        if self.given not in context:
+            raise ValueError(f"Weights can't depend on {self.given!r} for this field")
+        return context[self.given]
+
+    def _lookup(self, condition) -> Optional[AliasTable]:
+        return self.tables.get(condition, self.tables.get("*"))
+
+    def sample(
+        self, rng: numpy.random.Generator, size: int, context: Mapping[str, Any]
+    ) -> numpy.ndarray:
+        """
+        Draw a column of values
+
+        Args:
+            context: Columns drawn already, by field name, and the age of each record
+                in days as "age"
+        """
+        conditions = self._condition(context)
+        if conditions is None:
+            return self.values[self.tables[None].sample(rng, size)]
+        if self.bins is not None:
+            conditions = numpy.searchsorted(self.bins, conditions, side="right")
+        # Draw each group of records with the same condition together
+        groups, inverse = numpy.unique(conditions, return_inverse=True)
+        index = numpy.empty(size, dtype=numpy.int64)
+        for group, condition in enumerate(groups):
+            rows = numpy.flatnonzero(inverse == group)
+            table = self._lookup(condition)
+            if table is None:
+                index[rows] = rng.integers(0, len(self.values), len(rows))
+            else:
+                index[rows] = table.sample(rng, len(rows))
+        return self.values[index]
+
+    def choose(self, rng: random.Random, context: Mapping[str, Any]) -> str:
+        """
+        Draw one value
+        """
+        condition = self._condition(context)
+        if self.bins is not None:
+            condition = int(numpy.searchsorted(self.bins, condition, side="right"))
+        table = self._lookup(condition)
+        if table is None:
+            return rng.choice(self.values)
+        return self.values[table.choose(rng)]
+
+
+class Distributions:
+    """
+    A parsed distribution spec, with the distribution of each field built when it is
+    first used
+
+    Args:
+        spec: Distributions by entity name and then field name
+    """
+
+    def __init__(self, spec: Mapping[str, Mapping[str, Any]]):
+        self.spec = spec
+        # The spec in a canonical form, to compare and hash
+        self._text = json.dumps(spec, sort_keys=True)
+        self._fields: Dict[tuple, FieldDistribution] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "Distributions":
+        with open(path, encoding="utf-8") as file:
+            return cls(json.load(file))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Distributions) and self._text == other._text
+
+    def __hash__(self) -> int:
+        return hash(self._text)
+
+    def __getstate__(self):
+        return self.spec
+
+    def __setstate__(self, spec):
+        self.__init__(spec)
+
+    def validate(
+        self,
+        fields: Mapping[str, Mapping[str, Sequence[str]]],
+        conditions: Optional[Mapping[str, Mapping[str, Sequence[str]]]] = None,
+    ) -> None:
+        """
+        Check the spec against the categorical fields of each entity, so that mistakes
+        are found before generating anything
+
+        Args:
+            fields: Categories by entity name and field name. Empty categories, for
+                optional fields, can't be weighted and are ignored.
+            conditions: Fields, or "age", that the weights of each field may depend on,
+                by entity name and field name. Other fields have fixed weights.
+        """
+        conditions = conditions or {}
+        for entity, entity_spec in self.spec.items():
+            if entity not in fields:
+                raise ValueError(f"Unknown entity {entity!r} in distributions")
+            for name in entity_spec:
+                if name not in fields[entity]:
+                    raise ValueError(f"{entity} has no categorical field {name!r}")
+                values = [value for value in fields[entity][name] if value]
+                try:
+                    self._check_condition(
+                        entity_spec[name],
+                        conditions.get(entity, {}).get(name, []),
+                        fields[entity],
+                    )
+                    FieldDistribution(values, entity_spec[name])
+                except (KeyError, TypeError, ValueError) as exc:
+                    raise ValueError(
+                        f"Invalid distribution of {entity} {name}: {exc}"
+                    ) from exc
+
+    @staticmethod
+    def _check_condition(
+        spec: Mapping[str, Any],
+        allowed: Sequence[str],
+        fields: Mapping[str, Sequence[str]],
+    ) -> None:
+        if not isinstance(spec, Mapping):
+            raise ValueError("Expected an object with weights")
+        given = spec.get("given")
+        if given is None:
+            return
+        if given not in allowed:
+            raise ValueError(
+                f"Weights can't depend on {given!r}"
+                + (f", only on {', '.join(allowed)}" if allowed else "")
+            )
+        if given != "age":
+            unknown = set(spec["weights"]) - set(fields[given]) - {"*"}
+            if unknown:
+                raise ValueError(f"Unknown {given} {sorted(unknown)} in weights")
+
+    def field(
+        self, entity: str, name: str, values: Sequence[str]
+    ) -> Optional[FieldDistribution]:
+        """
+        Distribution of a field, or None if it is uniform
+        """
+        key = (entity, name)
+        if key not in self._fields:
+            spec = self.spec.get(entity, {}).get(name)
+            self._fields[key] = (
+                None if spec is None else FieldDistribution(values, spec)
+            )
+        return self._fields[key]
+
+
+_distributions: Optional[Distributions] = None
+
+
+def configure(distributions: Optional[Distributions] = None) -> None:
+    """
+    Set the distributions used by the generators in this process, or None for uniform
+    """
+    global _distributions
+    _distributions = distributions
+
+
+def _field(entity: str, name: str, values: Sequence[str]):
+    if _distributions is None:
+        return None
+    return _distributions.field(entity, name, values)
+
+
+def choice(
+    rng: numpy.random.Generator,
+    entity: str,
+    name: str,
+    values: Sequence[str],
+    size: int,
+    **context,
+) -> numpy.ndarray:
+    """
+    Draw a column of a categorical field
+
+    Args:
+        rng: NumPy random generator
+        entity: Entity name, e.g. "incident"
+        name: Field name
+        values: Categories of the field
+        size: Number of values
+        context: Columns the field's weights may depend on, and "age" in days
+    """
+    field = _field(entity, name, values)
+    if field is None:
+        return columns.choice(rng, values, size)
+    return field.sample(rng, size, context)
+
+
+def choose(
+    rng: random.Random, entity: str, name: str, values: Sequence[str], **context
+) -> str:
+    """
+    Draw one value of a categorical field, like choice() for row-by-row generators
+    """
+    field = _field(entity, name, values)
+    if field is None:
+        return rng.choice(values)
+    return field.choose(rng, context)
@@ -0,0 +1,44 @@
+"""
+The Faker instance shared by the generators
+
+Creating a Faker instance loads the providers for its locale, which is slow, so the
+shared instance is only created when it is first used. It has its own random
+generator, which the row-by-row generators also use for all their other random
+choices, so that seeding it makes the records reproducible without touching the
+global random module.
+"""
+
+import threading
+
+from .lazy import lazy_import
+
+faker = lazy_import("faker")
+
+
+class LazyFaker:
+    """
+    Stands in for a Faker instance, creating it when one of its attributes is first
+    read
+    """
+
+    def __init__(self):
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self) -> "faker.Faker":
+        """
+        The Faker instance
+        """
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    instance = faker.Faker()
+                    instance.seed_instance()
+                    self._instance = instance
+        return self._instance
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
+
+
+fake = LazyFaker()
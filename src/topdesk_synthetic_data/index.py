@@ -0,0 +1,102 @@
+"""
+In-memory indexes of generated records, so that other entities can refer to them
+
+An index holds the columns of one entity that others need, with lookups by id and by a
+grouping column such as department. Records are sampled by position, so drawing a
+related record is O(1) whatever the size of the index.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from .lazy import lazy_import
+
+numpy = lazy_import("numpy")
+pandas = lazy_import("pandas")
+
+
+class RecordIndex:
+    """
+    Generated records indexed by id and, optionally, by a grouping column
+
+    Args:
+        frame: Records with an "id" column
+        group_by: Column to group records by, e.g. "department"
+    """
+
+    def __init__(self, frame: pandas.DataFrame, group_by: Optional[str] = None):
+        self.frame = frame.reset_index(drop=True)
+        self.group_by = group_by
+        self.groups: Dict[Hashable, numpy.ndarray] = {}
+        if group_by:
+            self.groups = self.frame.groupby(group_by, observed=True).indices
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Iterable[pandas.DataFrame],
+        fields: Iterable[str],
+        group_by: Optional[str] = None,
+    ) -> "RecordIndex":
+        """
+        Build an index from chunks of records, keeping only the fields it needs
+        """
+        fields = list(fields)
+        frames = [chunk[fields] for chunk in chunks]
+        frame = pandas.concat(frames) if frames else pandas.DataFrame(columns=fields)
+        return cls(frame, group_by)
+
+    def __len__(self) -> int:
+        return len(self.frame.index)
+
+    @functools.cached_property
+    def positions(self) -> Dict[str, int]:
+        """
+        Row position of each record id
+        """
+        return {record_id: i for i, record_id in enumerate(self.frame["id"])}
+
+    def __getitem__(self, record_id: str) -> Dict[str, Any]:
+        return self.frame.iloc[self.positions[record_id]].to_dict()
+
+    def sample(self, rng: numpy.random.Generator, size: int) -> numpy.ndarray:
+        """
+        Positions of records drawn uniformly at random
+        """
+        if not len(self):
+            raise ValueError("Can't sample from an empty index")
+        return rng.integers(0, len(self), size)
+
+    def sample_groups(
+        self, rng: numpy.random.Generator, groups: numpy.ndarray
+    ) -> numpy.ndarray:
+        """
+        Positions of records drawn at random from the given group for each value,
+        or -1 where the group has no records
+        """
+        positions = numpy.full(len(groups), -1)
+        for group, members in self.groups.items():
+            mask = groups == group
+            positions[mask] = members[rng.integers(0, len(members), mask.sum())]
+        return positions
+
+    def column(self, name: str, positions: numpy.ndarray, empty="") -> numpy.ndarray:
+        """
+        Values of a field for the records at the given positions, empty where -1
+        """
+        values = self.frame[name].to_numpy(dtype=object)[positions]
+        values[positions < 0] = empty
+        return values
+
+    def save(self, path: str) -> None:
+        pandas.to_pickle((self.frame, self.group_by), path)
+
+
+@functools.lru_cache(maxsize=4)
+def load(path: str) -> RecordIndex:
+    """
+    Read an index saved by another process, once per process
+    """
+    return RecordIndex(*pandas.read_pickle(path))
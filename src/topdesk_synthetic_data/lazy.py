@@ -0,0 +1,60 @@
+"""
+Import heavy modules when they are first used
+
+NumPy, pandas, Faker and openpyxl take most of a second to import together, which
+dominates short runs and --help. Modules of this package import them with
+lazy_import(), which returns a stand-in module that imports the real one when one of
+its attributes is first read, so they are only imported on the code paths that use
+them. Modules that refer to them in annotations use postponed evaluation of
+annotations so that defining a function doesn't import them.
+"""
+
+import importlib
+import importlib.util
+import threading
+import types
+from typing import Optional
+
+
+class LazyModule(types.ModuleType):
+    """
+    A module that imports the named module, and any submodules, on first attribute
+    access and then takes on its attributes
+    """
+
+    def __init__(self, name: str, submodules=()):
+        super().__init__(name)
+        self._lazy_submodules = submodules
+        self._lazy_module = None
+        self._lazy_lock = threading.Lock()
+
+    def __getattr__(self, attribute: str):
+        # Only called for attributes that haven't been copied from the module yet
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                module = importlib.import_module(self.__name__)
+                for submodule in self._lazy_submodules:
+                    importlib.import_module(submodule)
+                self.__dict__.update(module.__dict__)
+                self._lazy_module = module
+        # Some modules, e.g. NumPy, import submodules on first access themselves
+        value = getattr(self._lazy_module, attribute)
+        self.__dict__[attribute] = value
+        return value
+
+
+def lazy_import(
+    name: str, *submodules: str, optional: bool = False
+) -> Optional[types.ModuleType]:
+    """
+    A module to be imported when it is first used
+
+    Args:
+        name: Module name, e.g. "pandas"
+        submodules: Submodules to import with it, e.g. "pyarrow.parquet"
+        optional: Return None if the module isn't installed, rather than failing when
+            it is used
+    """
+    if optional and importlib.util.find_spec(name) is None:
+        return None
+    return LazyModule(name, submodules)
@@ -0,0 +1,377 @@
+"""
+Load generated records into a TOPdesk-compatible REST API
+
+Records are streamed from the generators to the API with asyncio. A fixed number of
+workers each keep one HTTP/1.1 connection open, so the workers form the connection
+pool. Records are posted one per request, or as JSON arrays in batches, and failed
+requests are retried with exponential backoff.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import itertools
+import json
+import logging
+import os
+import random
+import ssl
+import time
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from . import shards
+from .lazy import lazy_import
+from .timestamps import format_array
+
+pandas = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# API paths for each entity, relative to the base URL
+PATHS = {
+    "incident": "/tas/api/incidents",
+    "person": "/tas/api/persons",
+    "asset": "/tas/api/assetmgmt/assets",
+}
+
+# Environment variable holding the password for HTTP basic authentication
+PASSWORD_VARIABLE = "TOPDESK_PASSWORD"
+
+# Responses that may succeed if the request is repeated
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, body: bytes):
+        super().__init__(f"HTTP {status}: {body[:200].decode(errors='replace')}")
+        self.status = status
+
+
+class Connection:
+    """
+    A persistent HTTP/1.1 connection, reopened when the server closes it
+    """
+
+    def __init__(self, url: urllib.parse.SplitResult, timeout: float):
+        self.url = url
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def _open(self) -> None:
+        secure = self.url.scheme == "https"
+        self._reader, self._writer = await asyncio.open_connection(
+            self.url.hostname,
+            self.url.port or (443 if secure else 80),
+            ssl=ssl.create_default_context() if secure else None,
+        )
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(
+        self, method: str, path: str, headers: Dict[str, str], body: bytes
+    ) -> Tuple[int, bytes]:
+        """
+        Send a request and read the whole response
+
+        Returns:
+            Status code and response body
+        """
+        try:
+            return await asyncio.wait_for(
+                self._request(method, path, headers, body), self.timeout
+            )
+        except BaseException:
+            # The connection may be left mid-response, so don't reuse it
+            self.close()
+            raise
+
+    async def _request(
+        self, method: str, path: str, headers: Dict[str, str], body: bytes
+    ) -> Tuple[int, bytes]:
+        if self._writer is None:
+            await self._open()
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.url.netloc}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Content-Length: {len(body)}")
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Server closed the connection")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if not size:
+                    break
+                chunks.append(chunk[:-2])
+            response = b"".join(chunks)
+        else:
+            length = int(response_headers.get("content-length", 0))
+            response = await self._reader.readexactly(length)
+
+        if response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, response
+
+
+class Stats:
+    """
+    Running totals for throughput reporting
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records = 0
+        self.requests = 0
+        self.retries = 0
+        self.failed = 0
+
+    def report(self) -> str:
+        seconds = time.perf_counter() - self.started
+        return (
+            f"{self.records} records in {self.requests} requests "
+            f"({self.records / seconds:.1f} records/s), "
+            f"{self.retries} retries, {self.failed} failed records"
+        )
+
+
+def to_records(chunk: pandas.DataFrame) -> List[dict]:
+    """
+    Convert a chunk of columns to JSON-serialisable records, with timestamps as text
+    and missing values as null
+    """
+    columns = {}
+    for name, column in chunk.items():
+        if column.dtype.kind == "M":
+            values = format_array(column.to_numpy())
+        else:
+            values = column.to_numpy(dtype=object)
+            values[column.isna().to_numpy()] = None
+        columns[name] = values
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def batches(records: List[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(records)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+class Loader:
+    """
+    Post batches of records to an endpoint from a number of concurrent workers
+
+    Args:
+        url: Base URL of the API
+        concurrency: Number of workers, each with its own connection
+        batch_size: Records per request. Batches of more than one record are sent
+            as a JSON array.
+        retries: Number of times to retry a failed request
+        backoff: Delay before the first retry in seconds, doubled for each retry
+        timeout: Seconds to wait for each response
+        auth: User name and password for HTTP basic authentication
+    """
+
+    def __init__(
+        self,
+        url: str,
+        concurrency: int = 8,
+        batch_size: int = 1,
+        retries: int = 5,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+        auth: Optional[Tuple[str, str]] = None,
+    ):
+        self.url = urllib.parse.urlsplit(url.rstrip("/"))
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        if auth:
+            token = base64.b64encode(":".join(auth).encode()).decode()
+            self.headers["Authorization"] = f"Basic {token}"
+        self.stats = Stats()
+
+    async def _post(self, connection: Connection, path: str, batch: List[dict]):
+        body = json.dumps(batch if self.batch_size > 1 else batch[0]).encode()
+        for attempt in range(self.retries + 1):
+            try:
+                status, response = await connection.request(
+                    "POST", path, self.headers, body
+                )
+                self.stats.requests += 1
+                if 200 <= status < 300:
+                    self.stats.records += len(batch)
+                    return
+                error = HTTPError(status, response)
+                if status not in RETRY_STATUSES:
+                    raise error
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                error = exc
+            if attempt < self.retries:
+                self.stats.retries += 1
+                delay = self.backoff * 2**attempt
+                await asyncio.sleep(delay + random.uniform(0, delay))
+        raise error
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        connection = Connection(self.url, self.timeout)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                path, batch = item
+                try:
+                    await self._post(connection, path, batch)
+                except Exception as exc:
+                    self.stats.failed += len(batch)
+                    logger.warning("Failed to load %d records: %s", len(batch), exc)
+        finally:
+            connection.close()
+
+    async def _report(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            logger.info(self.stats.report())
+
+    async def load(self, chunks, report_interval: float = 5.0) -> Stats:
+        """
+        Post records from an iterator of (entity, chunk) pairs
+
+        Chunks are generated in a thread while earlier ones are sent. The queue of
+        batches is bounded, so generation waits for the API rather than filling memory.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=2 * self.concurrency)
+        workers = [
+            asyncio.create_task(self._work(queue)) for _ in range(self.concurrency)
+        ]
+        reporter = asyncio.create_task(self._report(report_interval))
+        try:
+            while True:
+                item = await loop.run_in_executor(None, next, chunks, None)
+                if item is None:
+                    break
+                entity, chunk = item
+                path = self.url.path + PATHS[entity]
+                records = to_records(chunk)
+                for batch in batches(records, self.batch_size):
+                    await queue.put((path, batch))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            reporter.cancel()
+            for worker in workers:
+                worker.cancel()
+        return self.stats
+
+
+def add_parser(subparsers) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(
+        "load",
+        help="Post generated records to a TOPdesk-compatible REST API",
+        description="Stream generated records to a TOPdesk-compatible REST API. "
+        f"The password for --user is read from the {PASSWORD_VARIABLE} environment "
+        "variable. The record types, the number of records and the other generation "
+        "options are given before the command.",
+    )
+    parser.add_argument("url", help="Base URL of the API, e.g. https://host")
+    parser.add_argument("--user", help="User name for HTTP basic authentication")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of requests in flight, each on its own connection",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Records per request; more than one are sent as a JSON array",
+    )
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument(
+        "--backoff",
+        type=float,
+        default=0.5,
+        help="Seconds before the first retry, doubled for each further retry",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Seconds to wait for a response"
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between throughput reports",
+    )
+    parser.set_defaults(func=run)
+    return parser
+
+
+def run(args: argparse.Namespace) -> None:
+    auth = None
+    if args.user:
+        auth = (args.user, os.environ.get(PASSWORD_VARIABLE, ""))
+    loader = Loader(
+        args.url,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        retries=args.retries,
+        backoff=args.backoff,
+        timeout=args.timeout,
+        auth=auth,
+    )
+    with (
+        ProcessPoolExecutor(args.workers)
+        if args.workers > 1
+        else contextlib.nullcontext()
+    ) as executor:
+        chunks = (
+            (entity, chunk)
+            for entity, num_records in args.counts.items()
+            for chunk in shards.generate(
+                entity,
+                num_records,
+                chunk_size=args.chunk_size,
+                seed=args.seed,
+                now=args.now,
+                executor=executor,
+                pool_size=args.faker_pool,
+                pool_refresh=args.faker_refresh,
+                number_format=args.number_format,
+                weights=args.distributions,
+                schema=args.schema,
+            )
+        )
+        stats = asyncio.run(loader.load(chunks, args.report_interval))
+    logger.info("Loaded %s", stats.report())
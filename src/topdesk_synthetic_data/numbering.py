@@ -0,0 +1,176 @@
+"""
+Unique, random-looking incident numbers
+
+Incident numbers such as "SHEF 1234 5678" are drawn from a fixed number space. Drawing
+them at random would repeat numbers once a few thousand incidents have been generated,
+so instead each record's row number is mapped to a number by a keyed permutation of
+the number space. Every row gets a different number, in constant time and memory, and
+any row's number can be computed on its own.
+
+The permutation is a Feistel network over the smallest power of two that covers the
+number space, with cycle walking: values that land outside the space are permuted
+again until they fall inside it.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .lazy import lazy_import
+
+numpy = lazy_import("numpy")
+
+# Digits in each of the two groups of an incident number, by format name
+FORMATS = {"standard": 4, "wide": 6}
+
+PREFIX = "SHEF"
+
+
+def _mix(values: numpy.ndarray) -> numpy.ndarray:
+    """
+    SplitMix64 finaliser, a fast hash of 64-bit integers
+    """
+    values = values ^ (values >> numpy.uint64(30))
+    values = values * numpy.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> numpy.uint64(27))
+    values = values * numpy.uint64(0x94D049BB133111EB)
+    return values ^ (values >> numpy.uint64(31))
+
+
+class Permutation:
+    """
+    A random-looking one-to-one mapping of the integers from 0 to size - 1 onto
+    themselves, chosen by a key
+
+    Args:
+        size: Number of integers
+        key: Seed for the round keys
+        rounds: Number of Feistel rounds
+    """
+
+    def __init__(self, size: int, key: int, rounds: int = 4):
+        self.size = size
+        # Split an even number of bits into two halves
+        bits = max(2, (size - 1).bit_length())
+        bits += bits % 2
+        self.half = numpy.uint64(bits // 2)
+        self.mask = numpy.uint64((1 << (bits // 2)) - 1)
+        self.keys = numpy.random.SeedSequence(key).generate_state(
+            rounds, dtype=numpy.uint64
+        )
+
+    def _encrypt(self, values: numpy.ndarray) -> numpy.ndarray:
+        left = values >> self.half
+        right = values & self.mask
+        for key in self.keys:
+            left, right = right, left ^ (_mix(right ^ key) & self.mask)
+        return (left << self.half) | right
+
+    def __call__(self, indices) -> numpy.ndarray:
+        values = numpy.asarray(indices, dtype=numpy.uint64)
+        if values.size and int(values.max()) >= self.size:
+            raise ValueError(f"Index out of range for {self.size} values")
+        values = self._encrypt(values)
+        # The domain is less than four times the size, so few values need more passes
+        outside = values >= self.size
+        while outside.any():
+            values[outside] = self._encrypt(values[outside])
+            outside = values >= self.size
+        return values
+
+
+class ReferenceNumbers:
+    """
+    Unique incident numbers, one for each row number
+
+    Args:
+        key: Seed for the permutation, so the same key gives the same numbers
+        style: Name of the number format in FORMATS
+    """
+
+    def __init__(self, key: int, style: str = "standard"):
+        self.key = key
+        self.style = style
+        digits = FORMATS[style]
+        self.first = 10 ** (digits - 1)
+        self.group = 9 * self.first
+        self.permutation = Permutation(self.capacity, key)
+
+    @property
+    def capacity(self) -> int:
+        """
+        Number of unique numbers in the format
+        """
+        return self.group**2
+
+    def __call__(self, indices) -> numpy.ndarray:
+        """
+        Incident numbers for row numbers from zero, as an object array of strings
+        """
+        try:
+            values = self.permutation(indices)
+        except ValueError:
+            raise ValueError(
+                f"There are only {self.capacity} incident numbers in the {self.style} "
+                "format, use a wider format for more records"
+            ) from None
+        high, low = numpy.divmod(values, numpy.uint64(self.group))
+        return (
+            f"{PREFIX} "
+            + (high + numpy.uint64(self.first)).astype(str).astype(object)
+            + " "
+            + (low + numpy.uint64(self.first)).astype(str).astype(object)
+        )
+
+
+_numbers: Optional[ReferenceNumbers] = None
+
+
+def capacity(style: str = "standard") -> int:
+    """
+    Number of unique incident numbers in a format
+    """
+    return (9 * 10 ** (FORMATS[style] - 1)) ** 2
+
+
+def configure(key: int, style: str = "standard") -> None:
+    """
+    Set the key and format of the incident numbers shared by the shards of a run
+    """
+    global _numbers
+    if _numbers is None or (_numbers.key, _numbers.style) != (key, style):
+        _numbers = ReferenceNumbers(key, style)
+
+
+def reset() -> None:
+    """
+    Forget the numbers set by configure(), keying them on the caller's generator again
+    """
+    global _numbers
+    _numbers = None
+
+
+def _key(rng: numpy.random.Generator) -> int:
+    # The seed sequence stays the same as the generator is used (NumPy >= 1.25)
+    sequence = getattr(rng.bit_generator, "seed_seq", None)
+    if isinstance(sequence, numpy.random.SeedSequence):
+        return int(sequence.generate_state(1, numpy.uint64)[0])
+    return int(rng.integers(2**63))
+
+
+def reference_numbers(
+    start: int, count: int, rng: Optional[numpy.random.Generator] = None
+) -> numpy.ndarray:
+    """
+    Incident numbers for count rows from the start row
+
+    Uses the numbers set by configure(). If it hasn't been called, the key comes from
+    the seed of rng, so generators with the same seed give the same numbers, others
+    give different ones, and the chunks generated with one generator don't share
+    numbers.
+    """
+    numbers = _numbers
+    if numbers is None:
+        numbers = ReferenceNumbers(_key(numpy.random.default_rng(rng)))
+    end = start + count
+    return numbers(numpy.arange(start, end, dtype=numpy.uint64))
@@ -0,0 +1,188 @@
+"""
+Pre-sampled pools of Faker values
+
+Faker's providers are slow per call. With a pool configured, the columnar generators
+draw values from a few thousand pre-generated ones per provider instead, trading
+diversity for throughput. Without a pool, every value is a fresh Faker call.
+
+The pool is shared by all entities in a process. Its values depend only on the run's
+seed, and evictions only last for one shard, so seeded output stays the same however
+the shards are spread over processes.
+
+Fields that call Faker or render templates for every row are by far the slowest to
+generate, so they are computed with per_row() in groups of ``ROWS_PER_SEED`` rows, each
+group with its own seed. Generating a few rows from a large block then only computes
+the groups that hold the selected rows, and a row's value doesn't depend on which
+other rows are computed.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, Optional
+
+from .lazy import lazy_import
+
+faker = lazy_import("faker")
+numpy = lazy_import("numpy")
+
+# Number of rows of a per-row field computed from each seed
+ROWS_PER_SEED = 10
+
+
+class FakerPool:
+    """
+    Serve Faker provider values from pools that are generated in bulk on first use
+
+    Args:
+        size: Number of values to pre-generate per provider
+        refresh: Fraction of drawn values to replace with fresh Faker values, which
+            also evict a random member of the pool to keep it diverse
+        entropy: Seed for the pooled values
+    """
+
+    def __init__(self, size: int, refresh: float = 0.0, entropy: Optional[int] = None):
+        if size < 1:
+            raise ValueError("Pool size must be positive")
+        if not 0.0 <= refresh <= 1.0:
+            raise ValueError("Refresh must be a fraction between 0 and 1")
+        self.size = size
+        self.refresh = refresh
+        self.entropy = entropy
+        self._fake = faker.Faker()
+        self._base: Dict[str, numpy.ndarray] = {}
+        self._pools: Dict[str, numpy.ndarray] = {}
+
+    def reset(self) -> None:
+        """
+        Discard evictions, returning every pool to its pre-generated values
+        """
+        self._pools.clear()
+
+    def _fill(self, provider: str) -> numpy.ndarray:
+        if self.entropy is not None:
+            self._fake.seed_instance(f"{self.entropy}:{provider}")
+        method = getattr(self._fake, provider)
+        return numpy.array([method() for _ in range(self.size)], dtype=object)
+
+    def draw(
+        self,
+        fake: faker.Faker,
+        provider: str,
+        rng: numpy.random.Generator,
+        count: int,
+    ) -> numpy.ndarray:
+        """
+        Draw values for a provider, calling the given Faker instance for fresh ones
+        """
+        pool = self._pools.get(provider)
+        if pool is None:
+            if provider not in self._base:
+                self._base[provider] = self._fill(provider)
+            pool = self._pools[provider] = self._base[provider].copy()
+
+        values = pool[rng.integers(0, len(pool), count)]
+        if self.refresh and count:
+            fresh_count = min(count, math.ceil(self.refresh * count))
+            fake.seed_instance(int(rng.integers(2**63)))
+            method = getattr(fake, provider)
+            fresh = numpy.array([method() for _ in range(fresh_count)], dtype=object)
+            values[rng.choice(count, fresh_count, replace=False)] = fresh
+            pool[rng.integers(0, len(pool), fresh_count)] = fresh
+        return values
+
+
+# Pool shared by the generators in this process, or None for per-call Faker values
+_pool: Optional[FakerPool] = None
+
+# The last pool set up, kept while pooling is off so that its values can be reused
+_last: Optional[FakerPool] = None
+
+
+def configure(
+    size: int = 0, refresh: float = 0.0, entropy: Optional[int] = None
+) -> None:
+    """
+    Set up the shared pool, keeping any values already generated with the same settings
+
+    A size of zero turns pooling off.
+    """
+    global _pool, _last
+    if not size:
+        _pool = None
+        return
+    if _last is None or (_last.size, _last.refresh, _last.entropy) != (
+        size,
+        refresh,
+        entropy,
+    ):
+        _last = FakerPool(size, refresh, entropy)
+    _pool = _last
+
+
+def reset() -> None:
+    if _pool is not None:
+        _pool.reset()
+
+
+# Rows whose per-row fields are computed, or None for all of them
+_rows: Optional[range] = None
+
+
+def select(rows: Optional[range] = None) -> None:
+    """
+    Only compute the per-row fields of these rows of the records generated next, e.g.
+    the rows of a block that are kept, leaving the others empty. None selects all rows.
+    """
+    global _rows
+    _rows = rows
+
+
+def per_row(
+    fake: faker.Faker,
+    rng: numpy.random.Generator,
+    count: int,
+    function: Callable,
+    *fields,
+) -> numpy.ndarray:
+    """
+    Apply a function to each row of some fields, e.g. to render a template, with the
+    Faker instance seeded for each group of ROWS_PER_SEED rows
+
+    Only the groups that hold selected rows are computed, and the other rows are left
+    empty.
+
+    Args:
+        fake: Faker instance that the function uses, seeded for each group
+        rng: NumPy random generator to draw the seeds from
+        count: Number of rows
+        function: Called with the values of the fields in each row
+        fields: Sequences of count values
+    """
+    seeds = rng.integers(2**63, size=-(-count // ROWS_PER_SEED))
+    fields = [numpy.asarray(field, dtype=object) for field in fields]
+    rows = range(count) if _rows is None else _rows
+    values = numpy.full(count, "", dtype=object)
+    if not rows:
+        return values
+    first = rows.start // ROWS_PER_SEED
+    last = (min(rows.stop, count) - 1) // ROWS_PER_SEED
+    for group in range(first, last + 1):
+        fake.seed_instance(int(seeds[group]))
+        start = group * ROWS_PER_SEED
+        stop = min(start + ROWS_PER_SEED, count)
+        values[start:stop] = [
+            function(*[field[i] for field in fields]) for i in range(start, stop)
+        ]
+    return values
+
+
+def draw(
+    fake: faker.Faker, provider: str, rng: numpy.random.Generator, count: int
+) -> numpy.ndarray:
+    """
+    Values from a Faker provider, from the shared pool if one is configured
+    """
+    if _pool is not None:
+        return _pool.draw(fake, provider, rng, count)
+    return per_row(fake, rng, count, getattr(fake, provider))
@@ -0,0 +1,146 @@
+"""
+Time the helpers and Faker providers that the record generators call
+
+The profiler wraps its targets when started and puts the originals back when stopped,
+so code that is not being profiled runs without any extra overhead.
+"""
+
+import collections
+import time
+from typing import Any, Dict, List
+
+from . import columns, numbering, pools
+from .fakes import fake
+from .topdesk import Asset, Incident, Person
+
+# Faker providers called by the generators
+FAKER_PROVIDERS = [
+    "address",
+    "bothify",
+    "bs",
+    "catch_phrase",
+    "city",
+    "company",
+    "date_between",
+    "date_time_between",
+    "first_name",
+    "job",
+    "last_name",
+    "lexify",
+    "name",
+    "phone_number",
+    "user_name",
+    "word",
+]
+
+# Column helpers used by the columnar generators
+COLUMN_HELPERS = [
+    "choice",
+    "coin",
+    "datetimes",
+    "dates",
+    "lexify",
+    "optional",
+    "sequence",
+    "uuid4",
+]
+
+# Generator helpers for each entity
+HELPERS = {
+    Incident: [
+        "reference_number",
+        "_generate_brief_description",
+        "_generate_request_text",
+        "_generate_research_request",
+        "_generate_action_text",
+        "_generate_grant_code",
+        "_generate_incident_body",
+    ],
+    Person: [],
+    Asset: [],
+}
+
+_MISSING = object()
+
+
+class FieldProfiler:
+    """
+    Accumulate the number of calls and the time spent in each helper
+
+    Times are inclusive, so a helper that calls a Faker provider also counts the time
+    spent in that provider.
+    """
+
+    def __init__(self):
+        self.seconds = collections.Counter()
+        self.calls = collections.Counter()
+        self._originals = []
+
+    def wrap(self, owner: Any, name: str, label: str) -> None:
+        """
+        Replace an attribute of a class, module or object with a timed version
+        """
+        original = vars(owner).get(name, _MISSING)
+        target = getattr(owner, name)
+        seconds = self.seconds
+        calls = self.calls
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return target(*args, **kwargs)
+            finally:
+                seconds[label] += time.perf_counter() - started
+                calls[label] += 1
+
+        setattr(owner, name, staticmethod(timed) if isinstance(owner, type) else timed)
+        self._originals.append((owner, name, original))
+
+    def start(self) -> None:
+        for cls, names in HELPERS.items():
+            for name in names:
+                self.wrap(cls, name, f"{cls.__name__}.{name}")
+        for name in COLUMN_HELPERS:
+            self.wrap(columns, name, f"columns.{name}")
+        self.wrap(pools, "draw", "pools.draw")
+        self.wrap(numbering, "reference_numbers", "numbering.reference_numbers")
+        for name in FAKER_PROVIDERS:
+            self.wrap(fake.get(), name, f"faker.{name}")
+
+    def stop(self) -> None:
+        while self._originals:
+            owner, name, original = self._originals.pop()
+            if original is _MISSING:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Calls and time for each helper, most expensive first
+        """
+        return [
+            {
+                "field": label,
+                "calls": self.calls[label],
+                "seconds": seconds,
+                "microseconds_per_call": 1e6 * seconds / self.calls[label],
+            }
+            for label, seconds in self.seconds.most_common()
+        ]
+
+    def format_report(self) -> str:
+        lines = [f"{'Field':<45}{'Calls':>12}{'Seconds':>12}{'us/call':>12}"]
+        for row in self.report():
+            lines.append(
+                f"{row['field']:<45}{row['calls']:>12}{row['seconds']:>12.3f}"
+                f"{row['microseconds_per_call']:>12.1f}"
+            )
+        return "\n".join(lines)
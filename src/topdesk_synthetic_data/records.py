@@ -0,0 +1,177 @@
+"""
+Compact records for holding large numbers of generated records in memory
+
+Each record is a named tuple rather than a dict. Categorical fields hold small integer
+codes into the entity's category lists, and dates and times hold seconds since the
+epoch, so category names and formatted dates are shared or computed rather than stored
+per record. They are only turned back into text when a record is serialised.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from . import columns, shards
+from .lazy import lazy_import
+from .topdesk import ENTITIES
+
+numpy = lazy_import("numpy")
+pandas = lazy_import("pandas")
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class Record:
+    """
+    Methods shared by the record types made by record_type()
+    """
+
+    __slots__ = ()
+
+    # Category names for each categorical field, indexed by code
+    CATEGORIES: Dict[str, Tuple[str, ...]] = {}
+    # Format of each date or time field, stored as seconds since the epoch
+    DATETIMES: Dict[str, str] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The record with category names and formatted dates, like the rows of generate()
+        """
+        row = self._asdict()
+        for name, categories in self.CATEGORIES.items():
+            code = row[name]
+            row[name] = categories[code] if code >= 0 else ""
+        for name, fmt in self.DATETIMES.items():
+            value = row[name]
+            row[name] = "" if value is None else time.strftime(fmt, time.gmtime(value))
+        return row
+
+
+@functools.lru_cache(maxsize=None)
+def record_type(
+    name: str,
+    fields: Tuple[str, ...],
+    categories: Tuple[Tuple[str, Tuple[str, ...]], ...] = (),
+    datetimes: Tuple[Tuple[str, str], ...] = (),
+) -> type:
+    """
+    Named tuple type for records with the given fields
+
+    Args:
+        name: Class name
+        fields: Field names in order
+        categories: Category names of each categorical field
+        datetimes: strftime format of each date or time field
+    """
+    return type(
+        name,
+        (Record, collections.namedtuple(name, fields)),
+        {
+            "__slots__": (),
+            "CATEGORIES": dict(categories),
+            "DATETIMES": dict(datetimes),
+        },
+    )
+
+
+def from_frame(
+    frame: pandas.DataFrame, name: str = "Record", date_fields: Iterable[str] = ()
+) -> Iterator[Record]:
+    """
+    Convert columnar records to compact records
+
+    Args:
+        frame: Records from an entity's generate_columns()
+        name: Name of the record type
+        date_fields: Date and time fields to format as dates without a time
+    """
+    date_fields = set(date_fields)
+    values = []
+    categories = []
+    datetimes = []
+    for field, column in frame.items():
+        if isinstance(column.dtype, pandas.CategoricalDtype):
+            categories.append((field, tuple(column.cat.categories)))
+            values.append(column.cat.codes.tolist())
+        elif column.dtype.kind == "M":
+            datetimes.append(
+                (field, DATE_FORMAT if field in date_fields else DATETIME_FORMAT)
+            )
+            seconds = column.to_numpy("datetime64[s]")
+            values.append(
+                numpy.where(
+                    numpy.isnat(seconds), None, seconds.astype(numpy.int64)
+                ).tolist()
+            )
+        else:
+            values.append(column.tolist())
+    cls = record_type(name, tuple(frame.columns), tuple(categories), tuple(datetimes))
+    return map(cls._make, zip(*values))
+
+
+def generate(
+    entity: type,
+    num_records: int,
+    chunk_size: int = 10000,
+    rng: Optional[numpy.random.Generator] = None,
+    now: Optional[datetime] = None,
+) -> Iterator[Record]:
+    """
+    Generate compact records for an entity, a chunk of columns at a time
+
+    Args:
+        entity: Entity class, e.g. Incident
+        num_records: Number of records
+        chunk_size: Number of records generated at a time
+        rng: NumPy random generator
+        now: Reference time for relative dates, defaults to the current time
+    """
+    rng = columns.default_rng(rng)
+    for start, count in shards.split(num_records, chunk_size):
+        frame = entity.generate_columns(count, start=start, rng=rng, now=now)
+        yield from from_frame(frame, f"{entity.__name__}Record", entity.DATE_FIELDS)
+
+
+def record(
+    entity: type,
+    seed: int,
+    index: int,
+    now: Optional[datetime] = None,
+    **options,
+) -> Record:
+    """
+    Generate one record of a seeded dataset directly from its index
+
+    The record is the same as row ``index`` of the generated files with the same seed
+    and options, without generating the rows before it.
+
+    Args:
+        entity: Entity class, e.g. Incident
+        seed: Root seed of the dataset
+        index: Row number, from zero
+        now: Reference time for relative dates, see shards.generate()
+        options: Further options for shards.window(), e.g. pool_size
+    """
+    name = {cls: name for name, cls in ENTITIES.items()}[entity]
+    frame = shards.window(name, index, index + 1, seed, now, **options)
+    return next(from_frame(frame, f"{entity.__name__}Record", entity.DATE_FIELDS))
+
+
+def to_frame(records: Sequence[Record]) -> pandas.DataFrame:
+    """
+    Convert compact records of one type back to columns, for the output writers
+    """
+    if not records:
+        return pandas.DataFrame()
+    cls = type(records[0])
+    frame = pandas.DataFrame.from_records(records, columns=cls._fields)
+    for name, categories in cls.CATEGORIES.items():
+        frame[name] = pandas.Categorical.from_codes(frame[name], categories)
+    for name in cls.DATETIMES:
+        frame[name] = pandas.to_datetime(frame[name], unit="s").astype("datetime64[s]")
+    return frame
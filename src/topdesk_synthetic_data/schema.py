@@ -0,0 +1,423 @@
+"""
+Custom fields declared in a schema file
+
+A schema adds fields to the generated records of each entity, or replaces built-in
+ones, without changing the code, e.g. for fields that a particular TOPdesk instance
+has been customised with. It is a TOML (or JSON) file like this::
+
+    [vocabularies]
+    CLUSTERS = ["stanage", "bessemer", "sharc"]
+
+    [[incident.fields]]
+    name = "cluster"
+    type = "choice"
+    values = "CLUSTERS"
+    weights = [5, 3, 1]
+
+    [[incident.fields]]
+    name = "jobId"
+    type = "integer"
+    low = 1000000
+    high = 9999999
+
+    [[incident.fields]]
+    name = "summary"
+    type = "template"
+    templates = ["{category}: job {jobId} on {cluster} {choice:failed|hung}"]
+
+    [[person.fields]]
+    name = "staffNumber"
+    type = "sequence"
+    prefix = "STAFF"
+
+Fields are generated in order, after the built-in fields, so templates can refer to
+any built-in field and to the custom fields declared before them. Choice fields and
+template placeholders such as {choice:DEPARTMENTS} can use the schema's vocabularies
+or the entity's built-in ones. Fields of the choice, template and faker types may set
+"empty" to the fraction of records that leave them empty. Custom fields are added to
+columnar output, which is what the command line writes.
+
+A schema is compiled once into a generation plan: vocabularies are resolved, weights
+turned into alias tables and templates checked. The compiled plan is what worker
+processes receive, and with --cache it is kept in the cache directory as JSON, keyed by
+the file's contents, so that later runs with the same schema load it rather than
+compiling it again. The cache directory may be shared, so the plan is kept as data
+rather than pickled.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os.path
+import random
+import string
+import tempfile
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from . import cache, columns, pools
+from .distributions import AliasTable
+from .fakes import fake
+from .lazy import lazy_import
+from .template import Template, choice_field, randint_field
+from .topdesk import ENTITIES
+
+numpy = lazy_import("numpy")
+pandas = lazy_import("pandas")
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+logger = logging.getLogger(__name__)
+
+# Options of each field type, with their defaults (None if the option is required)
+GENERATORS = {
+    "choice": {"values": None, "weights": [], "empty": 0.0},
+    "template": {"templates": None, "empty": 0.0},
+    "integer": {"low": None, "high": None},
+    "number": {"low": None, "high": None, "decimals": 2},
+    "faker": {"provider": None, "empty": 0.0},
+    "sequence": {"prefix": "", "width": 6},
+    "constant": {"value": None},
+}
+
+# Name of the compiled plan in a cache entry
+COMPILED = "schema.json"
+
+_formatter = string.Formatter()
+
+
+def builtin_vocabularies(entity: str) -> Dict[str, Sequence[str]]:
+    """
+    Lists of values defined on an entity's class, e.g. Person.DEPARTMENTS
+    """
+    return {
+        name: value
+        for name, value in vars(ENTITIES[entity]).items()
+        if name.isupper() and isinstance(value, (list, tuple))
+    }
+
+
+def _template_fields(
+    vocabularies: Mapping[str, Sequence[str]], rng: random.Random
+) -> dict:
+    return {
+        "randint": randint_field(rng),
+        "choice": choice_field(vocabularies, rng),
+    }
+
+
+class Schema:
+    """
+    A compiled schema
+
+    Args:
+        spec: Parsed schema file, with the fields of each entity under its name and
+            vocabularies shared by them under "vocabularies"
+    """
+
+    def __init__(self, spec: Mapping[str, Any]):
+        self.spec = spec
+        self.digest = hashlib.sha256(
+            json.dumps(spec, sort_keys=True).encode()
+        ).hexdigest()
+        self.vocabularies = {
+            name: [str(value) for value in values]
+            for name, values in spec.get("vocabularies", {}).items()
+        }
+        self.fields: Dict[str, List[dict]] = {}
+        for entity, entity_spec in spec.items():
+            if entity == "vocabularies":
+                continue
+            if entity not in ENTITIES:
+                raise ValueError(f"Unknown entity {entity!r} in schema")
+            if not isinstance(entity_spec, Mapping):
+                raise ValueError(f"Expected a table of {entity} fields in schema")
+            vocabularies = {**builtin_vocabularies(entity), **self.vocabularies}
+            self.fields[entity] = [
+                self._compile(entity, field, vocabularies)
+                for field in entity_spec.get("fields", [])
+            ]
+        self._init_process()
+
+    def _init_process(self) -> None:
+        # Templates are compiled in each process when they are first used
+        self._templates: Dict[tuple, List[Template]] = {}
+
+    @classmethod
+    def load(cls, path: str, store: Optional[cache.DatasetCache] = None) -> "Schema":
+        """
+        Load a schema file, from its compiled form in the cache if it has one
+
+        Args:
+            path: TOML file, or JSON if its name ends in .json
+            store: Cache to keep the compiled schema in
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        key = cache.key(schema=hashlib.sha256(data).hexdigest())
+        cached = store.get(key, [COMPILED]) if store else None
+        if cached:
+            try:
+                with open(cached[COMPILED], encoding="utf-8") as file:
+                    return cls.from_json(file.read())
+            except (OSError, KeyError, TypeError, ValueError) as exc:
+                logger.warning("Ignoring the cached schema %s: %s", key, exc)
+
+        if path.endswith(".json"):
+            spec = json.loads(data)
+        else:
+            spec = tomllib.loads(data.decode("utf-8"))
+        schema = cls(spec)
+        if store:
+            try:
+                with tempfile.TemporaryDirectory() as directory:
+                    compiled = os.path.join(directory, COMPILED)
+                    with open(compiled, "w", encoding="utf-8") as file:
+                        file.write(schema.to_json())
+                    store.put(key, {COMPILED: compiled})
+            except OSError as exc:
+                logger.warning("Couldn't cache the compiled schema: %s", exc)
+        return schema
+
+    def to_json(self) -> str:
+        """
+        The compiled plan as JSON, with each alias table as its arrays
+        """
+
+        def encode(value):
+            if isinstance(value, AliasTable):
+                return {
+                    "probability": value.probability.tolist(),
+                    "alias": value.alias.tolist(),
+                }
+            raise TypeError(f"Can't store {type(value).__name__} in a compiled schema")
+
+        return json.dumps(self.__getstate__(), default=encode)
+
+    @classmethod
+    def from_json(cls, text: str) -> "Schema":
+        """
+        Read back a plan written by to_json()
+        """
+        state = json.loads(text)
+        digest = hashlib.sha256(
+            json.dumps(state["spec"], sort_keys=True).encode()
+        ).hexdigest()
+        if digest != state["digest"]:
+            raise ValueError("The compiled schema doesn't match its spec")
+        for fields in state["fields"].values():
+            for field in fields:
+                if field.get("table") is not None:
+                    field["table"] = AliasTable.from_arrays(**field["table"])
+        schema = cls.__new__(cls)
+        schema.__setstate__(state)
+        return schema
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Schema) and self.digest == other.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __getstate__(self):
+        # Send the compiled plan, not the objects bound to this process
+        return {
+            "spec": self.spec,
+            "digest": self.digest,
+            "vocabularies": self.vocabularies,
+            "fields": self.fields,
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_process()
+
+    def _compile(
+        self,
+        entity: str,
+        field: Mapping[str, Any],
+        vocabularies: Mapping[str, Sequence[str]],
+    ) -> dict:
+        field = dict(field)
+        name = field.pop("name", None)
+        kind = field.pop("type", None)
+        if not name:
+            raise ValueError(f"A {entity} field in the schema has no name")
+        if kind not in GENERATORS:
+            raise ValueError(
+                f"{entity} field {name!r} has unknown type {kind!r}, "
+                f"choose from {', '.join(GENERATORS)}"
+            )
+        options = GENERATORS[kind]
+        unknown = set(field) - set(options)
+        if unknown:
+            raise ValueError(f"Unknown options {sorted(unknown)} for {entity} {name}")
+        plan = {"name": name, "type": kind}
+        for option, default in options.items():
+            if option not in field and default is None:
+                raise ValueError(f"{entity} field {name!r} needs {option!r}")
+            plan[option] = field.get(option, default)
+
+        try:
+            if kind == "choice":
+                self._compile_choice(plan, vocabularies)
+            elif kind == "template":
+                self._compile_template(plan, vocabularies)
+            elif kind in ("integer", "number") and not plan["low"] <= plan["high"]:
+                raise ValueError("low must not be more than high")
+            elif kind == "faker" and not hasattr(fake, plan["provider"]):
+                raise ValueError(f"Faker has no provider {plan['provider']!r}")
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid {entity} field {name!r}: {exc}") from exc
+        if not 0.0 <= plan.get("empty", 0.0) <= 1.0:
+            raise ValueError(f"{entity} field {name!r}: empty must be a fraction")
+        return plan
+
+    @staticmethod
+    def _compile_choice(plan: dict, vocabularies: Mapping[str, Sequence[str]]):
+        values = plan["values"]
+        if isinstance(values, str):
+            if values not in vocabularies:
+                raise ValueError(f"Unknown vocabulary {values!r}")
+            values = vocabularies[values]
+        plan["values"] = [str(value) for value in values]
+        weights = plan.pop("weights")
+        if isinstance(weights, Mapping):
+            unknown = set(weights) - set(plan["values"])
+            if unknown:
+                raise ValueError(f"Unknown values {sorted(unknown)} in weights")
+            weights = [weights.get(value, 0) for value in plan["values"]]
+        if weights and len(weights) != len(plan["values"]):
+            raise ValueError("Give one weight per value")
+        plan["table"] = AliasTable(weights) if weights else None
+        categories = plan["values"] + ([""] if plan["empty"] else [])
+        plan["categories"] = list(dict.fromkeys(categories))
+
+    @staticmethod
+    def _compile_template(plan: dict, vocabularies: Mapping[str, Sequence[str]]):
+        if isinstance(plan["templates"], str):
+            plan["templates"] = [plan["templates"]]
+        if not plan["templates"]:
+            raise ValueError("No templates")
+        fields = _template_fields(vocabularies, random.Random())
+        context = set()
+        for text in plan["templates"]:
+            # Check the placeholders, e.g. that vocabularies exist
+            Template(text, fields)
+            context.update(
+                name
+                for _, name, _, _ in _formatter.parse(text)
+                if name and name not in fields
+            )
+        # Fields of the record that the templates read
+        plan["context"] = sorted(context)
+
+    def _template_group(self, entity: str, field: dict) -> List[Template]:
+        key = (entity, field["name"])
+        if key not in self._templates:
+            fields = _template_fields(
+                {**builtin_vocabularies(entity), **self.vocabularies}, fake.random
+            )
+            self._templates[key] = [
+                Template(text, fields) for text in field["templates"]
+            ]
+        return self._templates[key]
+
+    def _render(
+        self,
+        entity: str,
+        field: dict,
+        frame: pandas.DataFrame,
+        rng: numpy.random.Generator,
+        size: int,
+    ) -> numpy.ndarray:
+        texts = []
+        for name in field["context"]:
+            if name not in frame:
+                raise ValueError(
+                    f"{entity} has no field {name!r} for the template of "
+                    f"{field['name']}"
+                )
+            column = frame[name].astype(object)
+            texts.append(column.where(column.notna(), "").astype(str).to_numpy())
+        templates = self._template_group(entity, field)
+        picks = rng.integers(0, len(templates), size)
+        return pools.per_row(
+            fake,
+            rng,
+            size,
+            lambda pick, *values: templates[pick].render(
+                dict(zip(field["context"], values))
+            ),
+            picks,
+            *texts,
+        )
+
+    def _generate(
+        self,
+        entity: str,
+        field: dict,
+        frame: pandas.DataFrame,
+        rng: numpy.random.Generator,
+        start: int,
+    ) -> numpy.ndarray:
+        kind = field["type"]
+        n = len(frame.index)
+        if kind == "choice":
+            table = field["table"]
+            index = (
+                rng.integers(0, len(field["values"]), n)
+                if table is None
+                else table.sample(rng, n)
+            )
+            return numpy.array(field["values"], dtype=object)[index]
+        if kind == "template":
+            return self._render(entity, field, frame, rng, n)
+        if kind == "integer":
+            return rng.integers(field["low"], field["high"] + 1, n)
+        if kind == "number":
+            return rng.uniform(field["low"], field["high"], n).round(field["decimals"])
+        if kind == "faker":
+            return pools.draw(fake, field["provider"], rng, n)
+        if kind == "sequence":
+            return field["prefix"] + columns.sequence(start, n, field["width"])
+        return numpy.full(n, field["value"], dtype=object)
+
+    def apply(
+        self,
+        entity: str,
+        frame: pandas.DataFrame,
+        rng: numpy.random.Generator,
+        start: int = 0,
+    ) -> pandas.DataFrame:
+        """
+        Add the entity's custom fields to generated records, or replace the built-in
+        fields of the same name
+
+        Args:
+            entity: Entity name, e.g. "incident"
+            frame: Generated records
+            rng: NumPy random generator, drawn from after the built-in fields
+            start: Row number of the first record
+        """
+        fields = self.fields.get(entity)
+        if not fields:
+            return frame
+        for field in fields:
+            values = self._generate(entity, field, frame, rng, start)
+            if field.get("empty"):
+                values = columns.optional(rng, values, field["empty"])
+            frame[field["name"]] = values
+        return frame.astype(
+            columns.categorical_dtypes(
+                {
+                    field["name"]: field["categories"]
+                    for field in fields
+                    if field["type"] == "choice"
+                }
+            )
+        )
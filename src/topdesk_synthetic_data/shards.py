@@ -0,0 +1,359 @@
+"""
+Split generation of an entity into shards that can run in parallel processes
+
+Shards are chunks of consecutive records. Records are generated in blocks of
+``BLOCK_SIZE`` and each block is seeded independently from the run's root seed, the
+entity and the block number, so a given seed, entity and row index always produce the
+same record, whatever the chunk size and however many processes the shards run in.
+Where a shard only needs some rows of a block, the cheap columns are still drawn for
+the whole block, but the slow per-row fields only for the rows it keeps (see
+pools.per_row), so small shards cost little more than their own rows.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import functools
+import itertools
+import zlib
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from . import distributions, index, numbering, pools
+from .fakes import fake
+from .lazy import lazy_import
+from .schema import Schema
+from .topdesk import ENTITIES
+
+numpy = lazy_import("numpy")
+pandas = lazy_import("pandas")
+
+# Number of records generated from each seed
+BLOCK_SIZE = 1000
+
+
+def split(num_records: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Divide records into contiguous shards of at most chunk_size records
+
+    Returns:
+        (start, count) for each shard
+    """
+    return [
+        (start, min(chunk_size, num_records - start))
+        for start in range(0, num_records, chunk_size)
+    ]
+
+
+def seed_shard(entropy: int, entity: str, shard: int) -> numpy.random.Generator:
+    """
+    Seed the shared Faker instance, and the random generator it owns, for one shard or
+    block of records
+
+    Returns:
+        NumPy random generator for the shard
+    """
+    sequence = numpy.random.SeedSequence(
+        entropy, spawn_key=(zlib.crc32(entity.encode()), shard)
+    )
+    seed = int(sequence.generate_state(1)[0])
+    fake.seed_instance(seed)
+    return numpy.random.default_rng(sequence)
+
+
+@contextlib.contextmanager
+def configured(
+    entropy: int,
+    pool_size: int = 0,
+    pool_refresh: float = 0.0,
+    number_format: str = "standard",
+    weights: Optional[distributions.Distributions] = None,
+    rows: Optional[range] = None,
+) -> Iterator[None]:
+    """
+    Set up the Faker pool, incident numbers and distributions that the generators read
+    for one block of records, and clear them afterwards so that they don't carry over
+    to later calls of the generators in the same process
+    """
+    pools.configure(pool_size, pool_refresh, entropy)
+    pools.reset()
+    pools.select(rows)
+    numbering.configure(entropy, number_format)
+    distributions.configure(weights)
+    try:
+        yield
+    finally:
+        pools.configure()
+        pools.select(None)
+        numbering.reset()
+        distributions.configure(None)
+
+
+def generate_block(
+    entity: str,
+    block: int,
+    entropy: int,
+    now: datetime,
+    pool_size: int = 0,
+    pool_refresh: float = 0.0,
+    links: Optional[Dict[str, str]] = None,
+    number_format: str = "standard",
+    weights: Optional[distributions.Distributions] = None,
+    schema: Optional[Schema] = None,
+    rows: Optional[range] = None,
+) -> pandas.DataFrame:
+    """
+    Generate the records in one block, from its own seed
+
+    Args:
+        rows: Rows of the block that will be kept. The slow per-row fields of the
+            others may be left empty.
+    """
+    indexes = {name: index.load(path) for name, path in (links or {}).items()}
+    rng = seed_shard(entropy, entity, block)
+    start = block * BLOCK_SIZE
+    with configured(entropy, pool_size, pool_refresh, number_format, weights, rows):
+        frame = ENTITIES[entity].generate_columns(
+            BLOCK_SIZE, start=start, rng=rng, now=now, **indexes
+        )
+        if schema is not None:
+            frame = schema.apply(entity, frame, rng, start)
+    return frame
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_block(
+    entity: str,
+    block: int,
+    entropy: int,
+    now: datetime,
+    pool_size: int,
+    pool_refresh: float,
+    links: Tuple[Tuple[str, str], ...],
+    number_format: str,
+    weights: Optional[distributions.Distributions],
+    schema: Optional[Schema],
+) -> pandas.DataFrame:
+    return generate_block(
+        entity,
+        block,
+        entropy,
+        now,
+        pool_size,
+        pool_refresh,
+        dict(links),
+        number_format,
+        weights,
+        schema,
+    )
+
+
+def generate_shard(
+    entity: str,
+    start: int,
+    count: int,
+    entropy: int,
+    now: datetime,
+    pool_size: int = 0,
+    pool_refresh: float = 0.0,
+    links: Optional[Dict[str, str]] = None,
+    number_format: str = "standard",
+    weights: Optional[distributions.Distributions] = None,
+    schema: Optional[Schema] = None,
+    cache: bool = False,
+) -> pandas.DataFrame:
+    """
+    Generate records from start to start + count from the blocks that cover them
+
+    Args:
+        cache: Keep the last few blocks in memory, for reading nearby records again
+    """
+    first = start // BLOCK_SIZE
+    last = (start + count - 1) // BLOCK_SIZE
+    frames = []
+    for block in range(first, last + 1):
+        if cache:
+            frame = _cached_block(
+                entity,
+                block,
+                entropy,
+                now,
+                pool_size,
+                pool_refresh,
+                tuple(sorted((links or {}).items())),
+                number_format,
+                weights,
+                schema,
+            )
+        else:
+            block_start = block * BLOCK_SIZE
+            frame = generate_block(
+                entity,
+                block,
+                entropy,
+                now,
+                pool_size,
+                pool_refresh,
+                links,
+                number_format,
+                weights,
+                schema,
+                range(
+                    max(start - block_start, 0),
+                    min(start + count - block_start, BLOCK_SIZE),
+                ),
+            )
+        frames.append(frame)
+    frame = pandas.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    offset = start - first * BLOCK_SIZE
+    end = offset + count
+    if offset or end < len(frame.index):
+        frame = frame.iloc[offset:end].reset_index(drop=True)
+    return frame
+
+
+def reference_time(
+    seed: Optional[int] = None, now: Optional[datetime] = None
+) -> datetime:
+    """
+    Reference time for relative dates: the current time, or the start of today if a
+    seed is given so that seeded runs on the same day match
+    """
+    if now is None:
+        now = datetime.now()
+        if seed is not None:
+            now = datetime.combine(now.date(), datetime.min.time())
+    return now
+
+
+def window(
+    entity: str,
+    start: int,
+    stop: int,
+    seed: int,
+    now: Optional[datetime] = None,
+    pool_size: int = 0,
+    pool_refresh: float = 0.0,
+    links: Optional[Dict[str, str]] = None,
+    number_format: str = "standard",
+    weights: Optional[distributions.Distributions] = None,
+    schema: Optional[Schema] = None,
+) -> pandas.DataFrame:
+    """
+    Generate any slice of the records of a seeded dataset directly
+
+    The records are the same as rows start to stop of generate() with the same seed and
+    options, but only the blocks that hold them are generated, so the cost doesn't
+    depend on how far into the dataset they are. The last few blocks are kept in
+    memory, so reading consecutive windows, e.g. pages from a fake API, is cheap.
+
+    Args:
+        entity: Entity name, e.g. "incident"
+        start: Index of the first record
+        stop: Index after the last record
+        seed: Root seed of the dataset
+    """
+    if not 0 <= start < stop:
+        raise ValueError(f"Invalid window {start}:{stop}")
+    entropy = numpy.random.SeedSequence(seed).entropy
+    frame = generate_shard(
+        entity,
+        start,
+        stop - start,
+        entropy,
+        reference_time(seed, now),
+        pool_size,
+        pool_refresh,
+        links,
+        number_format,
+        weights,
+        schema,
+        cache=True,
+    )
+    # Don't let the caller change the cached blocks
+    return frame.copy()
+
+
+def generate(
+    entity: str,
+    num_records: Optional[int],
+    chunk_size: int = 10000,
+    seed: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    prefetch: int = 2,
+    now: Optional[datetime] = None,
+    pool_size: int = 0,
+    pool_refresh: float = 0.0,
+    links: Optional[Dict[str, str]] = None,
+    number_format: str = "standard",
+    weights: Optional[distributions.Distributions] = None,
+    schema: Optional[Schema] = None,
+) -> Iterator[pandas.DataFrame]:
+    """
+    Generate records for an entity in shards, in parallel if an executor is given
+
+    At most ``prefetch`` shards per worker are held in memory at once, so memory use
+    depends on the chunk size rather than the total number of records.
+
+    Args:
+        entity: Entity name, e.g. "incident"
+        num_records: Total number of records, or None to generate without end
+        chunk_size: Number of records per shard
+        seed: Root seed; a fresh one is drawn if omitted. The same seed gives the
+            same records whatever the chunk size and executor.
+        executor: Process pool to run the shards in, otherwise run them in this process
+        prefetch: Number of shards to queue per worker in the executor
+        now: Reference time for relative dates, shared by all shards. Defaults to the
+            current time, or the start of today if a seed is given so that seeded runs
+            on the same day match.
+        pool_size: Number of pre-generated values per Faker provider, or zero to call
+            Faker for every value
+        pool_refresh: Fraction of pooled draws replaced by fresh Faker values
+        links: Paths of saved record indexes to refer to, by argument name of the
+            entity's generate_columns, e.g. {"persons": path}. Each process loads
+            them once.
+        number_format: Format of incident numbers, see numbering.FORMATS
+        weights: Distributions of categorical fields, otherwise drawn uniformly
+        schema: Custom fields to add to the records
+
+    Yields:
+        Each shard of records, in order
+    """
+    entropy = numpy.random.SeedSequence(seed).entropy
+    now = reference_time(seed, now)
+    tasks = (
+        (
+            entity,
+            start,
+            count,
+            entropy,
+            now,
+            pool_size,
+            pool_refresh,
+            links,
+            number_format,
+            weights,
+            schema,
+        )
+        for start, count in (
+            split(num_records, chunk_size)
+            if num_records is not None
+            else ((start, chunk_size) for start in itertools.count(0, chunk_size))
+        )
+    )
+
+    if executor is None:
+        for task in tasks:
+            yield generate_shard(*task)
+        return
+
+    max_pending = prefetch * getattr(executor, "_max_workers", 1)
+    pending = collections.deque()
+    for task in tasks:
+        pending.append(executor.submit(generate_shard, *task))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
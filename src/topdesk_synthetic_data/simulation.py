@@ -0,0 +1,378 @@
+"""
+Simulate the arrival of incidents over time
+
+Incidents arrive as a Poisson process whose rate follows the hour of the day and the day
+of the week, with occasional storms when a research service has an outage and many
+incidents about it arrive at once. Arrival times are drawn in bulk, one hour at a time,
+and incidents are generated in order of their call date so that they can be written out
+or replayed against a service faster than real time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from . import distributions, shards, writers
+from .lazy import lazy_import
+from .load import PASSWORD_VARIABLE, Loader
+from .schema import Schema
+from .topdesk import Incident
+
+numpy = lazy_import("numpy")
+pandas = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Relative arrival rate for each hour of the day, busiest in office hours
+HOURLY = [
+    0.1, 0.05, 0.05, 0.05, 0.05, 0.1, 0.2, 0.5,
+    1.2, 2.0, 2.2, 2.0, 1.4, 1.8, 2.0, 1.8,
+    1.5, 1.0, 0.6, 0.4, 0.3, 0.25, 0.2, 0.15,
+]  # fmt: skip
+
+# Relative arrival rate for each day of the week, from Monday
+WEEKLY = [1.3, 1.2, 1.1, 1.1, 0.9, 0.25, 0.15]
+
+WEEK_HOURS = 7 * 24
+
+
+class Storm:
+    """
+    A burst of incidents about one research object
+    """
+
+    __slots__ = ("object_name", "start", "hours", "rate")
+
+    def __init__(self, object_name: str, start: numpy.datetime64, hours, rate):
+        self.object_name = object_name
+        self.start = start
+        self.hours = hours
+        self.rate = rate
+
+    def __repr__(self):
+        return f"Storm({self.object_name!r}, {self.start}, {self.hours}h)"
+
+
+class ArrivalProcess:
+    """
+    Incident arrivals with daily and weekly seasonality and outage storms
+
+    Args:
+        rate: Mean number of incidents per hour
+        hourly: Relative rate for each hour of the day
+        weekly: Relative rate for each day of the week, from Monday
+        storms_per_week: Mean number of outage storms per week
+        storm_hours: Length of each storm
+        storm_multiplier: Rate of incidents during a storm, as a multiple of the mean
+        objects: Research objects whose outages cause storms
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        hourly: Sequence[float] = HOURLY,
+        weekly: Sequence[float] = WEEKLY,
+        storms_per_week: float = 1.0,
+        storm_hours: float = 2.0,
+        storm_multiplier: float = 10.0,
+        objects: Sequence[str] = Incident.RESEARCH_OBJECTS,
+    ):
+        if len(hourly) != 24 or len(weekly) != 7:
+            raise ValueError("Give 24 hourly and 7 daily rates")
+        # Scale the profiles so that the mean rate over a week is the given rate
+        profile = numpy.outer(weekly, hourly).ravel()
+        self.profile = rate * profile / profile.mean()
+        self.rate = rate
+        self.storms_per_week = storms_per_week
+        self.storm_hours = storm_hours
+        self.storm_multiplier = storm_multiplier
+        self.objects = list(objects)
+
+    def hourly_rates(self, start: numpy.datetime64, hours: int) -> numpy.ndarray:
+        """
+        Expected number of arrivals in each hour from the start of an hour
+        """
+        # The epoch was a Thursday, the fourth day of the week from Monday
+        first = (
+            start.astype("datetime64[h]").astype(numpy.int64) + 3 * 24
+        ) % WEEK_HOURS
+        return self.profile[(first + numpy.arange(hours)) % WEEK_HOURS]
+
+    def storms(
+        self, rng: numpy.random.Generator, start: numpy.datetime64, hours: int
+    ) -> List[Storm]:
+        count = rng.poisson(self.storms_per_week * hours / WEEK_HOURS)
+        offsets = numpy.sort(rng.integers(0, hours * 3600, count))
+        return [
+            Storm(
+                self.objects[rng.integers(len(self.objects))],
+                start + numpy.timedelta64(int(offset), "s"),
+                self.storm_hours,
+                self.storm_multiplier * self.rate,
+            )
+            for offset in offsets
+        ]
+
+    def arrivals(
+        self,
+        rng: numpy.random.Generator,
+        start: numpy.datetime64,
+        end: numpy.datetime64,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, List[Storm]]:
+        """
+        Draw arrival times between two times, in order
+
+        Returns:
+            Arrival times, the research object of the storm each arrival belongs to
+            (empty for ordinary incidents), and the storms
+        """
+        hour = numpy.timedelta64(3600, "s")
+        start = numpy.datetime64(start, "h")
+        end = numpy.datetime64(end, "s")
+        hours = int(numpy.ceil((end - start) / hour))
+        counts = rng.poisson(self.hourly_rates(start, hours))
+        times = numpy.repeat(start + numpy.arange(hours) * hour, counts).astype(
+            "datetime64[s]"
+        ) + rng.integers(0, 3600, counts.sum()).astype("timedelta64[s]")
+        objects = numpy.full(len(times), "", dtype=object)
+
+        storms = self.storms(rng, start, hours)
+        for storm in storms:
+            seconds = int(storm.hours * 3600)
+            count = rng.poisson(storm.rate * storm.hours)
+            times = numpy.concatenate(
+                [
+                    times,
+                    storm.start
+                    + rng.integers(0, seconds, count).astype("timedelta64[s]"),
+                ]
+            )
+            objects = numpy.concatenate(
+                [objects, numpy.full(count, storm.object_name, dtype=object)]
+            )
+
+        order = numpy.argsort(times, kind="stable")
+        times, objects = times[order], objects[order]
+        keep = times < end
+        return times[keep], objects[keep], storms
+
+
+def simulate(
+    times: numpy.ndarray,
+    objects: numpy.ndarray,
+    entropy: int,
+    chunk_size: int = 10000,
+    now: Optional[datetime] = None,
+    pool_size: int = 0,
+    pool_refresh: float = 0.0,
+    number_format: str = "standard",
+    weights: Optional[distributions.Distributions] = None,
+    schema: Optional[Schema] = None,
+) -> Iterator[pandas.DataFrame]:
+    """
+    Generate incidents for arrival times, in order, a chunk at a time
+
+    Incidents in a storm are about the research object that caused it. Custom fields
+    in the schema are added after that, so templates see the storm's object.
+
+    Args:
+        now: Reference time for the age of incidents, e.g. the end of the simulated
+            period. Defaults to the current time.
+        pool_size: Number of pre-generated values per Faker provider, or zero to call
+            Faker for every value
+        pool_refresh: Fraction of pooled draws replaced by fresh Faker values
+    """
+    for shard, (start, count) in enumerate(shards.split(len(times), chunk_size)):
+        rng = shards.seed_shard(entropy, "simulation", shard)
+        end = start + count
+        with shards.configured(
+            entropy, pool_size, pool_refresh, number_format, weights
+        ):
+            frame = Incident.generate_columns(
+                count, start=start, rng=rng, now=now, call_dates=times[start:end]
+            )
+            storm_objects = objects[start:end]
+            in_storm = storm_objects != ""
+            if in_storm.any():
+                names = frame["objectName"].to_numpy(dtype=object)
+                names[in_storm] = storm_objects[in_storm]
+                frame["objectName"] = pandas.Categorical(
+                    names, dtype=frame["objectName"].dtype
+                )
+            if schema is not None:
+                frame = schema.apply("incident", frame, rng, start)
+        yield frame
+
+
+def paced(
+    chunks: Iterator[pandas.DataFrame], speed: float, tick: float = 0.1
+) -> Iterator[pandas.DataFrame]:
+    """
+    Release incidents at their call dates, sped up by a factor
+
+    Incidents are released in slices of up to ``tick`` seconds of real time.
+
+    Args:
+        chunks: Incidents in order of call date
+        speed: Multiple of real time, e.g. 60 replays an hour in a minute
+        tick: Seconds of real time between releases
+    """
+    started = time.monotonic()
+    origin = None
+    for chunk in chunks:
+        call_dates = chunk["callDate"].to_numpy(dtype="datetime64[s]")
+        if origin is None and len(call_dates):
+            origin = call_dates[0]
+        due = (call_dates - origin).astype(numpy.int64) / speed
+        ticks = (due // tick).astype(numpy.int64)
+        boundaries = numpy.flatnonzero(numpy.diff(ticks)) + 1
+        for first, last in zip(
+            numpy.r_[0, boundaries], numpy.r_[boundaries, len(ticks)]
+        ):
+            delay = started + due[first] - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            yield chunk.iloc[first:last]
+
+
+def add_parser(subparsers) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(
+        "simulate",
+        help="Simulate incidents arriving over time",
+        description="Generate incidents in order of call date from an arrival process "
+        "with daily and weekly seasonality and outage storms, and write them to files "
+        "or replay them against a REST API faster than real time. The output format "
+        "and other generation options are given before the command.",
+    )
+    parser.add_argument(
+        "--days", type=float, default=7.0, help="Length of the simulated period"
+    )
+    parser.add_argument(
+        "--start",
+        type=datetime.fromisoformat,
+        help="Start of the simulated period, e.g. 2025-01-06. "
+        "Defaults to the given number of days before --now",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=10.0, help="Mean number of incidents per hour"
+    )
+    parser.add_argument(
+        "--hourly",
+        type=float,
+        nargs=24,
+        default=HOURLY,
+        metavar="RATE",
+        help="Relative arrival rate for each hour of the day",
+    )
+    parser.add_argument(
+        "--weekly",
+        type=float,
+        nargs=7,
+        default=WEEKLY,
+        metavar="RATE",
+        help="Relative arrival rate for each day of the week, from Monday",
+    )
+    parser.add_argument(
+        "--storms",
+        type=float,
+        default=1.0,
+        help="Mean number of outage storms per week",
+    )
+    parser.add_argument(
+        "--storm-hours", type=float, default=2.0, help="Length of each outage storm"
+    )
+    parser.add_argument(
+        "--storm-multiplier",
+        type=float,
+        default=10.0,
+        help="Rate of incidents during a storm, as a multiple of the mean rate",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="URL",
+        help="Post the incidents to this REST API as they arrive, see the load command",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=60.0,
+        help="Replay speed as a multiple of real time",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--user", help="User name for HTTP basic authentication")
+    parser.set_defaults(func=run)
+    return parser
+
+
+def run(args: argparse.Namespace) -> None:
+    entropy = numpy.random.SeedSequence(args.seed).entropy
+    start = args.start
+    if start is None:
+        start = args.now - timedelta(days=args.days)
+    end = start + timedelta(days=args.days)
+
+    process = ArrivalProcess(
+        rate=args.rate,
+        hourly=args.hourly,
+        weekly=args.weekly,
+        storms_per_week=args.storms,
+        storm_hours=args.storm_hours,
+        storm_multiplier=args.storm_multiplier,
+    )
+    times, objects, storms = process.arrivals(
+        shards.seed_shard(entropy, "arrivals", 0),
+        numpy.datetime64(start, "s"),
+        numpy.datetime64(end, "s"),
+    )
+    logger.info("Simulated %d incidents from %s to %s", len(times), start, end)
+    for storm in storms:
+        logger.info("Outage storm: %s", storm)
+    chunks = simulate(
+        times,
+        objects,
+        entropy,
+        chunk_size=args.chunk_size,
+        now=end,
+        pool_size=args.faker_pool,
+        pool_refresh=args.faker_refresh,
+        number_format=args.number_format,
+        weights=args.distributions,
+        schema=args.schema,
+    )
+
+    if args.replay:
+        auth = None
+        if args.user:
+            auth = (args.user, os.environ.get(PASSWORD_VARIABLE, ""))
+        loader = Loader(args.replay, concurrency=args.concurrency, auth=auth)
+        parts = (("incident", part) for part in paced(chunks, args.speed))
+        stats = asyncio.run(loader.load(parts))
+        logger.info("Replayed %s", stats.report())
+        return
+
+    with contextlib.ExitStack() as stack:
+        outputs = [
+            stack.enter_context(
+                writers.WRITERS[fmt](
+                    f"topdesk_incidents_simulated.{fmt}", args.compression
+                )
+            )
+            for fmt in args.format
+        ]
+        for chunk in chunks:
+            for output in outputs:
+                output.write(chunk)
+    for output in outputs:
+        logger.info(
+            "Wrote %s (%d rows in %.1f seconds)",
+            output.path,
+            output.rows,
+            output.seconds,
+        )
@@ -0,0 +1,276 @@
+"""
+Stream generated records as JSON Lines at a target rate
+
+Records go to standard output, a TCP or Unix socket, or a file such as a named pipe.
+Writes block while the reader is busy, which holds back generation too, and only one
+chunk of records is held at a time, so memory use stays flat however long the stream
+runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import itertools
+import json
+import logging
+import queue
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List
+
+from . import numbering, shards
+from .lazy import lazy_import
+from .load import to_records
+
+numpy = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+
+def open_target(target: str) -> BinaryIO:
+    """
+    Open "-" (standard output), tcp://host:port, unix:///path or a file path for writing
+    """
+    if target == "-":
+        return sys.stdout.buffer
+    url = urllib.parse.urlsplit(target)
+    if url.scheme == "tcp":
+        connection = socket.create_connection((url.hostname, url.port))
+    elif url.scheme == "unix":
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(url.path)
+    else:
+        # Opening a named pipe waits for a reader
+        return open(target, "wb")
+    file = connection.makefile("wb")
+    # The file keeps its own reference to the socket
+    connection.close()
+    return file
+
+
+class Stats:
+    """
+    Throughput and write latency since the last report
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.since = time.monotonic()
+        self.interval_records = 0
+        self.latencies: List[float] = []
+        self.lag = 0.0
+
+    def add(self, records: int, latency: float, lag: float) -> None:
+        self.records += records
+        self.interval_records += records
+        self.latencies.append(latency)
+        self.lag = lag
+
+    def report(self) -> str:
+        seconds = time.monotonic() - self.since
+        p50, p99 = numpy.percentile(self.latencies or [0.0], [50, 99]) * 1000
+        return (
+            f"{self.records} records, {self.interval_records / seconds:.1f} records/s, "
+            f"write latency p50 {p50:.1f} ms p99 {p99:.1f} ms, "
+            f"{max(self.lag, 0.0) * 1000:.0f} ms behind schedule"
+        )
+
+
+def prefetch(iterator: Iterator, size: int = 1) -> Iterator:
+    """
+    Run an iterator in a background thread, at most ``size`` items ahead of the reader,
+    so that generating the next chunk doesn't pause the stream. An error in the
+    iterator is raised by the reader once the items before it have been read.
+    """
+    items = queue.Queue(maxsize=size)
+    done = object()
+    errors: List[BaseException] = []
+
+    def produce():
+        try:
+            for item in iterator:
+                items.put(item)
+        except BaseException as exc:
+            errors.append(exc)
+        finally:
+            items.put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while (item := items.get()) is not done:
+        yield item
+    if errors:
+        raise errors[0]
+
+
+def lines(chunks: Iterator) -> Iterator[bytes]:
+    """
+    JSON Lines for chunks of records, labelled with their entity
+    """
+    for entity, chunk in chunks:
+        for record in to_records(chunk):
+            yield json.dumps({"entity": entity, **record}).encode() + b"\n"
+
+
+def stream(
+    output: BinaryIO,
+    records: Iterator[bytes],
+    rate: float = 0.0,
+    report_interval: float = 5.0,
+    tick: float = 0.05,
+) -> Stats:
+    """
+    Write lines at a target rate in records per second, or as fast as possible if 0
+
+    Records are written in batches every ``tick`` seconds. A writer that falls behind
+    catches up by at most one second's worth of records, rather than bursting.
+    """
+    batch_size = max(1, round(rate * tick)) if rate else 1000
+    stats = Stats()
+    started = time.monotonic()
+    sent = 0
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            break
+        now = time.monotonic()
+        lag = 0.0
+        if rate:
+            due = started + sent / rate
+            lag = now - due
+            if lag < 0:
+                time.sleep(-lag)
+            elif lag > 1.0:
+                # Don't try to make up for more than a second of lost time
+                started += lag - 1.0
+        before = time.monotonic()
+        output.write(b"".join(batch))
+        output.flush()
+        sent += len(batch)
+        stats.add(len(batch), time.monotonic() - before, lag)
+        if time.monotonic() - stats.since >= report_interval:
+            logger.info(stats.report())
+            stats.reset()
+    return stats
+
+
+def add_parser(subparsers) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(
+        "stream",
+        help="Stream records as JSON Lines to standard output, a socket or a pipe",
+        description="Emit generated records as JSON Lines at a target rate. Each "
+        "record has an extra 'entity' field. Generation options such as the seed and "
+        "--entities are given before the command; the numbers of records only limit "
+        "the stream if given with --count. Without it, incident numbers are in the "
+        "wide format, which has room for more. Streamed records can't be --linked.",
+    )
+    parser.add_argument(
+        "target",
+        nargs="?",
+        default="-",
+        help="- for standard output (the default), tcp://host:port, unix:///path, "
+        "or the path of a file or named pipe",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Records per second, or 0 to stream as fast as possible",
+    )
+    parser.add_argument(
+        "--count",
+        action="store_true",
+        help="Stop after the number of records of each entity given by --num_records "
+        "and --entities instead of streaming without end",
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between throughput reports on standard error",
+    )
+    parser.set_defaults(func=run)
+    return parser
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.linked:
+        raise SystemExit(
+            "Streamed records can't be linked, as the records they refer to would "
+            "have to be generated first"
+        )
+    counts = {
+        entity: count if args.count else None for entity, count in args.counts.items()
+    }
+    number_format = args.number_format
+    if "incident" in counts:
+        num_records = counts["incident"]
+        if num_records is None and number_format == "standard":
+            # The standard format runs out after 81 million incidents
+            logger.info("Streaming without end, so using wide incident numbers")
+            number_format = "wide"
+        elif num_records is not None and num_records > numbering.capacity(
+            number_format
+        ):
+            raise SystemExit(
+                f"Too many records for unique incident numbers in the {number_format} "
+                "format, use --number-format wide"
+            )
+    with contextlib.ExitStack() as stack:
+        executor = (
+            stack.enter_context(ProcessPoolExecutor(args.workers))
+            if args.workers > 1
+            else None
+        )
+        generators = [
+            (
+                entity,
+                shards.generate(
+                    entity,
+                    num_records,
+                    chunk_size=args.chunk_size,
+                    seed=args.seed,
+                    now=args.now,
+                    executor=executor,
+                    pool_size=args.faker_pool,
+                    pool_refresh=args.faker_refresh,
+                    number_format=number_format,
+                    weights=args.distributions,
+                    schema=args.schema,
+                ),
+            )
+            for entity, num_records in counts.items()
+        ]
+        # Take a chunk from each entity in turn
+        chunks = (
+            item
+            for group in itertools.zip_longest(
+                *(
+                    zip(itertools.repeat(entity), chunks)
+                    for entity, chunks in generators
+                )
+            )
+            for item in group
+            if item is not None
+        )
+        output = open_target(args.target)
+        if output is not sys.stdout.buffer:
+            stack.callback(output.close)
+        try:
+            stats = stream(
+                output,
+                lines(prefetch(chunks)),
+                rate=args.rate,
+                report_interval=args.report_interval,
+            )
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("Reader closed the stream")
+            return
+    logger.info("Streamed %s", stats.report())
@@ -0,0 +1,124 @@
+"""
+Deferred text templates
+
+Templates are parsed once into literal text and placeholders. Random values are only
+drawn when a template is rendered, so callers can pick a template first and pay for a
+single rendering rather than evaluating every candidate.
+"""
+
+import random
+import string
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# A field factory receives the placeholder argument (the text after the first colon)
+# once at compile time and returns a callable that produces a fresh value per render,
+# given the render context.
+Field = Callable[[Mapping[str, Any]], str]
+FieldFactory = Callable[[str], Field]
+
+_formatter = string.Formatter()
+
+
+def randint_field(rng: random.Random) -> FieldFactory:
+    """
+    Random integer placeholder, e.g. {randint:10:500}
+    """
+
+    def factory(argument: str) -> Field:
+        low, high = (int(bound) for bound in argument.split(":"))
+        return lambda context: str(rng.randint(low, high))
+
+    return factory
+
+
+def choice_field(
+    vocabularies: Mapping[str, Sequence[str]], rng: random.Random
+) -> FieldFactory:
+    """
+    Random choice placeholder, either from a named vocabulary, e.g. {choice:FILE_FORMATS},
+    or from inline options separated by a pipe, e.g. {choice:gpu|highmem|general}
+    """
+
+    def factory(argument: str) -> Field:
+        options = argument.split("|") if "|" in argument else vocabularies[argument]
+        return lambda context: rng.choice(options)
+
+    return factory
+
+
+class Template:
+    """
+    A format string compiled once and rendered on demand
+
+    Placeholders are written ``{name}`` or ``{name:argument}``. Names that match a field
+    factory are bound at compile time and called with the context passed to ``render``
+    on every occurrence, so a repeated placeholder draws a fresh value each time. Any
+    other name is read from the context. The ``!l`` conversion lower-cases the value.
+    """
+
+    __slots__ = ("text", "_parts")
+
+    def __init__(self, text: str, fields: Mapping[str, FieldFactory]):
+        self.text = text
+        self._parts: List[Tuple[str, str, Optional[Field], bool]] = []
+        for literal, name, argument, conversion in _formatter.parse(text):
+            if conversion not in (None, "l"):
+                raise ValueError(f"Unsupported conversion !{conversion} in template")
+            if name is None:
+                self._parts.append((literal, "", None, False))
+            elif name in fields:
+                self._parts.append(
+                    (literal, name, fields[name](argument), conversion == "l")
+                )
+            else:
+                self._parts.append((literal, name, None, conversion == "l"))
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        """
+        Fill in the placeholders, drawing new values for each field
+        """
+        chunks = []
+        for literal, name, field, lower in self._parts:
+            chunks.append(literal)
+            if not name:
+                continue
+            value = field(context) if field else context[name]
+            chunks.append(value.lower() if lower else value)
+        return "".join(chunks)
+
+
+class TemplateRegistry:
+    """
+    Compiled templates grouped under keys such as (field, category)
+
+    Each group is compiled once when registered; choosing a template does not render
+    the other members of its group. Templates are chosen with the given random
+    generator.
+    """
+
+    def __init__(self, fields: Mapping[str, FieldFactory], rng: random.Random):
+        self.fields = fields
+        self.rng = rng
+        self._groups: Dict[Hashable, List[Template]] = {}
+
+    def register(self, key: Hashable, texts: Sequence[str]) -> None:
+        self._groups[key] = [Template(text, self.fields) for text in texts]
+
+    def choose(self, key: Hashable, default: Optional[Hashable] = None) -> Template:
+        """
+        Pick a template from a group at random, falling back to the default group
+        """
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[default]
+        return self.rng.choice(group)
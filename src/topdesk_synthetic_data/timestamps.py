@@ -0,0 +1,113 @@
+"""
+Timestamp engine: resolve date ranges once, draw epoch seconds, format in bulk
+
+Relative ranges such as "-6M" are resolved to integer seconds since the epoch once per
+run rather than parsed for every value. Timestamps are drawn as integers and only
+formatted as text when written, either one at a time with a cache of formatted days or
+a whole column at once with NumPy.
+"""
+
+from __future__ import annotations
+
+import functools
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from . import columns
+from .lazy import lazy_import
+
+numpy = lazy_import("numpy")
+
+EPOCH = datetime(1970, 1, 1)
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+def to_seconds(value: datetime) -> int:
+    """
+    Seconds since the epoch of a naive datetime, ignoring time zones
+    """
+    return (value - EPOCH) // timedelta(seconds=1)
+
+
+def to_datetime(seconds: int) -> datetime:
+    return EPOCH + timedelta(seconds=seconds)
+
+
+class TimestampRange:
+    """
+    Timestamps between two relative dates, resolved once
+
+    Args:
+        start_date: Relative date string, e.g. "-6M", "today" or "now"
+        end_date: Relative date string
+        now: Reference time, defaults to the current time
+        dates: Draw whole days (midnight) rather than seconds
+    """
+
+    __slots__ = ("start", "end", "step")
+
+    def __init__(
+        self,
+        start_date: str,
+        end_date: str,
+        now: Optional[datetime] = None,
+        dates: bool = False,
+    ):
+        now = datetime.now() if now is None else now
+        start = to_seconds(columns.relative_datetime(start_date, now))
+        end = to_seconds(columns.relative_datetime(end_date, now))
+        self.step = DAY if dates else 1
+        self.start = start // self.step
+        self.end = end // self.step
+
+    def draw(self, rng: random.Random = random) -> int:
+        """
+        A random timestamp in seconds since the epoch
+        """
+        return rng.randint(self.start, self.end) * self.step
+
+
+@functools.lru_cache(maxsize=8192)
+def format_day(days: int) -> str:
+    return (EPOCH + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def format_datetime(seconds: int) -> str:
+    """
+    Format seconds since the epoch as "YYYY-MM-DD HH:MM:SS"
+    """
+    days, seconds = divmod(seconds, DAY)
+    hours, seconds = divmod(seconds, HOUR)
+    minutes, seconds = divmod(seconds, MINUTE)
+    return f"{format_day(days)} {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def format_date(seconds: int) -> str:
+    """
+    Format seconds since the epoch as "YYYY-MM-DD"
+    """
+    return format_day(seconds // DAY)
+
+
+def format_array(values: numpy.ndarray) -> numpy.ndarray:
+    """
+    Format a column of timestamps as text, with missing values left empty
+
+    Columns where every timestamp is at midnight are formatted as dates, like pandas.
+    """
+    values = values.astype("datetime64[s]")
+    missing = numpy.isnat(values)
+    seconds = values[~missing].astype(numpy.int64)
+    if (seconds % DAY == 0).all():
+        text = numpy.datetime_as_string(values, unit="D").astype("U10")
+    else:
+        text = numpy.datetime_as_string(values, unit="s").astype("U19")
+        # Replace the "T" between the date and the time with a space
+        text.view("U1").reshape(len(text), 19)[:, 10] = " "
+    text = text.astype(object)
+    text[missing] = ""
+    return text
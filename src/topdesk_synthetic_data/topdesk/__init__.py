@@ -2,4 +2,7 @@ from .asset import Asset
 from .incident import Incident
 from .person import Person
 
-__all__ = ["Asset", "Incident", "Person"]
+# Entities by name, as used on the command line
+ENTITIES = {"incident": Incident, "person": Person, "asset": Asset}
+
+__all__ = ["Asset", "Incident", "Person", "ENTITIES"]
@@ -1,12 +1,53 @@
-import random
-import uuid
+from __future__ import annotations
 
-import faker
+from datetime import datetime
+from typing import Optional
 
-fake = faker.Faker()
+from .. import columns, distributions, pools, timestamps
+from ..fakes import fake
+from ..index import RecordIndex
+from ..lazy import lazy_import
+from .entity import Entity
 
+numpy = lazy_import("numpy")
+pandas = lazy_import("pandas")
 
-class Asset:
+
+class Asset(Entity):
+    ASSET_TYPES = [
+        "Desktop",
+        "Laptop",
+        "Server",
+        "Printer",
+        "Monitor",
+        "Phone",
+        "Tablet",
+        "Switch",
+        "Router",
+    ]
+    BRANDS = [
+        "Dell",
+        "HP",
+        "Lenovo",
+        "Apple",
+        "Microsoft",
+        "Cisco",
+        "Canon",
+        "Samsung",
+    ]
+    STATUSES = ["In Use", "Available", "Broken", "In Repair", "Retired", "Ordered"]
+    DEPARTMENTS = ["IT", "HR", "Finance", "Marketing", "Sales"]
+
+    # Low-cardinality fields, stored as categoricals in columnar output
+    CATEGORICAL_FIELDS = {
+        "type": ASSET_TYPES,
+        "brand": BRANDS,
+        "status": STATUSES,
+        "assignedToDepartment": DEPARTMENTS,
+    }
+
+    # Fields with dates but no times
+    DATE_FIELDS = ["purchaseDate", "warrantyDate"]
 
     @classmethod
     def generate(cls, num_records: int = 100):
@@ -14,56 +55,107 @@ class Asset:
         Generate dummy data for TOPdesk asset/configuration management export
         """
 
-        asset_types = [
-            "Desktop",
-            "Laptop",
-            "Server",
-            "Printer",
-            "Monitor",
-            "Phone",
-            "Tablet",
-            "Switch",
-            "Router",
-        ]
-        brands = [
-            "Dell",
-            "HP",
-            "Lenovo",
-            "Apple",
-            "Microsoft",
-            "Cisco",
-            "Canon",
-            "Samsung",
-        ]
-        statuses = ["In Use", "Available", "Broken", "In Repair", "Retired", "Ordered"]
+        purchase_dates = timestamps.TimestampRange("-3y", "today", dates=True)
+        warranty_dates = timestamps.TimestampRange("today", "+3y", dates=True)
+        modified_dates = timestamps.TimestampRange("-30d", "now")
 
         for i in range(num_records):
-            asset_type = random.choice(asset_types)
-            brand = random.choice(brands)
+            asset_type = distributions.choose(
+                fake.random, "asset", "type", cls.ASSET_TYPES
+            )
+            brand = distributions.choose(fake.random, "asset", "brand", cls.BRANDS)
 
             yield {
-                "id": str(uuid.uuid4()),
+                "id": fake.uuid4(),
                 "name": f"{brand} {asset_type} {str(i + 1).zfill(3)}",
                 "type": asset_type,
                 "brand": brand,
-                "model": f"{brand}-{random.randint(1000, 9999)}",
+                "model": f"{brand}-{fake.random.randint(1000, 9999)}",
                 "serialNumber": fake.lexify(text="????-####-????").upper(),
                 "assetTag": f"AST{str(i + 1).zfill(5)}",
-                "status": random.choice(statuses),
-                "location": fake.city() + " - Floor " + str(random.randint(1, 5)),
-                "assignedTo": fake.name() if random.random() > 0.3 else "",
-                "assignedToDepartment": random.choice(
-                    ["IT", "HR", "Finance", "Marketing", "Sales"]
+                "status": distributions.choose(
+                    fake.random, "asset", "status", cls.STATUSES
+                ),
+                "location": fake.city() + " - Floor " + str(fake.random.randint(1, 5)),
+                "assignedTo": fake.name() if fake.random.random() > 0.3 else "",
+                "assignedToDepartment": distributions.choose(
+                    fake.random, "asset", "assignedToDepartment", cls.DEPARTMENTS
+                ),
+                "purchaseDate": timestamps.format_date(
+                    purchase_dates.draw(fake.random)
                 ),
-                "purchaseDate": fake.date_between(
-                    start_date="-3y", end_date="today"
-                ).strftime("%Y-%m-%d"),
-                "purchasePrice": round(random.uniform(200, 3000), 2),
+                "purchasePrice": round(fake.random.uniform(200, 3000), 2),
                 "supplier": fake.company(),
-                "warrantyDate": fake.date_between(
-                    start_date="today", end_date="+3y"
-                ).strftime("%Y-%m-%d"),
-                "lastModified": fake.date_time_between(
-                    start_date="-30d", end_date="now"
-                ).strftime("%Y-%m-%d %H:%M:%S"),
+                "warrantyDate": timestamps.format_date(
+                    warranty_dates.draw(fake.random)
+                ),
+                "lastModified": timestamps.format_datetime(
+                    modified_dates.draw(fake.random)
+                ),
+            }
+
+    @classmethod
+    def generate_columns(
+        cls,
+        num_records: int = 100,
+        start: int = 0,
+        rng: Optional[numpy.random.Generator] = None,
+        now: Optional[datetime] = None,
+        persons: Optional[RecordIndex] = None,
+    ) -> pandas.DataFrame:
+        """
+        Generate dummy data for TOPdesk asset/configuration management export a column
+        at a time
+
+        Args:
+            persons: Index of generated persons by department. If given, assets are
+                assigned to persons in their department and refer to them by id.
+        """
+        rng = columns.default_rng(rng)
+        n = num_records
+
+        asset_type = distributions.choice(rng, "asset", "type", cls.ASSET_TYPES, n)
+        brand = distributions.choice(rng, "asset", "brand", cls.BRANDS, n)
+        assigned = rng.random(n) > 0.3
+        assigned_to = numpy.full(n, "", dtype=object)
+        if persons is None:
+            assigned_to = numpy.where(assigned, pools.draw(fake, "name", rng, n), "")
+
+        frame = pandas.DataFrame(
+            {
+                "id": columns.uuid4(rng, n),
+                "name": brand + " " + asset_type + " " + columns.sequence(start, n, 3),
+                "type": asset_type,
+                "brand": brand,
+                "model": brand + "-" + columns.to_text(rng.integers(1000, 10000, n)),
+                "serialNumber": columns.lexify(rng, "????-####-????", n),
+                "assetTag": "AST" + columns.sequence(start, n, 5),
+                "status": distributions.choice(rng, "asset", "status", cls.STATUSES, n),
+                "location": pools.draw(fake, "city", rng, n)
+                + " - Floor "
+                + columns.to_text(rng.integers(1, 6, n)),
+                "assignedTo": assigned_to,
+                "assignedToDepartment": distributions.choice(
+                    rng, "asset", "assignedToDepartment", cls.DEPARTMENTS, n
+                ),
+                "purchaseDate": columns.dates(rng, "-3y", "today", n, now),
+                "purchasePrice": rng.uniform(200, 3000, n).round(2),
+                "supplier": pools.draw(fake, "company", rng, n),
+                "warrantyDate": columns.dates(rng, "today", "+3y", n, now),
+                "lastModified": columns.datetimes(rng, "-30d", "now", n, now),
             }
+        )
+
+        if persons is not None:
+            assignee = persons.sample_groups(
+                rng, frame["assignedToDepartment"].to_numpy()
+            )
+            assignee[~assigned] = -1
+            frame["assignedTo"] = persons.column("dynamicName", assignee)
+            frame.insert(
+                frame.columns.get_loc("assignedTo") + 1,
+                "assignedToId",
+                persons.column("id", assignee),
+            )
+
+        return frame.astype(columns.categorical_dtypes(cls.CATEGORICAL_FIELDS))
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class Entity:
+    """
+    Methods shared by the generators of each type of record
+    """
+
+    # Fields that the weights of each categorical field may depend on, see
+    # distributions. Fields left out have fixed weights.
+    CONDITIONS: Dict[str, List[str]] = {}
+
+    @classmethod
+    def record(
+        cls, seed: int, index: int, now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate record number ``index`` of the dataset with the given seed directly,
+        without generating the records before it
+        """
+        # Imported here because the records module imports the entity modules
+        from .. import records
+
+        return records.record(cls, seed, index, now).to_dict()
@@ -1,15 +1,29 @@
-import random
-import uuid
-from datetime import timedelta
-from typing import Any, Dict, Generator
-
-import faker
-
-# Initialize Faker for realistic data generation
-fake = faker.Faker()
-
-
-class Incident:
+from __future__ import annotations
+
+import functools
+from datetime import datetime, timedelta
+from typing import Any, Dict, Generator, Mapping, Optional
+
+from .. import columns, distributions, numbering, pools, timestamps
+from ..fakes import fake
+from ..index import RecordIndex
+from ..lazy import lazy_import
+from ..template import (
+    Field,
+    FieldFactory,
+    TemplateRegistry,
+    choice_field,
+    randint_field,
+)
+from .asset import Asset
+from .entity import Entity
+from .person import Person
+
+numpy = lazy_import("numpy")
+pandas = lazy_import("pandas")
+
+
+class Incident(Entity):
     """Generator for research computing support incident dummy data"""
 
     # Research computing specific statuses
@@ -319,311 +333,133 @@ class Incident:
         "Disk quota exceeded",
     ]
 
-    @classmethod
-    def reference_number(cls) -> str:
-        return f"SHEF {random.randint(1000, 9999)} {random.randint(1000, 9999)}"
-
-    @classmethod
-    def generate(cls, num_records: int = 100) -> Generator[Dict[str, Any], None, None]:
-        """
-        Generate dummy data for research computing support incidents
-
-        Args:
-            num_records: Number of incident records to generate
-
-        Yields:
-            Dict containing incident data matching TOPdesk structure
-        """
-
-        for i in range(num_records):
-
-            # Random dates within last 6 months
-            call_date = fake.date_time_between(start_date="-6m", end_date="now")
-
-            # Select category and corresponding subcategory
-            category = random.choice(cls.CATEGORIES)
-            subcategory = random.choice(cls.SUBCATEGORIES[category])
-
-            # Generate closed date (if status is closed/resolved)
-            status = random.choice(cls.STATUSES)
-            closed_date = None
-            target_date = call_date + timedelta(days=random.randint(1, 14))
-
-            if status in ["closed", "resolved"]:
-                closed_date = call_date + timedelta(
-                    hours=random.randint(1, 120), minutes=random.randint(0, 59)
-                )
-
-            # Generate realistic brief description
-            brief_description = cls._generate_brief_description(category, subcategory)
-
-            # Generate duration (research support often takes longer)
-            duration = round(random.uniform(0.5, 72.0), 2) if closed_date else None
-
-            # Generate research-specific caller information
-            caller_department = random.choice(cls.DEPARTMENTS)
-            caller_position = random.choice(cls.ACADEMIC_POSITIONS)
-            caller_name = fake.name()
-
-            # Create academic email
-            name_parts = caller_name.lower().split()
-            caller_email = f"{name_parts[0]}.{name_parts[-1]}@university.ac.uk"
-
-            # Generate research-focused request and action text
-            request_text = cls._generate_request_text(
-                call_date, caller_name, subcategory, caller_department, caller_position
-            )
-            action_text = cls._generate_action_text(subcategory, status)
-
-            # Generate detailed incident body (the actual user submission)
-            incident_body = cls._generate_incident_body(
-                category, subcategory, caller_name, caller_position, caller_department
-            )
-
-            yield {
-                # Core incident fields
-                "id": str(uuid.uuid4()),
-                "number": cls.reference_number(),
-                "externalNumber": (
-                    f"GRANT-{random.randint(1000, 9999)}"
-                    if random.random() > 0.8
-                    else ""
-                ),
-                "briefDescription": brief_description,
-                "status": status,
-                # Dates and times
-                "callDate": call_date.strftime("%Y-%m-%d %H:%M:%S"),
-                "creationDate": call_date.strftime("%Y-%m-%d %H:%M:%S"),
-                "modificationDate": (
-                    call_date + timedelta(hours=random.randint(0, 48))
-                ).strftime("%Y-%m-%d %H:%M:%S"),
-                "targetDate": target_date.strftime("%Y-%m-%d %H:%M:%S"),
-                "closedDate": (
-                    closed_date.strftime("%Y-%m-%d %H:%M:%S") if closed_date else ""
-                ),
-                # Classification
-                "category": category,
-                "subcategory": subcategory,
-                "callType": random.choice(cls.CALL_TYPES),
-                "entryType": random.choice(cls.ENTRY_TYPES),
-                # Priority and impact
-                "priority": random.choice(cls.PRIORITIES),
-                "impact": random.choice(cls.IMPACTS),
-                "urgency": random.choice(cls.URGENCIES),
-                # People (research-focused)
-                "callerName": caller_name,
-                "callerEmail": caller_email,
-                "callerPhone": fake.phone_number(),
-                "callerDepartment": caller_department,
-                "callerPosition": caller_position,
-                "callerBranch": random.choice(cls.CAMPUS_BRANCHES),
-                "researchGroup": f"{fake.last_name()} Lab",
-                "grantCode": cls._generate_grant_code(),
-                "operator": (
-                    random.choice(cls.OPERATORS) if random.random() > 0.2 else ""
-                ),
-                "operatorGroup": random.choice(cls.OPERATOR_GROUPS),
-                # Request and action fields
-                "request": request_text,
-                "action": action_text,
-                "incidentBody": incident_body,  # Full user submission text
-                # Additional fields
-                "duration": duration,
-                "costs": (
-                    round(random.uniform(0, 200), 2) if random.random() > 0.9 else 0
-                ),
-                "onHold": random.choice([True, False]) if status == "onHold" else False,
-                "completed": status in ["resolved", "closed"],
-                "closed": status == "closed",
-                # Research infrastructure objects
-                "objectName": (
-                    random.choice(cls.RESEARCH_OBJECTS) if random.random() > 0.4 else ""
-                ),
-                "objectType": (
-                    random.choice(cls.OBJECT_TYPES) if random.random() > 0.4 else ""
-                ),
-                "location": random.choice(cls.LOCATIONS),
-                # SLA fields (research support typically has longer SLAs)
-                "slaDeadline": (
-                    call_date + timedelta(hours=random.randint(24, 168))  # 1-7 days
-                ).strftime("%Y-%m-%d %H:%M:%S"),
-                "slaViolated": (
-                    random.choice([True, False])
-                    if status in ["resolved", "closed"]
-                    else False
-                ),
-                # Research-specific fields
-                "researchDiscipline": random.choice(cls.RESEARCH_DISCIPLINES),
-                "softwareRequired": (
-                    random.choice(cls.RESEARCH_SOFTWARE)
-                    if random.random() > 0.5
-                    else ""
-                ),
-                "trainingRequired": (
-                    random.choice([True, False])
-                    if category == "Training & Documentation"
-                    else False
-                ),
-                "followUpNeeded": (
-                    random.choice([True, False]) if random.random() > 0.7 else False
-                ),
-            }
-
-    @classmethod
-    def _generate_brief_description(cls, category: str, subcategory: str) -> str:
-        """Generate realistic brief descriptions for research computing issues"""
-        brief_descriptions = {
-            "HPC Access & Authentication": [
-                f"Cannot login to HPC cluster - {subcategory}",
-                f"SSH authentication failing - {subcategory}",
-                f"Need new HPC account - {subcategory}",
-                "VPN connection issues for cluster access",
-            ],
-            "Data Management": [
-                f"Cannot access research data share - {subcategory}",
-                "Need to mount /research/groupname directory",
-                "Data transfer failing from local machine",
-                f"Backup of large dataset required - {subcategory}",
-            ],
-            "Software & Applications": [
-                f"Python environment not working - {subcategory}",
-                "Cannot load required software module",
-                f"R package installation failing - {subcategory}",
-                "MATLAB license error on cluster",
-                f"Docker container won't run - {subcategory}",
-            ],
-            "Training & Documentation": [
-                f"Request for {subcategory} workshop",
-                f"Need help with {subcategory} for research project",
-                f"Documentation missing for {subcategory}",
-                "Training session needed for research group",
-            ],
-            "Research Infrastructure": [
-                f"Job not starting in queue - {subcategory}",
-                "Need GPU resources for machine learning",
-                f"High memory job requirements - {subcategory}",
-                "Parallel job optimization help needed",
-            ],
-            "Collaboration Tools": [
-                f"JupyterHub not accessible - {subcategory}",
-                "Cannot share notebook with collaborators",
-                f"Git repository setup needed - {subcategory}",
-                "RStudio Server connection issues",
-            ],
-            "Security & Compliance": [
-                f"Data security review required - {subcategory}",
-                "GDPR compliance check for dataset",
-                "Access control setup for sensitive data",
-                "Ethics approval data handling guidance",
-            ],
-            "Hardware Resources": [
-                f"Compute node performance issues - {subcategory}",
-                "Storage system slow response",
-                "GPU hardware allocation request",
-                "Network connectivity problems on cluster",
-            ],
-        }
-        return random.choice(brief_descriptions[category])
-
-    @classmethod
-    def _generate_request_text(
-        cls,
-        call_date,
-        caller_name: str,
-        subcategory: str,
-        caller_department: str,
-        caller_position: str,
-    ) -> str:
-        """Generate research-focused request text"""
-        research_requests = [
-            f"I'm working on a {fake.catch_phrase().lower()} project and need help with {subcategory.lower()}.",
-            f"My research group is experiencing issues with {subcategory.lower()} on the HPC cluster.",
-            f"We have a grant deadline approaching and need urgent help with {subcategory.lower()}.",
-            f"I'm analyzing {fake.word()} data and encountering problems with {subcategory.lower()}.",
-            f"Our {caller_department} research requires assistance with {subcategory.lower()}.",
-            f"I'm a {caller_position.lower()} working on {fake.bs()} and need support with {subcategory.lower()}.",
-        ]
-        return f"{call_date.strftime('%d-%m-%Y %H:%M')} [{caller_name}]: {random.choice(research_requests)}"
-
-    @classmethod
-    def _generate_action_text(cls, subcategory: str, status: str) -> str:
-        """Generate research-appropriate action text"""
-        if status not in ["resolved", "closed"]:
-            return ""
+    # Brief descriptions for each category
+    BRIEF_DESCRIPTION_TEMPLATES = {
+        "HPC Access & Authentication": [
+            "Cannot login to HPC cluster - {subcategory}",
+            "SSH authentication failing - {subcategory}",
+            "Need new HPC account - {subcategory}",
+            "VPN connection issues for cluster access",
+        ],
+        "Data Management": [
+            "Cannot access research data share - {subcategory}",
+            "Need to mount /research/groupname directory",
+            "Data transfer failing from local machine",
+            "Backup of large dataset required - {subcategory}",
+        ],
+        "Software & Applications": [
+            "Python environment not working - {subcategory}",
+            "Cannot load required software module",
+            "R package installation failing - {subcategory}",
+            "MATLAB license error on cluster",
+            "Docker container won't run - {subcategory}",
+        ],
+        "Training & Documentation": [
+            "Request for {subcategory} workshop",
+            "Need help with {subcategory} for research project",
+            "Documentation missing for {subcategory}",
+            "Training session needed for research group",
+        ],
+        "Research Infrastructure": [
+            "Job not starting in queue - {subcategory}",
+            "Need GPU resources for machine learning",
+            "High memory job requirements - {subcategory}",
+            "Parallel job optimization help needed",
+        ],
+        "Collaboration Tools": [
+            "JupyterHub not accessible - {subcategory}",
+            "Cannot share notebook with collaborators",
+            "Git repository setup needed - {subcategory}",
+            "RStudio Server connection issues",
+        ],
+        "Security & Compliance": [
+            "Data security review required - {subcategory}",
+            "GDPR compliance check for dataset",
+            "Access control setup for sensitive data",
+            "Ethics approval data handling guidance",
+        ],
+        "Hardware Resources": [
+            "Compute node performance issues - {subcategory}",
+            "Storage system slow response",
+            "GPU hardware allocation request",
+            "Network connectivity problems on cluster",
+        ],
+    }
 
-        research_actions = [
-            f"Provided step-by-step guidance for {subcategory.lower()} setup.",
-            f"Scheduled training session for research group on {subcategory.lower()}.",
-            f"Fixed configuration issue and tested {subcategory.lower()} functionality.",
-            f"Created documentation and shared resources for {subcategory.lower()}.",
-            f"Escalated to specialist team for advanced {subcategory.lower()} support.",
-            f"Collaborated with researcher to optimize {subcategory.lower()} workflow.",
-            "Implemented solution and arranged follow-up meeting.",
-        ]
-        return random.choice(research_actions)
+    # Request text written by the caller
+    REQUEST_TEMPLATES = [
+        "I'm working on a {catch_phrase!l} project and need help with {subcategory!l}.",
+        "My research group is experiencing issues with {subcategory!l} on the HPC cluster.",
+        "We have a grant deadline approaching and need urgent help with {subcategory!l}.",
+        "I'm analyzing {word} data and encountering problems with {subcategory!l}.",
+        "Our {caller_department} research requires assistance with {subcategory!l}.",
+        "I'm a {caller_position!l} working on {bs} and need support with {subcategory!l}.",
+    ]
 
-    @classmethod
-    def _generate_grant_code(cls) -> str:
-        """Generate UK research council grant code format"""
-        if random.random() > 0.6:
-            council = random.choice(["EP", "MR", "ST", "BB", "NE", "ES", "AH"])
-            return f"{council}/{random.choice(['R', 'M', 'S'])}{random.randint(100000, 999999)}/1"
-        return ""
+    # Action text recorded by the operator when the incident is resolved
+    ACTION_TEMPLATES = [
+        "Provided step-by-step guidance for {subcategory!l} setup.",
+        "Scheduled training session for research group on {subcategory!l}.",
+        "Fixed configuration issue and tested {subcategory!l} functionality.",
+        "Created documentation and shared resources for {subcategory!l}.",
+        "Escalated to specialist team for advanced {subcategory!l} support.",
+        "Collaborated with researcher to optimize {subcategory!l} workflow.",
+        "Implemented solution and arranged follow-up meeting.",
+    ]
 
-    @classmethod
-    def _generate_incident_body(
-        cls,
-        category: str,
-        subcategory: str,
-        caller_name: str,
-        caller_position: str,
-        caller_department: str,
-    ) -> str:
-        """Generate detailed incident body text (the actual user submission)"""
+    # Sensitive data types that need guidance from the data protection team
+    SENSITIVE_DATA_TYPES = [
+        "Human subjects survey data",
+        "Medical imaging data",
+        "Personal interview transcripts",
+        "Financial records",
+        "Genomic data",
+    ]
 
-        # Templates for different categories of incidents
-        body_templates = {
-            "HPC Access & Authentication": [
-                f"""Hello,
+    # Incident body templates (the actual user submission) for each category.
+    # These are compiled once; see topdesk_synthetic_data.template for the syntax.
+    BODY_TEMPLATES = {
+        "HPC Access & Authentication": [
+            """Hello,
 
 I'm having trouble accessing the HPC cluster. When I try to log in using:
-ssh {fake.user_name()}@cluster.university.ac.uk
+ssh {user_name}@cluster.university.ac.uk
 
-I get the error: "{random.choice(cls.ERROR_MESSAGES)}"
+I get the error: "{choice:ERROR_MESSAGES}"
 
 I've tried:
 - Checking my network connection
 - Using different terminals (PuTTY, Terminal, WSL)
 - Regenerating my SSH keys
 
-My project deadline is approaching and I really need access to run my {fake.word()} analysis scripts.
+My project deadline is approaching and I really need access to run my {word} analysis scripts.
 
 Could someone please help?
 
 Best regards,
 {caller_name}
 {caller_position}, {caller_department}""",
-                f"""Hi Research Computing Team,
+            """Hi Research Computing Team,
 
-I need a new account on the HPC system for my research project on {fake.bs()}.
+I need a new account on the HPC system for my research project on {bs}.
 
-My supervisor is Prof. {fake.last_name()} and I'm working on grant {cls._generate_grant_code() or 'pending approval'}.
+My supervisor is Prof. {last_name} and I'm working on grant {grant_code:pending approval}.
 
 I will need:
-- Access to the {random.choice(['gpu', 'highmem', 'general'])} queue
-- Storage quota of approximately {random.randint(100, 2000)}GB
-- Software: {random.choice(cls.RESEARCH_SOFTWARE)}
+- Access to the {choice:gpu|highmem|general} queue
+- Storage quota of approximately {randint:100:2000}GB
+- Software: {choice:RESEARCH_SOFTWARE}
 
 When can I expect the account to be ready?
 
 Thanks,
 {caller_name}""",
-                f"""Support team,
+            """Support team,
 
 My SSH keys seem to have stopped working suddenly. Yesterday everything was fine, but today I'm getting authentication
 failures.
 
-Error message: "{random.choice(cls.ERROR_MESSAGES)}"
+Error message: "{choice:ERROR_MESSAGES}"
 
 I'm in the middle of running a large batch of jobs for a conference deadline next week. Is there a quick fix for this?
 
@@ -631,74 +467,74 @@ I'm available for a call if that helps troubleshoot faster.
 
 {caller_name}
 {caller_department}""",
-            ],
-            "Data Management": [
-                f"""Dear Research IT,
+        ],
+        "Data Management": [
+            """Dear Research IT,
 
-I'm trying to access our research group's shared data directory at /research/{fake.word()}_lab/ but getting permission
+I'm trying to access our research group's shared data directory at /research/{word}_lab/ but getting permission
 errors.
 
-I need to access approximately {random.randint(10, 500)}GB of {random.choice(cls.RESEARCH_DATA_TYPES)} stored in
-{random.choice(cls.FILE_FORMATS)} format.
+I need to access approximately {randint:10:500}GB of {choice:RESEARCH_DATA_TYPES} stored in
+{choice:FILE_FORMATS} format.
 
-The error I'm seeing is: "{random.choice(cls.ERROR_MESSAGES)}"
+The error I'm seeing is: "{choice:ERROR_MESSAGES}"
 
-My supervisor Prof. {fake.last_name()} said I should have access. Can you please check my permissions?
+My supervisor Prof. {last_name} said I should have access. Can you please check my permissions?
 
-This data is critical for my {caller_position.lower()} research on {fake.bs()}.
+This data is critical for my {caller_position!l} research on {bs}.
 
 Many thanks,
 {caller_name}""",
-                f"""Hello,
+            """Hello,
 
-I need help transferring a large dataset ({random.randint(50, 1000)}GB) from my local workstation to the cluster
+I need help transferring a large dataset ({randint:50:1000}GB) from my local workstation to the cluster
 storage.
 
 I've tried using rsync but the transfer keeps failing after a few hours:
 rsync -avz --progress /local/data/ cluster:/research/data/
 
-Error: "{random.choice(cls.ERROR_MESSAGES)}"
+Error: "{choice:ERROR_MESSAGES}"
 
-Is there a better method for large file transfers? The dataset contains {random.choice(cls.RESEARCH_DATA_TYPES)} in
-multiple {random.choice(cls.FILE_FORMATS)} files.
+Is there a better method for large file transfers? The dataset contains {choice:RESEARCH_DATA_TYPES} in
+multiple {choice:FILE_FORMATS} files.
 
 Any advice would be appreciated!
 
 {caller_name}
 {caller_position}, {caller_department}""",
-                f"""Hi team,
+            """Hi team,
 
-I accidentally deleted some important research data from /research/{fake.word()}_project/
+I accidentally deleted some important research data from /research/{word}_project/
 
 The files were:
-- {fake.word()}_analysis{random.choice(cls.FILE_FORMATS)}
-- {fake.word()}_results{random.choice(cls.FILE_FORMATS)}
-- Several folders of {random.choice(cls.RESEARCH_DATA_TYPES)}
+- {word}_analysis{choice:FILE_FORMATS}
+- {word}_results{choice:FILE_FORMATS}
+- Several folders of {choice:RESEARCH_DATA_TYPES}
 
-This happened yesterday around {fake.time()}. Do you have backups I can restore from?
+This happened yesterday around {time}. Do you have backups I can restore from?
 
 This is for a grant application due next week - please help!
 
 Urgently,
 {caller_name}""",
-            ],
-            "Software & Applications": [
-                f"""Research Computing Support,
+        ],
+        "Software & Applications": [
+            """Research Computing Support,
 
 I'm having issues with my Python environment on the cluster. When I try to run my analysis script, I get:
 
 ```
-ModuleNotFoundError: No module named '{fake.word()}'
+ModuleNotFoundError: No module named '{word}'
 ```
 
 I've tried:
-- module load python/3.{random.randint(8, 11)}
-- pip install {fake.word()}
+- module load python/3.{randint:8:11}
+- pip install {word}
 - Creating a new conda environment
 
 But nothing seems to work. My script worked fine last month.
 
-I'm analyzing {random.choice(cls.RESEARCH_DATA_TYPES)} for my {caller_position.lower()} thesis and really need this
+I'm analyzing {choice:RESEARCH_DATA_TYPES} for my {caller_position!l} thesis and really need this
 working.
 
 Can someone help troubleshoot?
@@ -706,77 +542,77 @@ Can someone help troubleshoot?
 Best,
 {caller_name}
 {caller_department}""",
-                f"""Hello,
+            """Hello,
 
-I need help installing {random.choice(cls.RESEARCH_SOFTWARE)} on the cluster for my research group.
+I need help installing {choice:RESEARCH_SOFTWARE} on the cluster for my research group.
 
-We need this for our {fake.bs()} project. The software requires:
-- {random.choice(['GPU support', 'MPI libraries', 'Large memory', 'Special libraries'])}
-- License: {random.choice(['Academic', 'Open source', 'Commercial - we have license'])}
+We need this for our {bs} project. The software requires:
+- {choice:GPU support|MPI libraries|Large memory|Special libraries}
+- License: {choice:Academic|Open source|Commercial - we have license}
 
-I tried installing it myself but got: "{random.choice(cls.ERROR_MESSAGES)}"
+I tried installing it myself but got: "{choice:ERROR_MESSAGES}"
 
 Could you please install this system-wide or help me with a local installation?
 
-Timeline: We need this working by {fake.date_between(start_date='today', end_date='+1m').strftime('%Y-%m-%d')} for our
+Timeline: We need this working by {date:today:+1M} for our
 paper submission.
 
 Thanks,
 {caller_name}""",
-                f"""Support Team,
+            """Support Team,
 
 I'm getting MATLAB license errors when trying to run jobs on the cluster:
 
-"License checkout failed for {fake.word()}_Toolbox"
+"License checkout failed for {word}_Toolbox"
 
-This is blocking my research on {fake.bs()}. The jobs were working fine until this week.
+This is blocking my research on {bs}. The jobs were working fine until this week.
 
 My SLURM script:
 ```
 #!/bin/bash
-#SBATCH --job-name={fake.word()}_job
+#SBATCH --job-name={word}_job
 #SBATCH --time=12:00:00
 #SBATCH --mem=32G
 
 module load matlab
-matlab -batch "run_analysis('{fake.word()}')"
+matlab -batch "run_analysis('{word}')"
 ```
 
 Can you check the license server status?
 
 {caller_name}
 {caller_position}""",
-            ],
-            "Training & Documentation": [
-                f"""Dear Training Team,
+        ],
+        "Training & Documentation": [
+            """Dear Training Team,
 
-I'm a new {caller_position.lower()} in {caller_department} and need help getting started with the HPC cluster.
+I'm a new {caller_position!l} in {caller_department} and need help getting started with the HPC cluster.
 
 I have basic Linux knowledge but I'm new to:
 - Job scheduling with SLURM
 - Loading software modules
 - Managing large datasets
-- {random.choice(['Python parallel processing', 'R on clusters', 'GPU programming'])}
+- {choice:Python parallel processing|R on clusters|GPU programming}
 
 Is there a workshop or training session I can attend? I learn better in group settings than reading documentation alone.
 
-My research involves {fake.bs()} and I'll be working with {random.choice(cls.RESEARCH_DATA_TYPES)}.
+My research involves {bs} and I'll be working with {choice:RESEARCH_DATA_TYPES}.
 
 Please let me know what training options are available.
 
 Thanks,
 {caller_name}""",
-                f"""Hi Research Computing,
+            """Hi Research Computing,
 
-Our research group (Prof. {fake.last_name()}'s lab) would like to request a training session on {subcategory.lower()}.
+Our research group (Prof. {last_name}'s lab) would like to request a training session on {subcategory!l}.
 
-We have {random.randint(3, 12)} people at various levels:
-- {random.randint(1, 3)} {random.choice(cls.ACADEMIC_POSITIONS).lower()}s
-- {random.randint(2, 6)} PhD students
-- {random.randint(1, 4)} postdocs
+We have {randint:3:12} people at various levels:
+- {randint:1:3} {choice!l:ACADEMIC_POSITIONS}s
+- {randint:2:6} PhD students
+- {randint:1:4} postdocs
 
 We're particularly interested in:
-- Best practices for {random.choice(cls.COMPUTING_TOOLS)}
+- Best practices for {choice:COMPUTING_TOOLS}
 - Optimizing code performance
 - Managing research workflows
 
@@ -785,14 +621,14 @@ Could we schedule something for next week? We can provide coffee and biscuits!
 Best regards,
 {caller_name}
 {caller_department}""",
-                f"""Hello,
+            """Hello,
 
-I'm struggling to find documentation for {subcategory.lower()} on the cluster.
+I'm struggling to find documentation for {subcategory!l} on the cluster.
 
 Specifically, I need help with:
-- Setting up {random.choice(cls.COMPUTING_TOOLS)}
-- Configuring {random.choice(cls.RESEARCH_SOFTWARE)}
-- Best practices for {random.choice(['data analysis', 'parallel computing', 'job optimization'])}
+- Setting up {choice:COMPUTING_TOOLS}
+- Configuring {choice:RESEARCH_SOFTWARE}
+- Best practices for {choice:data analysis|parallel computing|job optimization}
 
 The existing documentation seems outdated (references old software versions).
 
@@ -804,22 +640,22 @@ I'm happy to help write documentation based on what I learn!
 
 {caller_name}
 {caller_position}, {caller_department}""",
-            ],
-            "Research Infrastructure": [
-                f"""HPC Support,
+        ],
+        "Research Infrastructure": [
+            """HPC Support,
 
-My job has been stuck in the queue for {random.randint(24, 72)} hours:
+My job has been stuck in the queue for {randint:24:72} hours:
 
 ```
 JOBID PARTITION     NAME     USER ST       TIME  NODES
-{random.randint(1000000, 9999999)}   {random.choice(['gpu', 'highmem', 'general'])}     {fake.word()}_job
-{fake.user_name()}  PD       0:00      1
+{randint:1000000:9999999}   {choice:gpu|highmem|general}     {word}_job
+{user_name}  PD       0:00      1
 ```
 
 Job script summary:
-- Memory: {random.randint(64, 512)}GB
-- Time: {random.randint(12, 72)}:00:00  
-- GPUs: {random.randint(1, 4) if 'gpu' in str(random.choice(['gpu', 'cpu'])) else 0}
+- Memory: {randint:64:512}GB
+- Time: {randint:12:72}:00:00  
+- GPUs: {choice:0|0|0|0|1|2|3|4}
 
 Is this normal queue time? My conference deadline is in two weeks.
 
@@ -827,15 +663,15 @@ Can you advise on optimizing the resource request or suggest alternative queues?
 
 Thanks,
 {caller_name}""",
-                f"""Research Computing Team,
+            """Research Computing Team,
 
 I need help optimizing my parallel job. It's running much slower than expected on the cluster.
 
 Current performance:
-- Local desktop (8 cores): {random.randint(2, 6)} hours
-- Cluster (32 cores): {random.randint(8, 20)} hours (expected ~30 minutes)
+- Local desktop (8 cores): {randint:2:6} hours
+- Cluster (32 cores): {randint:8:20} hours (expected ~30 minutes)
 
-The job processes {random.choice(cls.RESEARCH_DATA_TYPES)} using {random.choice(cls.RESEARCH_SOFTWARE)}.
+The job processes {choice:RESEARCH_DATA_TYPES} using {choice:RESEARCH_SOFTWARE}.
 
 I suspect it's not scaling properly. Could someone help profile the job and suggest optimizations?
 
@@ -843,46 +679,46 @@ I can provide the code and sample data for testing.
 
 {caller_name}
 {caller_department}""",
-                f"""Hello,
+            """Hello,
 
 I'm requesting access to GPU resources for my machine learning research.
 
 Project details:
-- Deep learning training on {random.choice(['image', 'text', 'sensor'])} data
-- Framework: {random.choice(['TensorFlow', 'PyTorch', 'JAX'])}
-- Expected runtime: {random.randint(24, 168)} hours per experiment
-- GPU memory needed: {random.choice(['12GB+', '24GB+', '32GB+'])}
+- Deep learning training on {choice:image|text|sensor} data
+- Framework: {choice:TensorFlow|PyTorch|JAX}
+- Expected runtime: {randint:24:168} hours per experiment
+- GPU memory needed: {choice:12GB+|24GB+|32GB+}
 
-My supervisor is Prof. {fake.last_name()} and we have funding from grant {cls._generate_grant_code() or 'pending'}.
+My supervisor is Prof. {last_name} and we have funding from grant {grant_code:pending}.
 
 What's the process for GPU queue access?
 
 {caller_name}
 {caller_position}""",
-            ],
-            "Collaboration Tools": [
-                f"""Support Team,
+        ],
+        "Collaboration Tools": [
+            """Support Team,
 
 I can't access JupyterHub at https://jupyter.cluster.university.ac.uk
 
-Error message: "{random.choice(cls.ERROR_MESSAGES)}"
+Error message: "{choice:ERROR_MESSAGES}"
 
-I was working on an important notebook yesterday for my {fake.bs()} analysis. The notebook contains several hours of work processing {random.choice(cls.RESEARCH_DATA_TYPES)}.
+I was working on an important notebook yesterday for my {bs} analysis. The notebook contains several hours of work processing {choice:RESEARCH_DATA_TYPES}.
 
 Is the service down? When will it be restored?
 
-I need to complete this analysis by {fake.date_between(start_date='+1d', end_date='+1w').strftime('%Y-%m-%d')} for a project meeting.
+I need to complete this analysis by {date:+1d:+1w} for a project meeting.
 
 {caller_name}
 {caller_department}""",
-                f"""Hi Research IT,
+            """Hi Research IT,
 
 I need help setting up a shared Git repository for our research group.
 
 Requirements:
-- {random.randint(3, 10)} collaborators from {caller_department}
-- Code in {random.choice(['Python', 'R', 'MATLAB', 'C++'])}
-- Some data files (~{random.randint(1, 50)}GB)
+- {randint:3:10} collaborators from {caller_department}
+- Code in {choice:Python|R|MATLAB|C++}
+- Some data files (~{randint:1:50}GB)
 - Need access from both cluster and local machines
 
 Should we use:
@@ -898,14 +734,14 @@ Also need guidance on:
 Thanks for any advice!
 
 {caller_name}""",
-                f"""Research Computing,
+            """Research Computing,
 
 I'm trying to share a Jupyter notebook with my collaborators but having issues.
 
-The notebook analyses {random.choice(cls.RESEARCH_DATA_TYPES)} and needs access to:
-- Cluster storage at /research/{fake.word()}_data/
-- {random.choice(cls.RESEARCH_SOFTWARE)} modules
-- About {random.randint(8, 64)}GB RAM
+The notebook analyses {choice:RESEARCH_DATA_TYPES} and needs access to:
+- Cluster storage at /research/{word}_data/
+- {choice:RESEARCH_SOFTWARE} modules
+- About {randint:8:64}GB RAM
 
 How can multiple people work on this simultaneously? We're in different time zones so need asynchronous collaboration.
 
@@ -913,16 +749,15 @@ Is there a shared notebook server option?
 
 {caller_name}
 {caller_position}, {caller_department}""",
-            ],
-            "Security & Compliance": [
-                f"""Data Protection Team,
+        ],
+        "Security & Compliance": [
+            """Data Protection Team,
 
 I need guidance on handling sensitive research data on the cluster.
 
-Data type: {random.choice(['Human subjects survey data', 'Medical imaging data', 'Personal interview transcripts',
-                           'Financial records', 'Genomic data'])}
-Ethics approval: {fake.bothify('ETH####')}
-Data subjects: ~{random.randint(100, 5000)} individuals
+Data type: {choice:SENSITIVE_DATA_TYPES}
+Ethics approval: {bothify:ETH####}
+Data subjects: ~{randint:100:5000} individuals
 
 Questions:
 - What storage location should I use?
@@ -930,34 +765,34 @@ Questions:
 - Are there logging requirements?
 - How should data be anonymized?
 
-The research is for my {caller_position.lower()} project on {fake.bs()}.
+The research is for my {caller_position!l} project on {bs}.
 
 Please advise on compliance requirements.
 
 {caller_name}
 {caller_department}""",
-                f"""Security Team,
+            """Security Team,
 
 I received a data security warning about my recent cluster usage. The email mentioned "unusual data access patterns"
 but wasn't specific.
 
 What I was doing:
-- Downloading {random.randint(10, 100)}GB of {random.choice(cls.RESEARCH_DATA_TYPES)}
-- Running analysis scripts from {fake.date_between(start_date='-1w', end_date='now').strftime('%Y-%m-%d')}
+- Downloading {randint:10:100}GB of {choice:RESEARCH_DATA_TYPES}
+- Running analysis scripts from {date:-1w:now}
 - Accessing data from multiple cluster nodes
 
-This is all legitimate research activity for my {fake.bs()} project.
+This is all legitimate research activity for my {bs} project.
 
 Can someone clarify what triggered the warning and how to avoid it in future?
 
 {caller_name}""",
-                f"""Compliance Team,
+            """Compliance Team,
 
 I need to ensure my research data handling meets GDPR requirements.
 
-Project: {fake.bs()}
-Data: Survey responses from EU residents ({random.randint(50, 500)} subjects)
-Storage: Currently on cluster at /research/{fake.word()}_survey/
+Project: {bs}
+Data: Survey responses from EU residents ({randint:50:500} subjects)
+Storage: Currently on cluster at /research/{word}_survey/
 
 Questions:
 - Is the current storage location compliant?
@@ -969,31 +804,31 @@ Ethics committee has approved the research but didn't provide specific technical
 
 {caller_name}
 {caller_position}, {caller_department}""",
-            ],
-            "Hardware Resources": [
-                f"""Infrastructure Team,
+        ],
+        "Hardware Resources": [
+            """Infrastructure Team,
 
-I'm experiencing very slow performance on compute node {fake.word()}-{random.randint(10, 99)}.
+I'm experiencing very slow performance on compute node {word}-{randint:10:99}.
 
 Symptoms:
-- Jobs taking {random.randint(3, 10)}x longer than usual
+- Jobs taking {randint:3:10}x longer than usual
 - High I/O wait times
 - Memory allocation errors
 
-My job normally processes {random.choice(cls.RESEARCH_DATA_TYPES)} in {random.randint(2, 8)} hours but it's been
-running for {random.randint(24, 72)} hours.
+My job normally processes {choice:RESEARCH_DATA_TYPES} in {randint:2:8} hours but it's been
+running for {randint:24:72} hours.
 
 Can you check if there's a hardware issue with this node?
 
-Job ID: {random.randint(1000000, 9999999)}
+Job ID: {randint:1000000:9999999}
 
 {caller_name}""",
-                f"""Hardware Support,
+            """Hardware Support,
 
 The storage system seems very slow today. File operations that usually take minutes are taking hours.
 
 Affected operations:
-- Reading {random.choice(cls.FILE_FORMATS)} files from /research/
+- Reading {choice:FILE_FORMATS} files from /research/
 - Writing analysis results 
 - Basic file listing (ls commands)
 
@@ -1005,14 +840,14 @@ We have a project deadline approaching and need reliable data access.
 
 {caller_name}
 {caller_department}""",
-                f"""Maintenance Team,
+            """Maintenance Team,
 
 When is the next scheduled maintenance window for the cluster?
 
-I have a large computational job that will take approximately {random.randint(48, 168)} hours to complete.
+I have a large computational job that will take approximately {randint:48:168} hours to complete.
 I want to time it to avoid any planned downtime.
 
-The job analyzes {random.choice(cls.RESEARCH_DATA_TYPES)} for my {fake.bs()} research.
+The job analyzes {choice:RESEARCH_DATA_TYPES} for my {bs} research.
 
 Also, will the maintenance affect:
 - Login nodes?
@@ -1022,23 +857,669 @@ Also, will the maintenance affect:
 Thanks for the heads up!
 
 {caller_name}""",
-            ],
-        }
+        ],
+    }
 
-        # Select appropriate templates for the category
-        templates = body_templates.get(
-            category,
-            [
-                f"""Hello,
+    # Incident body for categories without their own templates
+    DEFAULT_BODY_TEMPLATE = """Hello,
 
-I'm having an issue with {subcategory.lower()} and need assistance.
+I'm having an issue with {subcategory!l} and need assistance.
 
-I'm a {caller_position.lower()} in {caller_department} working on {fake.bs()}.
+I'm a {caller_position!l} in {caller_department} working on {bs}.
 
 Please help resolve this as soon as possible.
 
 {caller_name}"""
+
+    # Low-cardinality fields and their possible values, stored as categoricals in
+    # columnar output. Optional fields may also be empty.
+    CATEGORICAL_FIELDS = {
+        "status": STATUSES,
+        "category": CATEGORIES,
+        "subcategory": list(
+            dict.fromkeys(name for names in SUBCATEGORIES.values() for name in names)
+        ),
+        "callType": CALL_TYPES,
+        "entryType": ENTRY_TYPES,
+        "priority": PRIORITIES,
+        "impact": IMPACTS,
+        "urgency": URGENCIES,
+        "callerDepartment": DEPARTMENTS,
+        "callerPosition": ACADEMIC_POSITIONS,
+        "callerBranch": CAMPUS_BRANCHES,
+        "operator": [""] + OPERATORS,
+        "operatorGroup": OPERATOR_GROUPS,
+        "objectName": [""] + RESEARCH_OBJECTS,
+        "objectType": [""] + OBJECT_TYPES,
+        "location": LOCATIONS,
+        "researchDiscipline": RESEARCH_DISCIPLINES,
+        "softwareRequired": [""] + RESEARCH_SOFTWARE,
+    }
+
+    # Fields, or "age" in days, that the weights of each categorical field may depend
+    # on. Subcategories are drawn uniformly for their category.
+    CONDITIONS = {
+        "category": ["age"],
+        "status": ["category", "subcategory", "age"],
+        **{
+            name: ["category", "subcategory", "status", "age"]
+            for name in CATEGORICAL_FIELDS
+            if name not in ("category", "subcategory", "status")
+        },
+    }
+
+    # Fields with dates but no times
+    DATE_FIELDS = []
+
+    @classmethod
+    def reference_number(cls, numbers: numbering.ReferenceNumbers, index: int) -> str:
+        """
+        Unique incident number for a row
+        """
+        return numbers([index])[0]
+
+    @classmethod
+    def generate(cls, num_records: int = 100) -> Generator[Dict[str, Any], None, None]:
+        """
+        Generate dummy data for research computing support incidents
+
+        Args:
+            num_records: Number of incident records to generate
+
+        Yields:
+            Dict containing incident data matching TOPdesk structure
+        """
+
+        call_dates = timestamps.TimestampRange("-6M", "now")
+        numbers = numbering.ReferenceNumbers(fake.random.getrandbits(64))
+
+        def choose(name, values, **context):
+            return distributions.choose(
+                fake.random, "incident", name, values, **context
+            )
+
+        for i in range(num_records):
+
+            # Random dates within last 6 months, in seconds since the epoch
+            call_date = call_dates.draw(fake.random)
+
+            # Select category and corresponding subcategory
+            age = (call_dates.end - call_date) / timestamps.DAY
+            category = distributions.choose(
+                fake.random, "incident", "category", cls.CATEGORIES, age=age
+            )
+            subcategory = fake.random.choice(cls.SUBCATEGORIES[category])
+
+            # Generate closed date (if status is closed/resolved)
+            status = distributions.choose(
+                fake.random,
+                "incident",
+                "status",
+                cls.STATUSES,
+                category=category,
+                subcategory=subcategory,
+                age=age,
+            )
+            context = dict(
+                category=category, subcategory=subcategory, status=status, age=age
+            )
+            closed_date = None
+            target_date = call_date + fake.random.randint(1, 14) * timestamps.DAY
+
+            if status in ["closed", "resolved"]:
+                closed_date = (
+                    call_date
+                    + fake.random.randint(1, 120) * timestamps.HOUR
+                    + fake.random.randint(0, 59) * timestamps.MINUTE
+                )
+
+            # Generate realistic brief description
+            brief_description = cls._generate_brief_description(category, subcategory)
+
+            # Generate duration (research support often takes longer)
+            duration = round(fake.random.uniform(0.5, 72.0), 2) if closed_date else None
+
+            # Generate research-specific caller information
+            caller_department = choose("callerDepartment", cls.DEPARTMENTS, **context)
+            caller_position = choose(
+                "callerPosition", cls.ACADEMIC_POSITIONS, **context
+            )
+            caller_name = fake.name()
+
+            # Create academic email
+            name_parts = caller_name.lower().split()
+            caller_email = f"{name_parts[0]}.{name_parts[-1]}@university.ac.uk"
+
+            # Generate research-focused request and action text
+            request_text = cls._generate_request_text(
+                timestamps.to_datetime(call_date),
+                caller_name,
+                subcategory,
+                caller_department,
+                caller_position,
+            )
+            action_text = cls._generate_action_text(subcategory, status)
+
+            # Generate detailed incident body (the actual user submission)
+            incident_body = cls._generate_incident_body(
+                timestamps.to_datetime(call_date),
+                category,
+                subcategory,
+                caller_name,
+                caller_position,
+                caller_department,
+            )
+
+            call_date_text = timestamps.format_datetime(call_date)
+
+            yield {
+                # Core incident fields
+                "id": fake.uuid4(),
+                "number": cls.reference_number(numbers, i),
+                "externalNumber": (
+                    f"GRANT-{fake.random.randint(1000, 9999)}"
+                    if fake.random.random() > 0.8
+                    else ""
+                ),
+                "briefDescription": brief_description,
+                "status": status,
+                # Dates and times
+                "callDate": call_date_text,
+                "creationDate": call_date_text,
+                "modificationDate": timestamps.format_datetime(
+                    call_date + fake.random.randint(0, 48) * timestamps.HOUR
+                ),
+                "targetDate": timestamps.format_datetime(target_date),
+                "closedDate": (
+                    timestamps.format_datetime(closed_date) if closed_date else ""
+                ),
+                # Classification
+                "category": category,
+                "subcategory": subcategory,
+                "callType": choose("callType", cls.CALL_TYPES, **context),
+                "entryType": choose("entryType", cls.ENTRY_TYPES, **context),
+                # Priority and impact
+                "priority": choose("priority", cls.PRIORITIES, **context),
+                "impact": choose("impact", cls.IMPACTS, **context),
+                "urgency": choose("urgency", cls.URGENCIES, **context),
+                # People (research-focused)
+                "callerName": caller_name,
+                "callerEmail": caller_email,
+                "callerPhone": fake.phone_number(),
+                "callerDepartment": caller_department,
+                "callerPosition": caller_position,
+                "callerBranch": choose("callerBranch", cls.CAMPUS_BRANCHES, **context),
+                "researchGroup": f"{fake.last_name()} Lab",
+                "grantCode": cls._generate_grant_code(),
+                "operator": (
+                    choose("operator", cls.OPERATORS, **context)
+                    if fake.random.random() > 0.2
+                    else ""
+                ),
+                "operatorGroup": choose(
+                    "operatorGroup", cls.OPERATOR_GROUPS, **context
+                ),
+                # Request and action fields
+                "request": request_text,
+                "action": action_text,
+                "incidentBody": incident_body,  # Full user submission text
+                # Additional fields
+                "duration": duration,
+                "costs": (
+                    round(fake.random.uniform(0, 200), 2)
+                    if fake.random.random() > 0.9
+                    else 0
+                ),
+                "onHold": (
+                    fake.random.choice([True, False]) if status == "onHold" else False
+                ),
+                "completed": status in ["resolved", "closed"],
+                "closed": status == "closed",
+                # Research infrastructure objects
+                "objectName": (
+                    choose("objectName", cls.RESEARCH_OBJECTS, **context)
+                    if fake.random.random() > 0.4
+                    else ""
+                ),
+                "objectType": (
+                    choose("objectType", cls.OBJECT_TYPES, **context)
+                    if fake.random.random() > 0.4
+                    else ""
+                ),
+                "location": choose("location", cls.LOCATIONS, **context),
+                # SLA fields (research support typically has longer SLAs)
+                "slaDeadline": timestamps.format_datetime(
+                    call_date
+                    + fake.random.randint(24, 168) * timestamps.HOUR  # 1-7 days
+                ),
+                "slaViolated": (
+                    fake.random.choice([True, False])
+                    if status in ["resolved", "closed"]
+                    else False
+                ),
+                # Research-specific fields
+                "researchDiscipline": choose(
+                    "researchDiscipline", cls.RESEARCH_DISCIPLINES, **context
+                ),
+                "softwareRequired": (
+                    choose("softwareRequired", cls.RESEARCH_SOFTWARE, **context)
+                    if fake.random.random() > 0.5
+                    else ""
+                ),
+                "trainingRequired": (
+                    fake.random.choice([True, False])
+                    if category == "Training & Documentation"
+                    else False
+                ),
+                "followUpNeeded": (
+                    fake.random.choice([True, False])
+                    if fake.random.random() > 0.7
+                    else False
+                ),
+            }
+
+    @classmethod
+    def generate_columns(
+        cls,
+        num_records: int = 100,
+        start: int = 0,
+        rng: Optional[numpy.random.Generator] = None,
+        now: Optional[datetime] = None,
+        persons: Optional[RecordIndex] = None,
+        assets: Optional[RecordIndex] = None,
+        call_dates: Optional[numpy.ndarray] = None,
+    ) -> pandas.DataFrame:
+        """
+        Generate research computing support incidents a column at a time
+
+        Categorical, numeric and date fields are drawn for all rows at once with NumPy;
+        only the free-text fields are produced row by row.
+
+        Args:
+            num_records: Number of incident records to generate
+            start: Index of the first record, for numbering when generating in parts
+            rng: NumPy random generator
+            now: Reference time for relative dates, defaults to the current time
+            persons: Index of generated persons. If given, callers are drawn from it
+                and referred to by id rather than made up, with the name, email, phone
+                number and department of the person. Persons have no academic
+                position, so callerPosition is still drawn from ACADEMIC_POSITIONS.
+            assets: Index of generated assets. If given, the objects of incidents are
+                drawn from it and referred to by id rather than from RESEARCH_OBJECTS.
+            call_dates: Call dates to use instead of drawing them uniformly from the
+                last 6 months, e.g. from an arrival process. One per record.
+
+        Returns:
+            DataFrame with the same columns as the records from generate(), with
+            categorical dtypes for CATEGORICAL_FIELDS
+        """
+        rng = columns.default_rng(rng)
+        n = num_records
+
+        if call_dates is None:
+            call_date = columns.datetimes(rng, "-6M", "now", n, now)
+        else:
+            call_date = numpy.asarray(call_dates, dtype="datetime64[s]")
+
+        # Age of each incident in days, which weights may depend on
+        age = (
+            numpy.datetime64(columns.relative_datetime("now", now), "s") - call_date
+        ) / numpy.timedelta64(1, "D")
+
+        # Select category and corresponding subcategory
+        category = distributions.choice(
+            rng, "incident", "category", cls.CATEGORIES, n, age=age
+        )
+        category_index = pandas.Index(cls.CATEGORIES).get_indexer(category)
+        subcategories = [cls.SUBCATEGORIES[name] for name in cls.CATEGORIES]
+        subcategory_table = numpy.array(
+            [
+                names + [""] * (max(map(len, subcategories)) - len(names))
+                for names in subcategories
             ],
+            dtype=object,
+        )
+        subcategory_count = numpy.array([len(names) for names in subcategories])
+        subcategory = subcategory_table[
+            category_index,
+            (rng.random(n) * subcategory_count[category_index]).astype(int),
+        ]
+
+        status = distributions.choice(
+            rng,
+            "incident",
+            "status",
+            cls.STATUSES,
+            n,
+            category=category,
+            subcategory=subcategory,
+            age=age,
+        )
+        context = dict(
+            category=category, subcategory=subcategory, status=status, age=age
+        )
+
+        def choice(name, values):
+            return distributions.choice(rng, "incident", name, values, n, **context)
+
+        resolved = numpy.isin(status, ["resolved", "closed"])
+        closed_date = numpy.where(
+            resolved,
+            call_date
+            + columns.offsets(rng, 1, 120, "h", n)
+            + columns.offsets(rng, 0, 59, "m", n),
+            numpy.datetime64("NaT"),
+        )
+
+        if persons is None:
+            caller_department = choice("callerDepartment", cls.DEPARTMENTS)
+        caller_position = choice("callerPosition", cls.ACADEMIC_POSITIONS)
+        if persons is None:
+            caller_name = pools.draw(fake, "name", rng, n)
+            caller_email = numpy.array(
+                [
+                    f"{parts[0]}.{parts[-1]}@university.ac.uk" if parts else ""
+                    for parts in (name.lower().split() for name in caller_name)
+                ],
+                dtype=object,
+            )
+        else:
+            caller = persons.sample(rng, n)
+            caller_name = persons.column("dynamicName", caller)
+            caller_email = persons.column("email", caller)
+            caller_department = persons.column("department", caller)
+
+        request_prefix = (
+            pandas.Series(call_date)
+            .dt.strftime("%d-%m-%Y %H:%M")
+            .to_numpy(dtype=object)
+        )
+        grant_code = (
+            columns.choice(rng, ["EP", "MR", "ST", "BB", "NE", "ES", "AH"], n)
+            + "/"
+            + columns.choice(rng, ["R", "M", "S"], n)
+            + columns.to_text(rng.integers(100000, 1000000, n))
+            + "/1"
+        )
+
+        frame = pandas.DataFrame(
+            {
+                # Core incident fields
+                "id": columns.uuid4(rng, n),
+                "number": numbering.reference_numbers(start, n, rng),
+                "externalNumber": columns.optional(
+                    rng, "GRANT-" + columns.to_text(rng.integers(1000, 10000, n)), 0.8
+                ),
+                "briefDescription": pools.per_row(
+                    fake, rng, n, cls._generate_brief_description, category, subcategory
+                ),
+                "status": status,
+                # Dates and times
+                "callDate": call_date,
+                "creationDate": call_date,
+                "modificationDate": call_date + columns.offsets(rng, 0, 48, "h", n),
+                "targetDate": call_date + columns.offsets(rng, 1, 14, "D", n),
+                "closedDate": closed_date,
+                # Classification
+                "category": category,
+                "subcategory": subcategory,
+                "callType": choice("callType", cls.CALL_TYPES),
+                "entryType": choice("entryType", cls.ENTRY_TYPES),
+                # Priority and impact
+                "priority": choice("priority", cls.PRIORITIES),
+                "impact": choice("impact", cls.IMPACTS),
+                "urgency": choice("urgency", cls.URGENCIES),
+                # People (research-focused)
+                "callerName": caller_name,
+                "callerEmail": caller_email,
+                "callerPhone": (
+                    pools.draw(fake, "phone_number", rng, n)
+                    if persons is None
+                    else persons.column("phoneNumber", caller)
+                ),
+                "callerDepartment": caller_department,
+                "callerPosition": caller_position,
+                "callerBranch": choice("callerBranch", cls.CAMPUS_BRANCHES),
+                "researchGroup": pools.draw(fake, "last_name", rng, n) + " Lab",
+                "grantCode": columns.optional(rng, grant_code, 0.6),
+                "operator": columns.optional(
+                    rng, choice("operator", cls.OPERATORS), 0.2
+                ),
+                "operatorGroup": choice("operatorGroup", cls.OPERATOR_GROUPS),
+                # Request and action fields
+                "request": request_prefix
+                + " ["
+                + caller_name
+                + "]: "
+                + pools.per_row(
+                    fake,
+                    rng,
+                    n,
+                    cls._generate_research_request,
+                    subcategory,
+                    caller_department,
+                    caller_position,
+                ),
+                "action": pools.per_row(
+                    fake, rng, n, cls._generate_action_text, subcategory, status
+                ),
+                "incidentBody": pools.per_row(
+                    fake,
+                    rng,
+                    n,
+                    cls._generate_incident_body,
+                    call_date.astype(object),
+                    category,
+                    subcategory,
+                    caller_name,
+                    caller_position,
+                    caller_department,
+                ),
+                # Additional fields
+                "duration": numpy.where(
+                    resolved, rng.uniform(0.5, 72.0, n).round(2), numpy.nan
+                ),
+                "costs": numpy.where(
+                    rng.random(n) > 0.9, rng.uniform(0, 200, n).round(2), 0.0
+                ),
+                "onHold": (status == "onHold") & columns.coin(rng, n),
+                "completed": resolved,
+                "closed": status == "closed",
+                # Research infrastructure objects
+                "objectName": columns.optional(
+                    rng, choice("objectName", cls.RESEARCH_OBJECTS), 0.4
+                ),
+                "objectType": columns.optional(
+                    rng, choice("objectType", cls.OBJECT_TYPES), 0.4
+                ),
+                "location": choice("location", cls.LOCATIONS),
+                # SLA fields (research support typically has longer SLAs)
+                "slaDeadline": call_date + columns.offsets(rng, 24, 168, "h", n),
+                "slaViolated": resolved & columns.coin(rng, n),
+                # Research-specific fields
+                "researchDiscipline": choice(
+                    "researchDiscipline", cls.RESEARCH_DISCIPLINES
+                ),
+                "softwareRequired": columns.optional(
+                    rng, choice("softwareRequired", cls.RESEARCH_SOFTWARE), 0.5
+                ),
+                "trainingRequired": (category == "Training & Documentation")
+                & columns.coin(rng, n),
+                "followUpNeeded": (rng.random(n) > 0.7) & columns.coin(rng, n),
+            }
+        )
+
+        categorical_fields = cls.CATEGORICAL_FIELDS
+        if persons is not None:
+            categorical_fields = {
+                **categorical_fields,
+                "callerDepartment": Person.DEPARTMENTS,
+            }
+            frame.insert(
+                frame.columns.get_loc("callerName"),
+                "callerId",
+                persons.column("id", caller),
+            )
+        if assets is not None:
+            # Incidents without an object keep an empty one
+            target = assets.sample(rng, n)
+            target[frame["objectName"].to_numpy() == ""] = -1
+            frame["objectName"] = assets.column("name", target)
+            frame["objectType"] = assets.column("type", target)
+            frame.insert(
+                frame.columns.get_loc("objectName"),
+                "objectId",
+                assets.column("id", target),
+            )
+            categorical_fields = {
+                **categorical_fields,
+                "objectName": None,
+                "objectType": [""] + Asset.ASSET_TYPES,
+            }
+        return frame.astype(columns.categorical_dtypes(categorical_fields))
+
+    @classmethod
+    def _generate_brief_description(cls, category: str, subcategory: str) -> str:
+        """Generate realistic brief descriptions for research computing issues"""
+        return (
+            _templates()
+            .choose(("briefDescription", category))
+            .render({"subcategory": subcategory})
+        )
+
+    @classmethod
+    def _generate_request_text(
+        cls,
+        call_date,
+        caller_name: str,
+        subcategory: str,
+        caller_department: str,
+        caller_position: str,
+    ) -> str:
+        """Generate research-focused request text"""
+        research_request = cls._generate_research_request(
+            subcategory, caller_department, caller_position
         )
+        return f"{call_date.strftime('%d-%m-%Y %H:%M')} [{caller_name}]: {research_request}"
+
+    @classmethod
+    def _generate_research_request(
+        cls, subcategory: str, caller_department: str, caller_position: str
+    ) -> str:
+        """Generate the caller's message, without the date and name prefix"""
+        return (
+            _templates()
+            .choose("request")
+            .render(
+                {
+                    "subcategory": subcategory,
+                    "caller_department": caller_department,
+                    "caller_position": caller_position,
+                }
+            )
+        )
+
+    @classmethod
+    def _generate_action_text(cls, subcategory: str, status: str) -> str:
+        """Generate research-appropriate action text"""
+        if status not in ["resolved", "closed"]:
+            return ""
+
+        return _templates().choose("action").render({"subcategory": subcategory})
 
-        return random.choice(templates)
+    @classmethod
+    def _generate_grant_code(cls) -> str:
+        """Generate UK research council grant code format"""
+        if fake.random.random() > 0.6:
+            council = fake.random.choice(["EP", "MR", "ST", "BB", "NE", "ES", "AH"])
+            return f"{council}/{fake.random.choice(['R', 'M', 'S'])}{fake.random.randint(100000, 999999)}/1"
+        return ""
+
+    @classmethod
+    def _generate_incident_body(
+        cls,
+        call_date: datetime,
+        category: str,
+        subcategory: str,
+        caller_name: str,
+        caller_position: str,
+        caller_department: str,
+    ) -> str:
+        """Generate detailed incident body text (the actual user submission)"""
+
+        # Select a template for the category, then render only that one
+        return (
+            _templates()
+            .choose(("incidentBody", category), "incidentBody")
+            .render(
+                {
+                    "call_date": call_date,
+                    "subcategory": subcategory,
+                    "caller_name": caller_name,
+                    "caller_position": caller_position,
+                    "caller_department": caller_department,
+                }
+            )
+        )
+
+    @classmethod
+    def _template_fields(cls) -> Dict[str, FieldFactory]:
+        """
+        Placeholders available to the incident text templates
+
+        Faker providers are looked up on each call so that they can be instrumented.
+        """
+        return {
+            "choice": choice_field(vars(cls), fake.random),
+            "randint": randint_field(fake.random),
+            "word": lambda argument: lambda context: fake.word(),
+            "bs": lambda argument: lambda context: fake.bs(),
+            "catch_phrase": lambda argument: lambda context: fake.catch_phrase(),
+            "last_name": lambda argument: lambda context: fake.last_name(),
+            "user_name": lambda argument: lambda context: fake.user_name(),
+            "time": lambda argument: cls._random_time,
+            "bothify": lambda argument: lambda context: fake.bothify(argument),
+            "date": cls._date_field,
+            "grant_code": lambda argument: lambda context: cls._generate_grant_code()
+            or argument,
+        }
+
+    @staticmethod
+    def _random_time(context: Mapping[str, Any]) -> str:
+        """Time of day, independent of the current time so that seeded runs repeat"""
+        return (
+            datetime.min + timedelta(seconds=fake.random.randrange(86400))
+        ).strftime("%H:%M:%S")
+
+    @staticmethod
+    def _date_field(argument: str) -> Field:
+        """
+        Date placeholder between two dates relative to the call date, e.g.
+        {date:today:+1M}, so that seeded runs repeat on any day
+        """
+        start_date, end_date = argument.split(":")
+
+        def field(context: Mapping[str, Any]) -> str:
+            now = context["call_date"]
+            start = columns.relative_datetime(start_date, now).date()
+            end = columns.relative_datetime(end_date, now).date()
+            days = fake.random.randint(0, max((end - start).days, 0))
+            return (start + timedelta(days=days)).strftime("%Y-%m-%d")
+
+        return field
+
+
+@functools.lru_cache(maxsize=None)
+def _templates() -> TemplateRegistry:
+    """
+    The text templates, compiled once when they are first used
+    """
+    templates = TemplateRegistry(Incident._template_fields(), fake.random)
+    for category, texts in Incident.BRIEF_DESCRIPTION_TEMPLATES.items():
+        templates.register(("briefDescription", category), texts)
+    for category, texts in Incident.BODY_TEMPLATES.items():
+        templates.register(("incidentBody", category), texts)
+    templates.register("incidentBody", [Incident.DEFAULT_BODY_TEMPLATE])
+    templates.register("request", Incident.REQUEST_TEMPLATES)
+    templates.register("action", Incident.ACTION_TEMPLATES)
+    return templates
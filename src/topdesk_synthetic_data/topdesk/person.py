@@ -1,38 +1,53 @@
-import random
-import uuid
+from __future__ import annotations
 
-import faker
+from datetime import datetime
+from typing import Optional
 
-fake = faker.Faker()
+from .. import columns, distributions, pools, timestamps
+from ..fakes import fake
+from ..lazy import lazy_import
+from .entity import Entity
 
+numpy = lazy_import("numpy")
+pandas = lazy_import("pandas")
+
+
+class Person(Entity):
+    DEPARTMENTS = [
+        "IT",
+        "HR",
+        "Finance",
+        "Marketing",
+        "Sales",
+        "Operations",
+        "Legal",
+        "Facilities",
+        "R&D",
+        "Customer Service",
+    ]
+
+    BRANCHES = [
+        "Head Office",
+        "Branch North",
+        "Branch South",
+        "Branch East",
+        "Branch West",
+    ]
+
+    # Low-cardinality fields, stored as categoricals in columnar output
+    CATEGORICAL_FIELDS = {"department": DEPARTMENTS, "branch": BRANCHES}
+
+    # Fields with dates but no times
+    DATE_FIELDS = ["startDate", "endDate"]
 
-class Person:
     @classmethod
     def generate(cls, num_records=50):
         """
         Generate dummy data for TOPdesk person/employee export
         """
 
-        departments = [
-            "IT",
-            "HR",
-            "Finance",
-            "Marketing",
-            "Sales",
-            "Operations",
-            "Legal",
-            "Facilities",
-            "R&D",
-            "Customer Service",
-        ]
-
-        branches = [
-            "Head Office",
-            "Branch North",
-            "Branch South",
-            "Branch East",
-            "Branch West",
-        ]
+        start_dates = timestamps.TimestampRange("-5y", "today", dates=True)
+        end_dates = timestamps.TimestampRange("today", "+2y", dates=True)
 
         for i in range(num_records):
             first_name = fake.first_name()
@@ -40,7 +55,7 @@ class Person:
             email = f"{first_name.lower()}.{last_name.lower()}@company.com"
 
             yield {
-                "id": str(uuid.uuid4()),
+                "id": fake.uuid4(),
                 "dynamicName": f"{first_name} {last_name}",
                 "firstName": first_name,
                 "surName": last_name,
@@ -48,24 +63,82 @@ class Person:
                 "loginName": f"{first_name.lower()}.{last_name.lower()}",
                 "phoneNumber": fake.phone_number(),
                 "mobileNumber": fake.phone_number(),
-                "department": random.choice(departments),
-                "branch": random.choice(branches),
+                "department": distributions.choose(
+                    fake.random, "person", "department", cls.DEPARTMENTS
+                ),
+                "branch": distributions.choose(
+                    fake.random, "person", "branch", cls.BRANCHES
+                ),
                 "location": fake.address().replace("\n", ", "),
                 "jobTitle": fake.job(),
                 "manager": fake.name(),
                 "employeeNumber": f"EMP{str(i + 1).zfill(4)}",
-                "startDate": fake.date_between(
-                    start_date="-5y", end_date="today"
-                ).strftime("%Y-%m-%d"),
+                "startDate": timestamps.format_date(start_dates.draw(fake.random)),
                 "endDate": (
-                    fake.date_between(start_date="today", end_date="+2y").strftime(
-                        "%Y-%m-%d"
-                    )
-                    if random.random() > 0.9
+                    timestamps.format_date(end_dates.draw(fake.random))
+                    if fake.random.random() > 0.9
                     else ""
                 ),
                 "budgetHolder": fake.name(),
                 "archived": (
-                    random.choice([True, False]) if random.random() > 0.95 else False
+                    fake.random.choice([True, False])
+                    if fake.random.random() > 0.95
+                    else False
+                ),
+            }
+
+    @classmethod
+    def generate_columns(
+        cls,
+        num_records: int = 50,
+        start: int = 0,
+        rng: Optional[numpy.random.Generator] = None,
+        now: Optional[datetime] = None,
+    ) -> pandas.DataFrame:
+        """
+        Generate dummy data for TOPdesk person/employee export a column at a time
+        """
+        rng = columns.default_rng(rng)
+        n = num_records
+
+        first_name = pools.draw(fake, "first_name", rng, n)
+        last_name = pools.draw(fake, "last_name", rng, n)
+        login_name = (
+            pandas.Series(first_name).str.lower()
+            + "."
+            + pandas.Series(last_name).str.lower()
+        ).to_numpy()
+
+        return pandas.DataFrame(
+            {
+                "id": columns.uuid4(rng, n),
+                "dynamicName": first_name + " " + last_name,
+                "firstName": first_name,
+                "surName": last_name,
+                "email": login_name + "@company.com",
+                "loginName": login_name,
+                "phoneNumber": pools.draw(fake, "phone_number", rng, n),
+                "mobileNumber": pools.draw(fake, "phone_number", rng, n),
+                "department": distributions.choice(
+                    rng, "person", "department", cls.DEPARTMENTS, n
+                ),
+                "branch": distributions.choice(
+                    rng, "person", "branch", cls.BRANCHES, n
+                ),
+                "location": [
+                    address.replace("\n", ", ")
+                    for address in pools.draw(fake, "address", rng, n)
+                ],
+                "jobTitle": pools.draw(fake, "job", rng, n),
+                "manager": pools.draw(fake, "name", rng, n),
+                "employeeNumber": "EMP" + columns.sequence(start, n, 4),
+                "startDate": columns.dates(rng, "-5y", "today", n, now),
+                "endDate": numpy.where(
+                    rng.random(n) > 0.9,
+                    columns.dates(rng, "today", "+2y", n, now),
+                    numpy.datetime64("NaT"),
                 ),
+                "budgetHolder": pools.draw(fake, "name", rng, n),
+                "archived": (rng.random(n) > 0.95) & columns.coin(rng, n),
             }
+        ).astype(columns.categorical_dtypes(cls.CATEGORICAL_FIELDS))
@@ -0,0 +1,294 @@
+"""
+Output writers that append chunks of records to a file
+
+Each writer accepts DataFrames one at a time, so the full dataset never needs to be held
+in memory.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from .lazy import lazy_import
+from .timestamps import format_array
+
+openpyxl = lazy_import("openpyxl")
+pandas = lazy_import("pandas")
+pyarrow = lazy_import("pyarrow", "pyarrow.ipc", "pyarrow.parquet", optional=True)
+
+
+class Writer:
+    """
+    Base class for writers, which count the rows written and the time spent writing
+    """
+
+    # Compression codecs of the format, if it can be compressed
+    COMPRESSIONS = ()
+
+    def __init__(self, path: str, compression: Optional[str] = None):
+        self.path = path
+        self.rows = 0
+        self.seconds = 0.0
+
+    def write(self, chunk: pandas.DataFrame) -> None:
+        started = time.perf_counter()
+        self._write(chunk)
+        self.rows += len(chunk.index)
+        self.seconds += time.perf_counter() - started
+
+    def close(self) -> None:
+        started = time.perf_counter()
+        self._close()
+        self.seconds += time.perf_counter() - started
+
+    def _write(self, chunk: pandas.DataFrame) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CSVWriter(Writer):
+    """
+    Append chunks to a CSV file, writing the header with the first chunk
+    """
+
+    def __init__(self, path: str, compression: Optional[str] = None):
+        super().__init__(path)
+        self._file = open(path, "w", newline="", encoding="utf-8")
+
+    def _write(self, chunk: pandas.DataFrame) -> None:
+        # pandas formats timestamps one at a time, which is slow, so format them in bulk
+        timestamps = chunk.select_dtypes("datetime")
+        if len(timestamps.columns):
+            chunk = chunk.assign(
+                **{
+                    name: format_array(column.to_numpy())
+                    for name, column in timestamps.items()
+                }
+            )
+        chunk.to_csv(self._file, index=False, header=self.rows == 0)
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class ExcelWriter(Writer):
+    """
+    Stream chunks into an Excel workbook using openpyxl's write-only mode
+
+    Rows are written as they arrive rather than held in memory. When a sheet reaches
+    Excel's row limit, the remaining rows continue on a new sheet with its own header.
+    """
+
+    # Maximum number of rows in an Excel worksheet, including the header
+    MAX_ROWS = 1048576
+
+    def __init__(self, path: str, compression: Optional[str] = None):
+        super().__init__(path)
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheet = None
+        self._sheet_rows = 0
+
+    def _write(self, chunk: pandas.DataFrame) -> None:
+        # Excel has no missing value, so NaN and NaT become empty cells
+        values = []
+        for _, column in chunk.items():
+            value = column.to_numpy(dtype=object)
+            value[column.isna().to_numpy()] = None
+            values.append(value)
+
+        for row in zip(*values):
+            if self._sheet is None or self._sheet_rows >= self.MAX_ROWS:
+                self._add_sheet(chunk.columns)
+            self._sheet.append(row)
+            self._sheet_rows += 1
+
+    def _add_sheet(self, header) -> None:
+        self._sheet = self._workbook.create_sheet(
+            f"Sheet{len(self._workbook.worksheets) + 1}"
+        )
+        self._sheet.append(list(header))
+        self._sheet_rows = 1
+
+    def _close(self) -> None:
+        if self._sheet is None:
+            self._workbook.create_sheet("Sheet1")
+        self._workbook.save(self.path)
+
+
+class ArrowWriter(Writer):
+    """
+    Write chunks as record batches of an Arrow IPC (Feather version 2) file
+
+    Categorical columns are dictionary encoded. Compression may be "lz4" or "zstd".
+    """
+
+    DEFAULT_COMPRESSION = None
+    COMPRESSIONS = ("none", "lz4", "zstd")
+
+    def __init__(self, path: str, compression: Optional[str] = None):
+        if pyarrow is None:
+            raise ImportError(
+                "Arrow and Parquet output require pyarrow: "
+                "pip install topdesk-synthetic-data[arrow]"
+            )
+        super().__init__(path)
+        self.compression = compression or self.DEFAULT_COMPRESSION
+        if self.compression == "none":
+            self.compression = None
+        self._schema = None
+        self._writer = None
+
+    def _write(self, chunk: pandas.DataFrame) -> None:
+        table = pyarrow.Table.from_pandas(
+            chunk, schema=self._schema, preserve_index=False
+        )
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open(table.schema)
+        self._writer.write_table(table)
+
+    def _open(self, schema):
+        options = pyarrow.ipc.IpcWriteOptions(compression=self.compression)
+        return pyarrow.ipc.new_file(self.path, schema, options=options)
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class FeatherWriter(ArrowWriter):
+    """
+    Arrow IPC file with LZ4 compression by default, like pyarrow.feather
+    """
+
+    DEFAULT_COMPRESSION = "lz4"
+
+
+class ParquetWriter(ArrowWriter):
+    """
+    Write chunks as row groups of a Parquet file
+
+    Categorical columns are dictionary encoded. Compression may be "snappy", "gzip",
+    "brotli", "zstd" or "lz4".
+    """
+
+    DEFAULT_COMPRESSION = "snappy"
+    COMPRESSIONS = ("none", "snappy", "gzip", "brotli", "zstd", "lz4")
+
+    def _open(self, schema):
+        return pyarrow.parquet.ParquetWriter(
+            self.path, schema, compression=self.compression or "none"
+        )
+
+
+class BackgroundWriter:
+    """
+    Write chunks with another writer in a thread of its own
+
+    Chunks wait in a bounded queue, so generation can carry on while earlier chunks are
+    written, but is held back if writing falls behind. Errors in the thread are raised
+    by the next write() or by close().
+
+    Args:
+        writer: Writer to write the chunks with, which is closed with this one
+        queue_size: Number of chunks that may wait to be written
+    """
+
+    def __init__(self, writer: Writer, queue_size: int = 2):
+        self.writer = writer
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"write {writer.path}", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def path(self) -> str:
+        return self.writer.path
+
+    @property
+    def rows(self) -> int:
+        return self.writer.rows
+
+    @property
+    def seconds(self) -> float:
+        return self.writer.seconds
+
+    def _run(self) -> None:
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            # After an error, keep taking chunks so that write() never blocks
+            if self._error is None:
+                try:
+                    self.writer.write(chunk)
+                except BaseException as exc:
+                    self._error = exc
+        try:
+            self.writer.close()
+        except BaseException as exc:
+            if self._error is None:
+                self._error = exc
+
+    def write(self, chunk: pandas.DataFrame) -> None:
+        if self._error is not None:
+            raise self._error
+        self._queue.put(chunk)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Writers by file format, which is also the file extension
+WRITERS = {
+    "csv": CSVWriter,
+    "xlsx": ExcelWriter,
+    "parquet": ParquetWriter,
+    "arrow": ArrowWriter,
+    "feather": FeatherWriter,
+}
+
+COMPRESSIONS = list(
+    dict.fromkeys(codec for writer in WRITERS.values() for codec in writer.COMPRESSIONS)
+)
+
+
+def check_compression(formats: List[str], compression: Optional[str]) -> None:
+    """
+    Check that every format that can be compressed supports a compression codec
+
+    Raises:
+        ValueError: If one of the formats doesn't support the codec
+    """
+    if compression is None:
+        return
+    for fmt in formats:
+        supported = WRITERS[fmt].COMPRESSIONS
+        if supported and compression not in supported:
+            raise ValueError(
+                f"{fmt} output doesn't support {compression} compression, "
+                f"choose from {', '.join(supported)}"
+            )
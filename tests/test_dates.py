@@ -0,0 +1,75 @@
+"""
+Tests that seeded runs don't depend on the system clock
+"""
+
+import datetime
+import sys
+import time
+
+import pandas
+import pytest
+
+from topdesk_synthetic_data import shards
+
+NOW = datetime.datetime(2025, 1, 6, 9, 30)
+
+# How far to move the system clock
+SHIFT = datetime.timedelta(days=1000)
+
+
+class Shifted(type):
+    # Dates and times made before the clock moved are still instances
+    def __instancecheck__(cls, instance):
+        return isinstance(instance, cls.__bases__[0])
+
+
+class ShiftedDate(datetime.date, metaclass=Shifted):
+    @classmethod
+    def today(cls):
+        return datetime.date.fromtimestamp(time.time())
+
+
+class ShiftedDatetime(datetime.datetime, metaclass=Shifted):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.datetime.fromtimestamp(time.time(), tz)
+
+    @classmethod
+    def today(cls):
+        return cls.now()
+
+
+@pytest.fixture
+def shifted_clock(monkeypatch):
+    """
+    Move the system clock forward, as seen by this package and Faker
+    """
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + SHIFT.total_seconds())
+    for name, module in list(sys.modules.items()):
+        if not name.startswith(("topdesk_synthetic_data", "faker")):
+            continue
+        for attribute, value in list(vars(module).items()):
+            if value is datetime.datetime:
+                monkeypatch.setattr(module, attribute, ShiftedDatetime)
+            elif value is datetime.date:
+                monkeypatch.setattr(module, attribute, ShiftedDate)
+
+
+def generate() -> pandas.DataFrame:
+    return shards.window("incident", 0, 300, seed=1, now=NOW)
+
+
+def test_seeded_records_repeat_on_another_day(request):
+    expected = generate()
+    shards._cached_block.cache_clear()
+    request.getfixturevalue("shifted_clock")
+    pandas.testing.assert_frame_equal(generate(), expected)
+
+
+def test_body_dates_follow_call_dates():
+    frame = generate()
+    for call_date, body in zip(frame["callDate"], frame["incidentBody"]):
+        for date in pandas.Series(body).str.findall(r"\d{4}-\d{2}-\d{2}")[0]:
+            offset = pandas.Timestamp(date) - call_date.normalize()
+            assert abs(offset) <= pandas.Timedelta(days=31)
@@ -0,0 +1,104 @@
+"""
+Tests of weighted categorical fields
+"""
+
+from datetime import datetime
+
+import numpy
+import pytest
+
+from topdesk_synthetic_data import distributions, shards, topdesk
+from topdesk_synthetic_data.distributions import AliasTable, Distributions
+
+
+def validate(spec: dict) -> None:
+    Distributions(spec).validate(
+        {entity: cls.CATEGORICAL_FIELDS for entity, cls in topdesk.ENTITIES.items()},
+        {entity: cls.CONDITIONS for entity, cls in topdesk.ENTITIES.items()},
+    )
+
+
+def test_alias_table_frequencies():
+    weights = [5, 3, 0, 2]
+    draws = AliasTable(weights).sample(numpy.random.default_rng(1), 100_000)
+    frequencies = numpy.bincount(draws, minlength=len(weights)) / len(draws)
+    assert frequencies == pytest.approx(numpy.array(weights) / 10, abs=0.01)
+
+
+@pytest.mark.parametrize("weights", [[], [0, 0], [1, -1], [[1, 2]]])
+def test_alias_table_invalid(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+
+def test_valid_spec():
+    validate(
+        {
+            "incident": {
+                "category": {
+                    "given": "age",
+                    "bins": [7, 30],
+                    "weights": [
+                        {"Data Management": 1},
+                        {"Data Management": 1, "Training & Documentation": 1},
+                        {"Training & Documentation": 1},
+                    ],
+                },
+                "priority": {
+                    "given": "status",
+                    "weights": {"Logged": {"P1": 1}, "*": {"P3": 1}},
+                },
+            }
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"ticket": {}},
+        {"incident": {"nope": {"weights": {}}}},
+        {"incident": {"priority": "P1"}},
+        {"incident": {"priority": {"weights": {"P9": 1}}}},
+        {"incident": {"priority": {"given": "callType", "weights": {}}}},
+        {"incident": {"priority": {"given": "status", "weights": {"Nope": {}}}}},
+        {"person": {"department": {"given": "branch", "weights": {}}}},
+        {
+            "incident": {
+                "category": {
+                    "given": "age",
+                    "bins": [30, 7],
+                    "weights": [{}, {}, {}],
+                }
+            }
+        },
+    ],
+)
+def test_invalid_spec(spec):
+    with pytest.raises(ValueError):
+        validate(spec)
+
+
+def test_weights_applied():
+    spec = {
+        "incident": {
+            "priority": {
+                "given": "status",
+                "weights": {"Logged": {"P1": 1}, "*": {"P3": 1}},
+            }
+        }
+    }
+    frame = shards.window(
+        "incident",
+        0,
+        500,
+        seed=1,
+        now=datetime(2025, 1, 6),
+        weights=Distributions(spec),
+    )
+    logged = frame["status"] == "Logged"
+    assert logged.any()
+    assert (frame["priority"][logged] == "P1").all()
+    assert (frame["priority"][~logged] == "P3").all()
+    # The weights don't carry over to later calls
+    assert distributions._distributions is None
@@ -0,0 +1,39 @@
+"""
+Tests that the command line starts without importing the heavy modules
+"""
+
+import subprocess
+import sys
+
+from topdesk_synthetic_data import bench
+
+# Generous, so as not to fail on slow machines: importing the command line takes
+# around 0.2 s, and around 0.8 s when it imports NumPy, pandas and Faker
+BUDGET_MILLISECONDS = 500
+
+
+def test_import_defers_heavy_modules():
+    result = bench.import_time()
+    assert result["heavy_modules"] == []
+
+
+def test_import_within_budget():
+    result = bench.import_time()
+    assert result["milliseconds"] < BUDGET_MILLISECONDS, bench.format_import(result)
+
+
+def test_help_defers_heavy_modules():
+    code = (
+        "import sys\n"
+        "from topdesk_synthetic_data import __main__\n"
+        "sys.argv = ['topdesk-synthetic-data', '--help']\n"
+        "try:\n"
+        "    __main__.main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(sorted(set({sorted(bench.HEAVY_MODULES)!r}) & set(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.splitlines()[-1] == "[]"
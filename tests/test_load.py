@@ -0,0 +1,153 @@
+"""
+Tests of the REST API loader against a local stand-in server
+"""
+
+import asyncio
+import base64
+import http.server
+import json
+import threading
+
+import pandas
+import pytest
+
+from topdesk_synthetic_data import load
+
+
+class StandIn(http.server.ThreadingHTTPServer):
+    """
+    A TOPdesk-like API that records the requests it receives, answering the first
+    ``failures`` of them with ``failure_status``
+    """
+
+    daemon_threads = True
+
+    def __init__(self, failures: int = 0, failure_status: int = 503):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.failures = failures
+        self.failure_status = failure_status
+        self.requests = []
+        self.connections = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    # Keep connections open between requests
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+            failed = len(self.server.requests) < self.server.failures
+            self.server.requests.append(
+                {
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "body": json.loads(body),
+                }
+            )
+        status = self.server.failure_status if failed else 201
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(request):
+    options = getattr(request, "param", {})
+    server = StandIn(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def chunks(entity="person", num_records=10, chunk_size=4):
+    for start in range(0, num_records, chunk_size):
+        size = min(chunk_size, num_records - start)
+        yield entity, pandas.DataFrame(
+            {
+                "id": [f"id-{i}" for i in range(start, start + size)],
+                "callDate": pandas.to_datetime(["2024-01-02 03:04:05"] * size),
+                "duration": [None if i % 2 else 1.5 for i in range(size)],
+            }
+        )
+
+
+def run(loader: load.Loader, *args, **kwargs) -> load.Stats:
+    return asyncio.run(loader.load(chunks(*args, **kwargs), report_interval=60))
+
+
+def test_posts_one_record_per_request(server):
+    stats = run(load.Loader(server.url, concurrency=2), num_records=5)
+    assert (stats.records, stats.requests, stats.failed) == (5, 5, 0)
+    bodies = sorted((request["body"] for request in server.requests), key=str)
+    assert bodies[0] == {
+        "id": "id-0",
+        "callDate": "2024-01-02 03:04:05",
+        "duration": 1.5,
+    }
+    assert {request["path"] for request in server.requests} == {load.PATHS["person"]}
+
+
+def test_batches_records_as_json_arrays(server):
+    stats = run(
+        load.Loader(server.url, concurrency=1, batch_size=3),
+        "incident",
+        num_records=10,
+        chunk_size=10,
+    )
+    assert (stats.records, stats.requests) == (10, 4)
+    sizes = [len(request["body"]) for request in server.requests]
+    assert sizes == [3, 3, 3, 1]
+    assert [
+        record["id"] for request in server.requests for record in request["body"]
+    ] == [f"id-{i}" for i in range(10)]
+    assert server.requests[0]["path"] == load.PATHS["incident"]
+
+
+@pytest.mark.parametrize("server", [{"failures": 2}], indirect=True)
+def test_retries_failed_requests(server):
+    loader = load.Loader(server.url, concurrency=1, retries=3, backoff=0.001)
+    stats = run(loader, num_records=1)
+    assert (stats.records, stats.requests, stats.retries, stats.failed) == (1, 3, 2, 0)
+
+
+@pytest.mark.parametrize("server", [{"failures": 10}], indirect=True)
+def test_gives_up_after_the_last_retry(server):
+    loader = load.Loader(server.url, concurrency=1, retries=2, backoff=0.001)
+    stats = run(loader, num_records=1)
+    assert (stats.records, stats.requests, stats.failed) == (0, 3, 1)
+
+
+@pytest.mark.parametrize(
+    "server", [{"failures": 1, "failure_status": 400}], indirect=True
+)
+def test_does_not_retry_client_errors(server):
+    loader = load.Loader(server.url, concurrency=1, retries=3, backoff=0.001)
+    stats = run(loader, num_records=2)
+    assert (stats.records, stats.retries, stats.failed) == (1, 0, 1)
+
+
+def test_reuses_connections(server):
+    stats = run(load.Loader(server.url, concurrency=3), num_records=30)
+    assert stats.records == 30
+    assert len(server.connections) <= 3
+
+
+def test_sends_basic_authentication(server):
+    run(load.Loader(server.url, auth=("api_user", "secret")), num_records=1)
+    token = base64.b64encode(b"api_user:secret").decode()
+    assert server.requests[0]["headers"]["Authorization"] == f"Basic {token}"
@@ -0,0 +1,44 @@
+"""
+Tests of unique incident numbers
+"""
+
+from datetime import datetime
+
+import numpy
+import pytest
+
+from topdesk_synthetic_data import numbering, shards
+
+
+def test_permutation_is_one_to_one():
+    permutation = numbering.Permutation(1000, key=1)
+    assert sorted(permutation(numpy.arange(1000))) == list(range(1000))
+
+
+def test_numbers_unique_over_block_boundary():
+    start = shards.BLOCK_SIZE - 100
+    numbers = numbering.reference_numbers(start, 200, numpy.random.default_rng(1))
+    assert len(set(numbers)) == 200
+
+
+def test_numbers_of_chunks_dont_repeat():
+    rng = numpy.random.default_rng(1)
+    first = numbering.reference_numbers(0, 500, rng)
+    second = numbering.reference_numbers(500, 500, rng)
+    assert not set(first) & set(second)
+
+
+def test_generated_incidents_unique():
+    frame = shards.window(
+        "incident", 0, 2 * shards.BLOCK_SIZE, seed=1, now=datetime(2025, 1, 6)
+    )
+    assert frame["number"].is_unique
+    assert frame["number"].str.fullmatch(r"SHEF \d{4} \d{4}").all()
+
+
+@pytest.mark.parametrize("style", numbering.FORMATS)
+def test_capacity(style):
+    numbers = numbering.ReferenceNumbers(1, style)
+    assert numbers.capacity == numbering.capacity(style)
+    with pytest.raises(ValueError):
+        numbers([numbers.capacity])
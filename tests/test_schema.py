@@ -0,0 +1,74 @@
+"""
+Tests of custom fields declared in a schema file
+"""
+
+import json
+
+import pandas
+import pytest
+
+from topdesk_synthetic_data import cache, shards
+from topdesk_synthetic_data.schema import COMPILED, Schema
+
+SCHEMA = """
+[vocabularies]
+CLUSTERS = ["stanage", "bessemer", "sharc"]
+
+[[incident.fields]]
+name = "cluster"
+type = "choice"
+values = "CLUSTERS"
+weights = [5, 3, 1]
+empty = 0.2
+
+[[incident.fields]]
+name = "summary"
+type = "template"
+templates = ["{category}: job {randint:1:99} on {cluster}"]
+
+[[person.fields]]
+name = "staffNumber"
+type = "sequence"
+prefix = "STAFF"
+"""
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "schema.toml"
+    path.write_text(SCHEMA)
+    return str(path)
+
+
+def generate(schema: Schema) -> pandas.DataFrame:
+    return shards.generate_shard(
+        "incident", 0, 200, 1, shards.reference_time(1), schema=schema
+    )
+
+
+def test_fields_added(path):
+    frame = generate(Schema.load(path))
+    assert set(frame["cluster"].cat.categories) == {"stanage", "bessemer", "sharc", ""}
+    assert frame["summary"].str.contains(": job ").all()
+
+
+def test_compiled_plan_round_trip(path):
+    schema = Schema.load(path)
+    loaded = Schema.from_json(schema.to_json())
+    assert loaded == schema
+    pandas.testing.assert_frame_equal(generate(loaded), generate(schema))
+
+
+def test_cached_plan_is_json(path, tmp_path):
+    store = cache.DatasetCache(str(tmp_path / "cache"))
+    schema = Schema.load(path, store)
+    (entry,) = (tmp_path / "cache").rglob(COMPILED)
+    assert json.loads(entry.read_text())["digest"] == schema.digest
+    assert Schema.load(path, store) == schema
+
+
+def test_tampered_plan_rejected(path):
+    state = json.loads(Schema.load(path).to_json())
+    state["spec"]["vocabularies"]["CLUSTERS"].append("other")
+    with pytest.raises(ValueError):
+        Schema.from_json(json.dumps(state))
@@ -0,0 +1,51 @@
+"""
+Tests that seeded output doesn't depend on how generation is split up
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas
+import pytest
+
+from topdesk_synthetic_data import shards
+from topdesk_synthetic_data.topdesk import ENTITIES
+
+NOW = datetime(2025, 1, 6)
+
+# Spans a few blocks, so shards start and end part way through them
+NUM_RECORDS = 2500
+
+
+def generate(entity: str, **options) -> pandas.DataFrame:
+    return pandas.concat(
+        shards.generate(entity, NUM_RECORDS, seed=1, now=NOW, **options),
+        ignore_index=True,
+    )
+
+
+@pytest.mark.parametrize("entity", ENTITIES)
+def test_chunk_size_and_workers(entity):
+    expected = generate(entity)
+    with ProcessPoolExecutor(3) as executor:
+        frame = generate(entity, chunk_size=777, executor=executor)
+    pandas.testing.assert_frame_equal(frame, expected)
+
+
+@pytest.mark.parametrize("entity", ENTITIES)
+def test_pooled_chunk_size(entity):
+    options = dict(pool_size=100, pool_refresh=0.3)
+    expected = generate(entity, **options)
+    frame = generate(entity, chunk_size=777, **options)
+    pandas.testing.assert_frame_equal(frame, expected)
+
+
+def test_window_matches_generate():
+    expected = generate("incident").iloc[990:1010].reset_index(drop=True)
+    frame = shards.window("incident", 990, 1010, seed=1, now=NOW)
+    pandas.testing.assert_frame_equal(frame, expected)
+
+
+def test_seeds_differ():
+    frame = shards.window("incident", 0, 10, seed=2, now=NOW)
+    assert not frame["id"].equals(generate("incident")["id"].iloc[:10])
@@ -0,0 +1,80 @@
+"""
+Tests that written files read back as the records that were generated
+"""
+
+from datetime import datetime
+
+import openpyxl
+import pandas
+import pytest
+
+from topdesk_synthetic_data import shards, writers
+
+
+@pytest.fixture(scope="module")
+def frame() -> pandas.DataFrame:
+    return shards.window("incident", 0, 250, seed=1, now=datetime(2025, 1, 6))
+
+
+def write(writer: writers.Writer, frame: pandas.DataFrame) -> None:
+    with writer:
+        # In chunks, as the command line writes them
+        for start in range(0, len(frame.index), 100):
+            end = start + 100
+            writer.write(frame.iloc[start:end])
+    assert writer.rows == len(frame.index)
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "arrow"])
+@pytest.mark.parametrize("compression", [None, "none", "zstd"])
+def test_arrow_round_trip(frame, tmp_path, fmt, compression):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"incidents.{fmt}")
+    write(writers.WRITERS[fmt](path, compression), frame)
+    if fmt == "parquet":
+        loaded = pandas.read_parquet(path)
+    else:
+        loaded = pandas.read_feather(path)
+    pandas.testing.assert_frame_equal(loaded, frame, check_dtype=False)
+    assert isinstance(loaded["category"].dtype, pandas.CategoricalDtype)
+
+
+def test_csv_round_trip(frame, tmp_path):
+    path = str(tmp_path / "incidents.csv")
+    write(writers.CSVWriter(path), frame)
+    loaded = pandas.read_csv(path, keep_default_na=False, dtype=str)
+    assert list(loaded.columns) == list(frame.columns)
+    assert len(loaded.index) == len(frame.index)
+    assert (loaded["number"] == frame["number"]).all()
+    assert (
+        pandas.to_datetime(loaded["callDate"])
+        == frame["callDate"].reset_index(drop=True)
+    ).all()
+
+
+def test_excel_splits_sheets(frame, tmp_path, monkeypatch):
+    # Each sheet holds a header and 99 records
+    monkeypatch.setattr(writers.ExcelWriter, "MAX_ROWS", 100)
+    path = str(tmp_path / "incidents.xlsx")
+    write(writers.ExcelWriter(path), frame)
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    sheets = [list(sheet.values) for sheet in workbook.worksheets]
+    assert [len(rows) for rows in sheets] == [100, 100, 53]
+    assert all(rows[0] == tuple(frame.columns) for rows in sheets)
+    numbers = [
+        row[list(frame.columns).index("number")] for rows in sheets for row in rows[1:]
+    ]
+    assert numbers == list(frame["number"])
+
+
+@pytest.mark.parametrize(
+    "formats, compression",
+    [(["feather"], "gzip"), (["arrow", "parquet"], "snappy")],
+)
+def test_unsupported_compression(formats, compression):
+    with pytest.raises(ValueError):
+        writers.check_compression(formats, compression)
+
+
+def test_uncompressed_formats_ignore_compression():
+    writers.check_compression(["csv", "xlsx", "parquet"], "zstd")